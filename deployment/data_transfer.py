@@ -0,0 +1,91 @@
+import os
+import sys
+
+from absl import app, flags
+from dotenv import load_dotenv
+
+WELLNESS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "wellness")
+
+FLAGS = flags.FLAGS
+flags.DEFINE_string("path", None, "NDJSON file to export to or import from.")
+flags.DEFINE_integer("batch_size", 1000, "Records committed per import batch.")
+flags.DEFINE_bool("restart", False, "Ignore an existing import checkpoint and start over.")
+flags.DEFINE_enum(
+    "profile_backend", None, ["json", "sqlite"], "Overrides WELLNESS_PROFILE_BACKEND."
+)
+flags.DEFINE_enum(
+    "memory_backend", None, ["json", "journal", "binary"], "Overrides WELLNESS_MEMORY_BACKEND."
+)
+flags.DEFINE_bool("export_profiles", False, "Exports all user profiles.")
+flags.DEFINE_bool("import_profiles", False, "Imports user profiles.")
+flags.DEFINE_bool("export_memories", False, "Exports all user memories.")
+flags.DEFINE_bool("import_memories", False, "Imports user memories.")
+flags.mark_bool_flags_as_mutual_exclusive(
+    [
+        "export_profiles",
+        "import_profiles",
+        "export_memories",
+        "import_memories",
+    ]
+)
+
+
+def _setup() -> None:
+    """Points the stores at wellness/data, the same files the app uses."""
+    if FLAGS.profile_backend:
+        os.environ["WELLNESS_PROFILE_BACKEND"] = FLAGS.profile_backend
+    if FLAGS.memory_backend:
+        os.environ["WELLNESS_MEMORY_BACKEND"] = FLAGS.memory_backend
+    os.chdir(WELLNESS_DIR)
+    sys.path.insert(0, WELLNESS_DIR)
+
+
+def _profile_store():
+    from chief_wellness_officer.user_profile_store import profile_store
+
+    return profile_store
+
+
+def _memory_manager():
+    from memory.user_memory_manager import memory_manager
+
+    return memory_manager
+
+
+def main(argv=None) -> None:
+    """Streams user profiles and memories to and from NDJSON files."""
+    load_dotenv()
+
+    if not FLAGS.path:
+        print("path is required")
+        return
+    path = os.path.abspath(FLAGS.path)
+    _setup()
+
+    from utils import data_transfer
+
+    resume = not FLAGS.restart
+    if FLAGS.export_profiles:
+        count = data_transfer.export_profiles(_profile_store(), path)
+        print(f"Exported {count} profiles to {path}")
+    elif FLAGS.import_profiles:
+        store = _profile_store()
+        count = data_transfer.import_profiles(store, path, FLAGS.batch_size, resume)
+        store.close()
+        print(f"Imported {count} profiles from {path}")
+    elif FLAGS.export_memories:
+        count = data_transfer.export_memories(_memory_manager(), path)
+        print(f"Exported {count} users' memories to {path}")
+    elif FLAGS.import_memories:
+        manager = _memory_manager()
+        count = data_transfer.import_memories(manager, path, FLAGS.batch_size, resume)
+        manager.close()
+        print(f"Imported {count} users' memories from {path}")
+    else:
+        print(
+            "Please specify one of: --export_profiles, --import_profiles, --export_memories, or --import_memories"
+        )
+
+
+if __name__ == "__main__":
+    app.run(main)
@@ -0,0 +1,103 @@
+"""Downloads the offline IP-to-country database for crisis locality.
+
+Fetches DB-IP's free "IP to Country Lite" CSV (CC BY 4.0,
+https://db-ip.com) into wellness/data/geoip_ranges.csv.gz, where
+utils/geoip.py looks for it. DB-IP publishes one file per month; when the
+current month's file is not out yet, the previous month's is used. The
+download is parsed before it replaces an existing database, so a
+truncated or unexpected file never reaches the crisis path.
+"""
+
+import datetime
+import os
+import sys
+import tempfile
+from typing import Optional
+
+import requests
+from absl import app, flags
+
+WELLNESS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "wellness")
+DEFAULT_OUTPUT = os.path.join(WELLNESS_DIR, "data", "geoip_ranges.csv.gz")
+DBIP_URL = "https://download.db-ip.com/free/dbip-country-lite-{month}.csv.gz"
+# A real country database has several hundred thousand ranges.
+MIN_RANGES = 100_000
+
+FLAGS = flags.FLAGS
+flags.DEFINE_string("output", DEFAULT_OUTPUT, "Where to write the gzip-compressed CSV.")
+flags.DEFINE_string("month", None, "DB-IP release to fetch (YYYY-MM); latest if omitted.")
+flags.DEFINE_bool("force", False, "Download even if the database already exists.")
+
+
+def _months(month: Optional[str]):
+    if month:
+        yield month
+        return
+    today = datetime.date.today()
+    yield today.strftime("%Y-%m")
+    yield (today.replace(day=1) - datetime.timedelta(days=1)).strftime("%Y-%m")
+
+
+def _download(url: str, path: str) -> bool:
+    """Stream ``url`` to ``path``; False if the release does not exist."""
+    with requests.get(url, stream=True, timeout=30) as response:
+        if response.status_code == 404:
+            return False
+        response.raise_for_status()
+        with open(path, "wb") as fh:
+            for chunk in response.iter_content(chunk_size=1 << 20):
+                fh.write(chunk)
+    return True
+
+
+def _count_ranges(path: str) -> int:
+    """Ranges the app would load from ``path``; 0 if it is unreadable."""
+    sys.path.insert(0, WELLNESS_DIR)
+    from utils.geoip import IPRangeDatabase
+
+    try:
+        return len(IPRangeDatabase.from_csv(path))
+    except (OSError, EOFError, ValueError):
+        return 0
+
+
+def fetch_geoip_database(output: str = DEFAULT_OUTPUT, month: Optional[str] = None) -> str:
+    """Download, check and install the database; returns the release used."""
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(output), suffix=".tmp.csv.gz")
+    os.close(fd)
+    try:
+        for release in _months(month):
+            url = DBIP_URL.format(month=release)
+            print(f"Fetching {url}")
+            if _download(url, tmp):
+                break
+        else:
+            raise RuntimeError("No DB-IP country release found for " + (month or "this or last month"))
+        ranges = _count_ranges(tmp)
+        if ranges < MIN_RANGES:
+            raise RuntimeError(f"{url} only has {ranges} ranges; keeping the existing database")
+        os.replace(tmp, output)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    print(f"Installed {ranges} ranges from DB-IP {release} into {output}")
+    return release
+
+
+def ensure_geoip_database(output: str = DEFAULT_OUTPUT) -> None:
+    """Fetch the database unless it is already installed."""
+    if not os.path.exists(output):
+        fetch_geoip_database(output)
+
+
+def main(argv=None) -> None:
+    """Downloads the DB-IP country database into wellness/data."""
+    if os.path.exists(FLAGS.output) and not FLAGS.force:
+        print(f"{FLAGS.output} already exists; pass --force to refresh it")
+        return
+    fetch_geoip_database(FLAGS.output, FLAGS.month)
+
+
+if __name__ == "__main__":
+    app.run(main)
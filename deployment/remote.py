@@ -7,6 +7,7 @@ from dotenv import load_dotenv
 from vertexai import agent_engines
 from vertexai.preview import reasoning_engines
 
+from deployment.fetch_geoip_db import ensure_geoip_database
 from wellness.chief_wellness_officer.agent import root_agent
 
 FLAGS = flags.FLAGS
@@ -43,6 +44,9 @@ flags.mark_bool_flags_as_mutual_exclusive(
 
 def create() -> None:
     """Creates a new deployment."""
+    # The crisis path resolves locality offline; ship the country database.
+    ensure_geoip_database()
+
     # First wrap the agent in AdkApp
     app = reasoning_engines.AdkApp(
         agent=root_agent,
@@ -1,8 +1,10 @@
 """
 Single-process ADK entrypoint for the wellness orchestrator.
 Exposes the Chief Wellness Officer (CWO) agent as the root agent and
-configures session memory via InMemorySessionService so multi-turn
-conversations retain context.
+configures session memory so multi-turn conversations retain context.
+Sessions use CompactingSessionService, which keeps the recent turns
+verbatim and folds older ones into a rolling summary in the background
+(WELLNESS_SESSION_COMPACTION=0 keeps every event).
 
 Run with:
     adk api_server --a2a --app app:app_config --port 8002
@@ -22,6 +24,7 @@ from google.adk.sessions.in_memory_session_service import InMemorySessionService
 from google.genai.types import Content, Part
 
 from chief_wellness_officer.cwo_agent import chief_wellness_officer
+from memory.session_compaction import CompactingSessionService, session_compaction_enabled
 
 APP_NAME = "wellness_orchestrator"
 
@@ -31,7 +34,7 @@ app_config = App(
     resumability_config=ResumabilityConfig(is_resumable=True),
 )
 
-session_service = InMemorySessionService()
+session_service = CompactingSessionService() if session_compaction_enabled() else InMemorySessionService()
 runner = Runner(
     app=app_config,
     session_service=session_service,
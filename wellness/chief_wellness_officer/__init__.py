@@ -1,6 +1,8 @@
 """Chief Wellness Officer package exports."""
 
+from .cached_agent_tool import agent_cache_stats
 from .cwo_agent import chief_wellness_officer
+from .cwo_fast_path_tools import quick_nutrition_plan, quick_workout_plan
 from .cwo_memory_tools import load_user_memories, remember_user_insight
 from .cwo_profile_tools import get_user_profile, update_user_profile
 from .user_profile_store import profile_store
@@ -11,5 +13,8 @@ __all__ = [
     "update_user_profile",
     "load_user_memories",
     "remember_user_insight",
+    "quick_workout_plan",
+    "quick_nutrition_plan",
     "profile_store",
+    "agent_cache_stats",
 ]
@@ -0,0 +1,152 @@
+"""
+Cross-user response cache for specialist AgentTools.
+Many specialist calls are effectively the same request ("what is
+mindfulness?", the same goal for the same profile). CachedAgentTool answers
+those from a TTL + LRU cache instead of re-running the specialist's model
+chain.
+
+The key is the normalized request text plus the listed profile fields of
+the calling user. Each tool opts in per agent, and a ``should_cache``
+predicate can refuse individual requests; anything that might be a crisis
+must be refused there. Because a predicate can miss, a ``veto_state_key``
+names a session state counter that agents whose answers must never be
+shared (the crisis specialist) bump when they run; a response produced
+while it changed is not cached. Set WELLNESS_AGENT_CACHE=0 to bypass every
+cache.
+"""
+
+import copy
+import os
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from google.adk.agents import BaseAgent
+from google.adk.tools import AgentTool
+from google.adk.tools.tool_context import ToolContext
+
+from utils.lru_cache import LRUCache
+
+from .user_profile_store import profile_store
+
+DEFAULT_TTL = 3600
+DEFAULT_MAXSIZE = 512
+
+_WORD_RE = re.compile(r"[a-z0-9']+")
+_registry: Dict[str, "CachedAgentTool"] = {}
+
+
+def agent_cache_enabled() -> bool:
+    """Whether WELLNESS_AGENT_CACHE allows specialist response caching."""
+    return os.getenv("WELLNESS_AGENT_CACHE", "1").lower() not in {"0", "false", "no"}
+
+
+def normalize_request(text: str) -> str:
+    """Case-, punctuation- and whitespace-insensitive form of a request."""
+    return " ".join(_WORD_RE.findall((text or "").lower().replace("’", "'")))
+
+
+class CachedAgentTool(AgentTool):
+    """AgentTool that reuses recent responses to equivalent requests.
+
+    Args:
+        agent: The specialist agent to wrap.
+        profile_fields: UserProfile fields that become part of the key.
+        should_cache: Predicate on the normalized request, the same text
+            the key is built from; False bypasses the cache for that call
+            (neither read nor written).
+        veto_state_key: Session state counter; if it changes during a call,
+            that call's response is not cached.
+        enabled: Per-agent opt-in.
+        ttl: Seconds an entry stays valid.
+        maxsize: Entries kept before least recently used ones are evicted.
+    """
+
+    def __init__(
+        self,
+        agent: BaseAgent,
+        profile_fields: Sequence[str] = (),
+        should_cache: Optional[Callable[[str], bool]] = None,
+        veto_state_key: Optional[str] = None,
+        enabled: bool = True,
+        ttl: float = DEFAULT_TTL,
+        maxsize: int = DEFAULT_MAXSIZE,
+        **kwargs,
+    ):
+        super().__init__(agent=agent, **kwargs)
+        self.profile_fields = tuple(profile_fields)
+        self.should_cache = should_cache
+        self.veto_state_key = veto_state_key
+        self.enabled = enabled
+        self._cache = LRUCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+        self._miss_seconds = 0.0
+        self._misses_timed = 0
+        self._saved_seconds = 0.0
+        self._bypassed = 0
+        self._vetoed = 0
+        _registry[agent.name] = self
+
+    def _cache_key(self, args: Dict[str, Any], tool_context: ToolContext) -> Optional[tuple]:
+        if not (self.enabled and agent_cache_enabled()):
+            return None
+        request = args.get("request")
+        if not isinstance(request, str):
+            # Structured input (input_schema agents): key on the sorted args.
+            request = repr(sorted(args.items()))
+        request = normalize_request(request)
+        if self.should_cache is not None and not self.should_cache(request):
+            return None
+        profile = ()
+        if self.profile_fields:
+            stored = profile_store.get_profile(tool_context.user_id)
+            profile = tuple(getattr(stored, field) for field in self.profile_fields)
+        return request, profile
+
+    async def run_async(self, *, args: Dict[str, Any], tool_context: ToolContext) -> Any:
+        key = self._cache_key(args, tool_context)
+        if key is None:
+            with self._lock:
+                self._bypassed += 1
+            return await super().run_async(args=args, tool_context=tool_context)
+
+        cached = self._cache.get(key)
+        if cached is not None:
+            with self._lock:
+                if self._misses_timed:
+                    self._saved_seconds += self._miss_seconds / self._misses_timed
+            return cached if isinstance(cached, str) else copy.deepcopy(cached)
+
+        vetoes = tool_context.state.get(self.veto_state_key) if self.veto_state_key else None
+        start = time.perf_counter()
+        result = await super().run_async(args=args, tool_context=tool_context)
+        with self._lock:
+            self._miss_seconds += time.perf_counter() - start
+            self._misses_timed += 1
+        if self.veto_state_key and tool_context.state.get(self.veto_state_key) != vetoes:
+            with self._lock:
+                self._vetoed += 1
+            return result
+        if result:
+            self._cache.put(key, result if isinstance(result, str) else copy.deepcopy(result))
+        return result
+
+    def cache_clear(self) -> None:
+        self._cache.clear()
+
+    def cache_stats(self) -> Dict[str, Any]:
+        stats = self._cache.stats()
+        with self._lock:
+            stats["bypassed"] = self._bypassed
+            stats["vetoed"] = self._vetoed
+            stats["avg_miss_seconds"] = (
+                round(self._miss_seconds / self._misses_timed, 4) if self._misses_timed else None
+            )
+            stats["saved_seconds"] = round(self._saved_seconds, 4)
+        return stats
+
+
+def agent_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Hit rate and estimated latency saved for every cached specialist."""
+    return {name: tool.cache_stats() for name, tool in _registry.items()}
@@ -6,16 +6,67 @@ The orchestrator agent that routes user requests to the appropriate specialist.
 import textwrap
 from google.adk.agents import Agent
 from google.adk.models.google_llm import Gemini
+from utils.token_budget import enforce_token_budget
 from utils.utils import get_retry_config
-from google.adk.tools import AgentTool
 
 
 from exercise_agent.exercise_agent import exercise_agent
-from mindfullness_agent.mindfulness_agent import mindfulness_agent
+from mindfullness_agent.mindfulness_agent import CRISIS_RUNS_KEY, mindfulness_agent
+from mindfullness_agent.prescreen import CRISIS, has_risk, prescreen
 from nutrition_agent.nutrition_agent import nutrition_agent
 
+from .cached_agent_tool import CachedAgentTool
+from .cwo_context import inject_turn_context, load_turn_context
+from .cwo_fast_path_tools import fast_path_enabled, quick_nutrition_plan, quick_workout_plan
 from .cwo_memory_tools import load_user_memories, remember_user_insight
 from .cwo_profile_tools import get_user_profile, update_user_profile
+from .parallel_specialists import make_consult_specialists
+
+
+FAST_PATH_INSTRUCTION = """
+   Fast path (direct planning tools):
+- For a plain workout plan request, when is_complete_for_exercise is true and the user has given minutes per day and days per week, call quick_workout_plan(...) instead of the exercise specialist. Pass equipment if the user mentioned it.
+- For a plain meal or calorie plan request, when is_complete_for_nutrition is true, call quick_nutrition_plan(...) instead of the nutrition specialist. Pass dietary preference, allergies and activity level if known.
+- These tools read the stored profile themselves; do not pass age, weight, gender, height, fitness level or injuries.
+- If a tool returns status "incomplete", ask for the listed fields, call update_user_profile once, then retry.
+- Use the specialists as usual for anything that is not a straightforward plan: questions, coaching, multi-week programs, troubleshooting, or when logistics are still unknown.
+- Present the returned plan yourself, following the specialists' output structure (summary, schedule or meals, safety notes).
+"""
+
+FAST_PATH_TOOLS = [quick_workout_plan, quick_nutrition_plan] if fast_path_enabled() else []
+
+
+def _no_distress(request: str) -> bool:
+    # Crisis-free check on the whole request, independent of any routing
+    # label: a risk phrase anywhere means no cache read or write.
+    return not has_risk(request)
+
+
+def _is_crisis(request: str) -> bool:
+    return prescreen(request).route == CRISIS
+
+
+exercise_tool = CachedAgentTool(
+    agent=exercise_agent,
+    profile_fields=("age", "weight", "gender", "fitness_level", "injuries"),
+    should_cache=_no_distress,
+)
+# The lexicon can miss a crisis the orchestrator still catches; whatever the
+# crisis specialist answered is never cached.
+mindfulness_tool = CachedAgentTool(
+    agent=mindfulness_agent, should_cache=_no_distress, veto_state_key=CRISIS_RUNS_KEY
+)
+nutrition_tool = CachedAgentTool(
+    agent=nutrition_agent,
+    profile_fields=("age", "weight", "gender", "height"),
+    should_cache=_no_distress,
+)
+consult_specialists = make_consult_specialists(
+    exercise=exercise_tool,
+    nutrition=nutrition_tool,
+    mindfulness=mindfulness_tool,
+    is_urgent=_is_crisis,
+)
 
 
 chief_wellness_officer = Agent(
@@ -29,11 +80,15 @@ chief_wellness_officer = Agent(
         update_user_profile,
         load_user_memories,
         remember_user_insight,
-        AgentTool(agent=exercise_agent),
-        AgentTool(agent=mindfulness_agent),
-        AgentTool(agent=nutrition_agent),
+        exercise_tool,
+        mindfulness_tool,
+        nutrition_tool,
+        consult_specialists,
+        *FAST_PATH_TOOLS,
     ],
     description="The Chief Wellness Officer that orchestrates the user's wellness journey.",
+    before_agent_callback=load_turn_context,
+    before_model_callback=[inject_turn_context, enforce_token_budget],
     instruction=textwrap.dedent(
         """
       You are the Chief Wellness Officer (CWO) for a holistic wellness application.
@@ -51,9 +106,10 @@ chief_wellness_officer = Agent(
 - NEVER ask the user for their user_id and NEVER invent a fake one.
 
    Conversation startup:
+0. If the system instruction ends with a "Current user context" section, it already holds this turn's user_id, profile, completeness flags and relevant memories. Use it and skip steps 1-2.
 1. At the start of a new conversation (i.e., if you have not yet called get_user_profile in this conversation), call get_user_profile() once.
    - This returns user_id, profile, is_complete_for_exercise, and missing_for_exercise.
-2. After that, call load_user_memories(user_id=...) once using the user_id from get_user_profile.
+2. After that, call load_user_memories(user_id=..., query=...) once using the user_id from get_user_profile and the user's current request as query.
 3. Do NOT call get_user_profile or load_user_memories more than once per conversation unless there is an explicit need to refresh.
 
    Profile management:
@@ -75,14 +131,19 @@ chief_wellness_officer = Agent(
 - Use the exercise specialist agent for physical activity, workouts, strength, and fitness plans.
 - Use the nutrition specialist agent for calories, macros, meal planning, and dietary guidance.
 - Use the mindfulness specialist agent for stress, sleep, anxiety, recovery, and mental well-being.
-- For complex goals that span multiple domains (e.g., “I want to lose weight and reduce stress”), call all relevant specialists and then integrate their responses.
+- For complex goals that span multiple domains (e.g., “I want to lose weight and reduce stress”), call consult_specialists ONCE with a request for each relevant specialist. They run in parallel. Then integrate their responses.
+  - If a specialist's entry has status "timeout" or "error", build the answer from the others and tell the user that part will follow (or offer to retry it).
+  - If the mindfulness entry for a message about suicide or self-harm has status "timeout" or "error", do not say it will follow: urge the user to contact local emergency services or a crisis line right away.
+- For a single domain, call that specialist directly.
 - When routing, provide:
   - The user’s goal in clear language.
   - Any relevant profile fields (age, gender, weight, height, fitness_level, injuries) as needed by the specialist’s tools.
   - Any important preferences or constraints (e.g., dietary preference, time available to exercise, equipment access).
 
    Memories:
-- After you have retrieved the profile, call load_user_memories(user_id=...) once to get past memories: a list of {summary, timestamp, metadata}.
+- After you have retrieved the profile, call load_user_memories(user_id=..., query=...) once to get past memories: a list of {summary, timestamp, metadata}.
+  - Pass the user's current request as query; only the k (default 5) most relevant memories are returned.
+  - Omit query only when you genuinely need the user's full memory history.
 - Use only clearly relevant memories to:
   - Recall recurring goals (e.g., “previously you said you want to reduce arm fat”).
   - Recall stable preferences (e.g., vegetarian, evening workouts, time constraints).
@@ -99,7 +160,8 @@ chief_wellness_officer = Agent(
   - {"domain": "mindfulness", "goal_type": "stress_reduction"}
   - If uncertain, you may omit metadata or use {"domain": "holistic"}.
 - Some memories may have metadata {"compacted": "true"} and summaries starting with
-  "Historical preferences:". These are aggregated older history. Use them as high-level
+  "Recent weeks:" (older entries from the past week) or "Historical preferences:"
+  (long-term history). These are aggregated older history. Use them as high-level
   background (e.g., stable preferences and long-running goals), but do not quote the
   entire string back to the user; only reference the parts that help the current request.
 
@@ -129,5 +191,5 @@ Tone and safety (high-level):
 
 
    """
-    ),
+    ) + (FAST_PATH_INSTRUCTION if FAST_PATH_TOOLS else ""),
 )
@@ -0,0 +1,101 @@
+"""
+Pre-turn context injection for the Chief Wellness Officer.
+Without it every conversation opens with two model round-trips whose only
+purpose is to call get_user_profile and load_user_memories. Both are local
+lookups, so the CWO's callbacks do them instead:
+
+* before_agent_callback (once per turn) searches the user's memories for
+  the current message and stores the candidates in session state.
+* The agent's token budget (utils.token_budget) picks which of them fit.
+* before_model_callback (every model call) appends the live profile, its
+  completeness flags and those memories to the system instruction. The
+  profile is re-read on every call, so an update_user_profile made earlier
+  in the turn is reflected.
+
+Set WELLNESS_CONTEXT_INJECTION=0 to fall back to the tool-driven startup.
+"""
+
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+
+from memory.user_memory_manager import memory_manager
+from utils.token_budget import DROPPED_MEMORIES_KEY, budget_for, budgeting_enabled, select_memories
+
+from .cwo_memory_tools import _entry_to_dict
+from .user_profile_store import profile_store
+
+STATE_KEY = "cwo_turn_context"
+MEMORY_K = 5
+# Candidates fetched per turn; the token budget picks which ones are sent.
+MEMORY_CANDIDATES = 10
+
+
+def context_injection_enabled() -> bool:
+    """Whether WELLNESS_CONTEXT_INJECTION preloads profile and memories."""
+    return os.getenv("WELLNESS_CONTEXT_INJECTION", "1").lower() not in {"0", "false", "no"}
+
+
+def _user_text(callback_context: CallbackContext) -> str:
+    content = callback_context.user_content
+    if not content or not content.parts:
+        return ""
+    return " ".join(part.text for part in content.parts if part.text)
+
+
+def load_turn_context(callback_context: CallbackContext) -> None:
+    """before_agent_callback: fetch the memories relevant to this turn."""
+    if not context_injection_enabled():
+        return None
+    user_id = callback_context.user_id
+    query = _user_text(callback_context)
+    if query:
+        entries = memory_manager.search_memories(user_id, query, MEMORY_CANDIDATES)
+    else:
+        entries = memory_manager.get_user_memories(user_id)[-MEMORY_CANDIDATES:][::-1]
+    callback_context.state[STATE_KEY] = {
+        "user_id": user_id,
+        "memories": [_entry_to_dict(entry) for entry in entries],
+    }
+    return None
+
+
+def render_turn_context(user_id: str, memories: List[Dict[str, Any]]) -> str:
+    """The context block appended to the CWO's system instruction."""
+    profile = profile_store.get_profile(user_id)
+    lines = [
+        "Current user context (preloaded for this turn; this replaces the startup calls to "
+        "get_user_profile and load_user_memories):",
+        f"- user_id: {user_id}",
+        f"- profile: {json.dumps(profile.to_dict(), ensure_ascii=False)}",
+        f"- is_complete_for_exercise: {str(profile.is_complete_for_exercise()).lower()}; "
+        f"missing_for_exercise: {json.dumps(profile.missing_fields_for_exercise())}",
+        f"- is_complete_for_nutrition: {str(profile.is_complete_for_nutrition()).lower()}; "
+        f"missing_for_nutrition: {json.dumps(profile.missing_fields_for_nutrition())}",
+    ]
+    if memories:
+        lines.append(f"- memories most relevant to this message ({len(memories)}):")
+        for memory in memories:
+            metadata = f" {json.dumps(memory['metadata'], ensure_ascii=False)}" if memory["metadata"] else ""
+            lines.append(f"  - [{memory['timestamp']}] {memory['summary']}{metadata}")
+    else:
+        lines.append("- memories: none stored")
+    return "\n".join(lines)
+
+
+def inject_turn_context(callback_context: CallbackContext, llm_request: LlmRequest) -> Optional[LlmResponse]:
+    """before_model_callback: add the preloaded context to the request."""
+    context = callback_context.state.get(STATE_KEY)
+    if not context_injection_enabled() or not context:
+        return None
+    memories = context["memories"]
+    if budgeting_enabled():
+        selected = select_memories(memories, budget_for(callback_context.agent_name).memories)
+    else:
+        selected = memories[:MEMORY_K]
+    callback_context.state[DROPPED_MEMORIES_KEY] = len(memories) - len(selected)
+    llm_request.append_instructions([render_turn_context(context["user_id"], selected)])
+    return None
@@ -0,0 +1,115 @@
+"""
+Fast-path planning tools for the Chief Wellness Officer.
+
+Routing a plain plan request through a specialist agent costs two extra
+model round-trips (the specialist decides to call its tool, then rewrites
+the result) for an output that is deterministic anyway. With
+WELLNESS_FAST_PATH=1 the CWO also gets these tools, which read the stored
+profile and call the plan tools directly.
+"""
+
+import os
+from typing import Any, Dict, Optional
+
+from google.adk.tools.tool_context import ToolContext
+
+from exercise_agent.exercise_tools import generate_workout_plan
+from nutrition_agent.nutrition_tools import generate_nutrition_plan
+
+from .user_profile_store import profile_store
+
+
+def fast_path_enabled() -> bool:
+    """Whether WELLNESS_FAST_PATH gives the CWO the direct planning tools."""
+    return os.getenv("WELLNESS_FAST_PATH", "").lower() in {"1", "true", "yes"}
+
+
+def quick_workout_plan(
+    minutes_per_day: int,
+    days_per_week: int,
+    goal: Optional[str] = None,
+    equipment: Optional[str] = None,
+    tool_context: ToolContext = None
+) -> Dict[str, Any]:
+    """
+    Build a workout plan directly from the stored profile, without the exercise specialist.
+    Use only when is_complete_for_exercise is true and the user has given minutes_per_day and days_per_week.
+
+    Args:
+        minutes_per_day: Minutes available per session
+        days_per_week: Training days per week
+        goal: The user's goal for this plan; defaults to the profile's goals
+        equipment: Available equipment (e.g. "dumbbells", "full gym"); bodyweight if omitted
+
+    Returns:
+        The workout plan, or status "incomplete" with the missing profile fields
+    """
+    if tool_context is None:
+        return {"error": "No tool context available"}
+
+    user_id = tool_context.user_id
+    profile = profile_store.get_profile(user_id)
+    if not profile.is_complete_for_exercise():
+        return {
+            "user_id": user_id,
+            "status": "incomplete",
+            "missing_for_exercise": profile.missing_fields_for_exercise(),
+        }
+
+    plan = generate_workout_plan(
+        goal=goal or profile.goals or "general fitness",
+        minutes_per_day=minutes_per_day,
+        days_per_week=days_per_week,
+        fitness_level=profile.fitness_level,
+        age=profile.age,
+        weight=profile.weight,
+        gender=profile.gender,
+        injuries=profile.injuries or "none",
+        equipment=equipment,
+    )
+    return {"user_id": user_id, "status": "ok", "plan": plan}
+
+
+def quick_nutrition_plan(
+    goal: Optional[str] = None,
+    dietary_preference: Optional[str] = None,
+    allergies: Optional[str] = None,
+    activity_level: str = "moderate",
+    tool_context: ToolContext = None
+) -> Dict[str, Any]:
+    """
+    Build a nutrition plan directly from the stored profile, without the nutrition specialist.
+    Use only when is_complete_for_nutrition is true.
+
+    Args:
+        goal: The user's goal for this plan; defaults to the profile's goals
+        dietary_preference: e.g. vegetarian, vegan, keto
+        allergies: Food allergies or intolerances
+        activity_level: sedentary, light, moderate, active, or very active
+
+    Returns:
+        The nutrition plan, or status "incomplete" with the missing profile fields
+    """
+    if tool_context is None:
+        return {"error": "No tool context available"}
+
+    user_id = tool_context.user_id
+    profile = profile_store.get_profile(user_id)
+    if not profile.is_complete_for_nutrition():
+        return {
+            "user_id": user_id,
+            "status": "incomplete",
+            "missing_for_nutrition": profile.missing_fields_for_nutrition(),
+        }
+
+    plan = generate_nutrition_plan(
+        age=profile.age,
+        gender=profile.gender,
+        weight=profile.weight,
+        height=profile.height,
+        goal=goal or profile.goals or "general wellness",
+        dietary_preference=dietary_preference,
+        allergies=allergies,
+        activity_level=activity_level,
+    )
+    return {"user_id": user_id, "status": "ok", "plan": plan}
@@ -15,14 +15,28 @@ def _entry_to_dict(entry: MemoryEntry) -> Dict[str, Any]:
     }
 
 
-def load_user_memories(user_id: str) -> Dict[str, Any]:
-    """Return stored memories for the given user_id."""
-    entries = memory_manager.get_user_memories(user_id)
-    return {
+def load_user_memories(
+    user_id: str,
+    query: Optional[str] = None,
+    k: int = 5,
+) -> Dict[str, Any]:
+    """Return stored memories for the given user_id.
+
+    When ``query`` is given (e.g. the user's current request), only the ``k``
+    memories most relevant to it are returned instead of the full history.
+    """
+    if query:
+        entries = memory_manager.search_memories(user_id, query, k)
+    else:
+        entries = memory_manager.get_user_memories(user_id)
+    result = {
         "user_id": user_id,
         "count": len(entries),
         "memories": [_entry_to_dict(entry) for entry in entries],
     }
+    if query:
+        result["query"] = query
+    return result
 
 
 def remember_user_insight(
@@ -0,0 +1,179 @@
+"""
+Stubbed-model benchmark for the CWO fast path.
+Runs one plain workout-plan request end to end through the ADK Runner,
+once through the exercise specialist (CWO -> AgentTool(exercise_coach) ->
+generate_workout_plan) and once through quick_workout_plan. Every model
+call goes to StubLlm, which sleeps for a fixed latency and then either
+calls its scripted tool or answers, so the difference between the paths
+is the number of model round-trips. The tools, the specialist's
+instruction and callbacks, and the runner itself are real.
+
+The specialist is wrapped in a plain AgentTool rather than the CWO's
+CachedAgentTool, so repeated requests are not answered from the cache.
+The profile is kept in a temporary UserProfileStore.
+
+Run from the wellness/ directory:
+    python -m chief_wellness_officer.fast_path_bench                     # 50 ms per model call
+    python -m chief_wellness_officer.fast_path_bench --latency-ms 300 --requests 10
+"""
+
+import argparse
+import asyncio
+import contextlib
+import logging
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, AsyncGenerator, Dict, Iterator
+
+from google.adk.agents import Agent
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_response import LlmResponse
+from google.adk.runners import InMemoryRunner
+from google.adk.tools.agent_tool import AgentTool
+from google.genai import types
+
+from exercise_agent.exercise_agent import exercise_agent
+
+from . import cwo_fast_path_tools
+from .cwo_fast_path_tools import quick_workout_plan
+from .user_profile_store import UserProfileStore
+
+USER_ID = "bench_user"
+PROFILE = {
+    "age": 34,
+    "weight": 72.0,
+    "gender": "female",
+    "height": 168.0,
+    "fitness_level": "beginner",
+    "injuries": "sore knee",
+    "goals": "lose fat",
+}
+WORKOUT_ARGS = {
+    "goal": PROFILE["goals"],
+    "minutes_per_day": 30,
+    "days_per_week": 3,
+    "fitness_level": PROFILE["fitness_level"],
+    "age": PROFILE["age"],
+    "weight": PROFILE["weight"],
+    "gender": PROFILE["gender"],
+    "injuries": PROFILE["injuries"],
+}
+
+
+class StubLlm(BaseLlm):
+    """Model that waits ``latency`` seconds, then calls ``tool`` once and answers."""
+
+    latency: float = 0.05
+    tool: str = ""
+    args: Dict[str, Any] = {}
+    calls: int = 0
+
+    async def generate_content_async(self, llm_request, stream: bool = False) -> AsyncGenerator[LlmResponse, None]:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        last = llm_request.contents[-1]
+        if self.tool and not any(part.function_response for part in last.parts or ()):
+            part = types.Part(function_call=types.FunctionCall(name=self.tool, args=self.args))
+        else:
+            part = types.Part(text="Here is your plan.")
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[part]),
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=0, candidates_token_count=0, total_token_count=0
+            ),
+        )
+
+
+def specialist_path(latency: float) -> Agent:
+    coach = exercise_agent.clone(
+        update={"model": StubLlm(model="stub", latency=latency, tool="generate_workout_plan", args=WORKOUT_ARGS)}
+    )
+    return Agent(
+        name="chief_wellness_officer",
+        model=StubLlm(model="stub", latency=latency, tool=coach.name, args={"request": "A 3-day, 30-minute plan."}),
+        tools=[AgentTool(agent=coach)],
+    )
+
+
+def fast_path(latency: float) -> Agent:
+    return Agent(
+        name="chief_wellness_officer",
+        model=StubLlm(
+            model="stub",
+            latency=latency,
+            tool="quick_workout_plan",
+            args={"minutes_per_day": 30, "days_per_week": 3},
+        ),
+        tools=[quick_workout_plan],
+    )
+
+
+def _model_calls(agent: Agent) -> int:
+    calls = agent.model.calls
+    for tool in agent.tools:
+        if isinstance(tool, AgentTool):
+            calls += _model_calls(tool.agent)
+    return calls
+
+
+@contextlib.contextmanager
+def temporary_profile(directory: Path) -> Iterator[None]:
+    """Serve the fast-path tools from a scratch profile store."""
+    shared = cwo_fast_path_tools.profile_store
+    store = UserProfileStore(str(directory / "user_profiles.json"))
+    store.update_profile(USER_ID, **PROFILE)
+    cwo_fast_path_tools.profile_store = store
+    try:
+        yield
+    finally:
+        cwo_fast_path_tools.profile_store = shared
+
+
+async def _measure(agent: Agent, requests: int) -> Dict[str, float]:
+    runner = InMemoryRunner(agent=agent, app_name="fast_path_bench")
+    message = types.Content(role="user", parts=[types.Part(text="Give me a 3-day, 30-minute workout plan.")])
+    timings = []
+    for _ in range(requests + 1):
+        session = await runner.session_service.create_session(app_name="fast_path_bench", user_id=USER_ID)
+        calls = _model_calls(agent)
+        start = time.perf_counter()
+        async for _event in runner.run_async(user_id=USER_ID, session_id=session.id, new_message=message):
+            pass
+        timings.append(time.perf_counter() - start)
+        calls = _model_calls(agent) - calls
+    # The first request pays for tool declarations and imports.
+    return {"model_calls": calls, "median_ms": round(statistics.median(timings[1:]) * 1e3, 1)}
+
+
+def run(latency: float = 0.05, requests: int = 20) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as tmp, temporary_profile(Path(tmp)):
+        specialist = asyncio.run(_measure(specialist_path(latency), requests))
+        fast = asyncio.run(_measure(fast_path(latency), requests))
+        start = time.perf_counter()
+        context = SimpleNamespace(user_id=USER_ID)
+        for _ in range(1000):
+            quick_workout_plan(30, 3, tool_context=context)
+        tool_us = (time.perf_counter() - start) / 1000 * 1e6
+    return {
+        "latency_ms": latency * 1e3,
+        "specialist_model_calls": specialist["model_calls"],
+        "specialist_median_ms": specialist["median_ms"],
+        "fast_model_calls": fast["model_calls"],
+        "fast_median_ms": fast["median_ms"],
+        "speedup": round(specialist["median_ms"] / fast["median_ms"], 2),
+        "quick_workout_plan_us": round(tool_us, 1),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+    report = run(args.latency_ms / 1e3, args.requests)
+    for key, value in report.items():
+        print(f"{key}: {value}")
@@ -0,0 +1,104 @@
+"""
+Parallel fan-out to the specialist agents.
+For goals that span several domains ("lose weight and reduce stress") the
+CWO would otherwise call each specialist in turn, so the reply waits for
+the sum of their model chains. consult_specialists runs the independent
+specialist calls concurrently on the event loop and returns every answer
+at once for the CWO to synthesize. Each branch has its own timeout: a slow
+or failing specialist is reported as such and the others still come back.
+Urgent requests (crisis messages) get a longer timeout, never none: a hung
+crisis specialist must not hold the whole turn forever.
+"""
+
+import asyncio
+import os
+import time
+from typing import Any, Callable, Dict, Optional
+
+from google.adk.tools import AgentTool
+from google.adk.tools.tool_context import ToolContext
+
+DEFAULT_BRANCH_TIMEOUT = 45.0
+# Urgent branches wait this many times the branch timeout.
+URGENT_TIMEOUT_FACTOR = 4.0
+
+
+def branch_timeout() -> float:
+    """Per-specialist timeout in seconds (WELLNESS_SPECIALIST_TIMEOUT)."""
+    return float(os.getenv("WELLNESS_SPECIALIST_TIMEOUT", DEFAULT_BRANCH_TIMEOUT))
+
+
+async def _run_branch(
+    tool: AgentTool, request: str, tool_context: ToolContext, timeout: float
+) -> Dict[str, Any]:
+    start = time.perf_counter()
+    try:
+        response = await asyncio.wait_for(
+            tool.run_async(args={"request": request}, tool_context=tool_context), timeout
+        )
+        result = {"status": "ok", "response": response}
+    except asyncio.TimeoutError:
+        result = {"status": "timeout", "error": f"No answer within {timeout:g}s."}
+    except Exception as e:
+        result = {"status": "error", "error": str(e)}
+    result["seconds"] = round(time.perf_counter() - start, 3)
+    return result
+
+
+def make_consult_specialists(
+    exercise: AgentTool,
+    nutrition: AgentTool,
+    mindfulness: AgentTool,
+    timeout: Optional[float] = None,
+    is_urgent: Optional[Callable[[str], bool]] = None,
+    urgent_timeout: Optional[float] = None,
+):
+    """Build the consult_specialists tool over the CWO's specialist tools.
+
+    ``timeout`` defaults to :func:`branch_timeout`. Requests for which
+    ``is_urgent`` returns True (e.g. crisis messages) wait ``urgent_timeout``
+    instead, by default ``URGENT_TIMEOUT_FACTOR`` times the branch timeout.
+    """
+
+    async def consult_specialists(
+        exercise_request: Optional[str] = None,
+        nutrition_request: Optional[str] = None,
+        mindfulness_request: Optional[str] = None,
+        tool_context: ToolContext = None
+    ) -> Dict[str, Any]:
+        """
+        Ask several specialists at once and get all their answers together.
+        Use this when a goal spans more than one domain; fill in a request only for each relevant specialist.
+
+        Args:
+            exercise_request: Request for the exercise specialist, including goal and relevant profile fields
+            nutrition_request: Request for the nutrition specialist, including goal and relevant profile fields
+            mindfulness_request: Request for the mindfulness specialist
+
+        Returns:
+            One entry per consulted specialist with status "ok" and its response,
+            or status "timeout"/"error" if that specialist did not answer
+        """
+        branches = {
+            name: (tool, request)
+            for name, tool, request in (
+                ("exercise", exercise, exercise_request),
+                ("nutrition", nutrition, nutrition_request),
+                ("mindfulness", mindfulness, mindfulness_request),
+            )
+            if request
+        }
+        if not branches:
+            return {"error": "Provide a request for at least one specialist."}
+
+        limit = branch_timeout() if timeout is None else timeout
+        urgent_limit = limit * URGENT_TIMEOUT_FACTOR if urgent_timeout is None else urgent_timeout
+        results = await asyncio.gather(
+            *(
+                _run_branch(tool, request, tool_context, urgent_limit if is_urgent and is_urgent(request) else limit)
+                for tool, request in branches.values()
+            )
+        )
+        return dict(zip(branches, results))
+
+    return consult_specialists
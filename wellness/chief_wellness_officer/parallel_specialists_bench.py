@@ -0,0 +1,202 @@
+"""
+Stubbed-model benchmark for the parallel specialist fan-out.
+Asks the exercise, nutrition and mindfulness specialists about one
+cross-domain goal through the ADK Runner, once in turn (what the CWO did
+before consult_specialists: one specialist call per model round-trip) and
+once through consult_specialists. The specialists are the real agents,
+instructions, callbacks and mindfulness router included, wrapped in
+AgentTool and sharing the CWO's tool context. Every model call goes to
+StubLlm, which sleeps for a fixed latency and answers; the CWO's own stub
+answers at once, so the difference is how the specialists' waits add up:
+their sum in turn, the slowest one in parallel.
+
+The specialists are wrapped in plain AgentTool rather than the CWO's
+CachedAgentTool, so repeated requests are not answered from the cache.
+
+Three degradation cases follow. The exercise specialist hangs past the
+branch timeout: its branch reports "timeout" and the other answers still
+come back. A crisis message to the mindfulness specialist outlasts the
+branch timeout and is still answered, because urgent branches get
+URGENT_TIMEOUT_FACTOR times longer. A crisis specialist that hangs past
+even that is cut off too, so it cannot hold the turn forever.
+
+Run from the wellness/ directory:
+    python -m chief_wellness_officer.parallel_specialists_bench                  # 300/250/200 ms
+    python -m chief_wellness_officer.parallel_specialists_bench --latency-ms 1000 --timeout-ms 1500
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+from typing import Any, AsyncGenerator, Dict, List, Tuple
+
+from google.adk.agents import Agent
+from google.adk.models.llm_response import LlmResponse
+from google.adk.runners import InMemoryRunner
+from google.adk.tools.agent_tool import AgentTool
+from google.genai import types
+
+from exercise_agent.exercise_agent import exercise_agent
+from mindfullness_agent import mindfulness_agent as mindfulness
+from mindfullness_agent.prescreen import CRISIS, prescreen
+from nutrition_agent.nutrition_agent import nutrition_agent
+
+from .fast_path_bench import StubLlm
+from .parallel_specialists import URGENT_TIMEOUT_FACTOR, make_consult_specialists
+
+APP_NAME = "parallel_specialists_bench"
+USER_ID = "bench_user"
+REQUESTS = {
+    "exercise": "A 3-day plan to lose weight for a beginner.",
+    "nutrition": "A meal plan to lose weight.",
+    "mindfulness": "Help me manage work stress.",
+}
+CRISIS_REQUEST = "I want to end my life"
+# Specialist latency relative to the exercise coach, which is the slowest.
+RELATIVE_LATENCY = {"exercise": 1.0, "nutrition": 5 / 6, "mindfulness": 2 / 3}
+
+
+class ScriptedLlm(StubLlm):
+    """CWO model that makes one scripted tool call per round-trip, then answers."""
+
+    script: List[Tuple[str, Dict[str, Any]]] = []
+
+    async def generate_content_async(self, llm_request, stream: bool = False) -> AsyncGenerator[LlmResponse, None]:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        done = 0
+        for content in reversed(llm_request.contents):
+            if any(part.text for part in content.parts or ()) and content.role == "user":
+                break
+            done += sum(1 for part in content.parts or () if part.function_response)
+        if done < len(self.script):
+            name, args = self.script[done]
+            part = types.Part(function_call=types.FunctionCall(name=name, args=args))
+        else:
+            part = types.Part(text="Here is your combined plan.")
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[part]),
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=0, candidates_token_count=0, total_token_count=0
+            ),
+        )
+
+
+def _stub(latency: float) -> StubLlm:
+    return StubLlm(model="stub", latency=latency)
+
+
+def _mindfulness(latency: float) -> Tuple[mindfulness.MindfulnessRouter, Agent]:
+    """The mindfulness router with every model replaced by a stub."""
+    crisis = mindfulness.crisis_agent.clone(update={"model": _stub(latency)})
+    coach = mindfulness.coach_agent.clone(update={"model": _stub(latency)})
+    educator = mindfulness.educator_agent.clone(update={"model": _stub(latency)})
+    orchestrator = mindfulness.mindfulness_orchestrator.clone(update={"model": _stub(latency), "tools": []})
+    router = mindfulness.MindfulnessRouter(
+        name=mindfulness.mindfulness_agent.name, orchestrator=orchestrator, specialists=[crisis, coach, educator]
+    )
+    return router, crisis
+
+
+def specialists(latency: float) -> Dict[str, Any]:
+    """AgentTools over stubbed clones of the three specialists."""
+    router, crisis = _mindfulness(latency * RELATIVE_LATENCY["mindfulness"])
+    return {
+        "exercise": AgentTool(agent=exercise_agent.clone(update={"model": _stub(latency)})),
+        "nutrition": AgentTool(
+            agent=nutrition_agent.clone(update={"model": _stub(latency * RELATIVE_LATENCY["nutrition"])})
+        ),
+        "mindfulness": AgentTool(agent=router),
+        "crisis": crisis,
+    }
+
+
+def _is_crisis(request: str) -> bool:
+    return prescreen(request).route == CRISIS
+
+
+def _cwo(script: List[Tuple[str, Dict[str, Any]]], tools: List[Any]) -> Agent:
+    return Agent(name="chief_wellness_officer", model=ScriptedLlm(model="stub", latency=0, script=script), tools=tools)
+
+
+async def _ask(runner: InMemoryRunner) -> Dict[str, Any]:
+    """One CWO turn; returns its duration and consult_specialists' result."""
+    session = await runner.session_service.create_session(app_name=APP_NAME, user_id=USER_ID)
+    message = types.Content(role="user", parts=[types.Part(text="Help me lose weight and manage work stress.")])
+    result = None
+    start = time.perf_counter()
+    async for event in runner.run_async(user_id=USER_ID, session_id=session.id, new_message=message):
+        for response in event.get_function_responses():
+            if response.name == "consult_specialists":
+                result = response.response
+    return {"ms": round((time.perf_counter() - start) * 1e3, 1), "result": result}
+
+
+async def _median_ms(runner: InMemoryRunner, requests: int) -> float:
+    # The first request pays for tool declarations and imports.
+    timings = [(await _ask(runner))["ms"] for _ in range(requests + 1)]
+    return statistics.median(timings[1:])
+
+
+def _statuses(turn: Dict[str, Any]) -> Dict[str, str]:
+    return {name: branch["status"] for name, branch in turn["result"].items()}
+
+
+async def _run(latency: float, requests: int, timeout: float) -> Dict[str, Any]:
+    tools = specialists(latency)
+    agent_tools = [tools[name] for name in REQUESTS]
+    consult = make_consult_specialists(*agent_tools, timeout=timeout, is_urgent=_is_crisis)
+    in_turn = [(tools[name].name, {"request": request}) for name, request in REQUESTS.items()]
+    requests_by_arg = {f"{name}_request": request for name, request in REQUESTS.items()}
+
+    sequential = InMemoryRunner(agent=_cwo(in_turn, agent_tools), app_name=APP_NAME)
+    parallel = InMemoryRunner(agent=_cwo([("consult_specialists", requests_by_arg)], [consult]), app_name=APP_NAME)
+    sequential_ms = await _median_ms(sequential, requests)
+    parallel_ms = await _median_ms(parallel, requests)
+
+    # The exercise coach hangs: only its branch is cut off.
+    tools["exercise"].agent.model.latency = timeout * 10
+    hung = await _ask(parallel)
+
+    # A crisis request outlasting the branch timeout is still answered...
+    crisis_args = {"nutrition_request": REQUESTS["nutrition"], "mindfulness_request": CRISIS_REQUEST}
+    crisis_runner = InMemoryRunner(agent=_cwo([("consult_specialists", crisis_args)], [consult]), app_name=APP_NAME)
+    tools["crisis"].model.latency = timeout * 2
+    crisis = await _ask(crisis_runner)
+
+    # ...but a hung crisis specialist is cut off at the urgent timeout.
+    tools["crisis"].model.latency = timeout * URGENT_TIMEOUT_FACTOR * 10
+    hung_crisis = await _ask(crisis_runner)
+
+    return {
+        "latency_ms": round(latency * 1e3, 1),
+        "sequential_median_ms": sequential_ms,
+        "parallel_median_ms": parallel_ms,
+        "speedup": round(sequential_ms / parallel_ms, 2),
+        "timeout_ms": round(timeout * 1e3, 1),
+        "hung_exercise_ms": hung["ms"],
+        "hung_exercise_statuses": _statuses(hung),
+        "crisis_ms": crisis["ms"],
+        "crisis_statuses": _statuses(crisis),
+        "urgent_timeout_ms": round(timeout * URGENT_TIMEOUT_FACTOR * 1e3, 1),
+        "hung_crisis_ms": hung_crisis["ms"],
+        "hung_crisis_statuses": _statuses(hung_crisis),
+    }
+
+
+def run(latency: float = 0.3, requests: int = 10, timeout: float = 0.5) -> Dict[str, Any]:
+    return asyncio.run(_run(latency, requests, timeout))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="Latency of the slowest specialist.")
+    parser.add_argument("--timeout-ms", type=float, default=500.0)
+    parser.add_argument("--requests", type=int, default=10)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+    report = run(args.latency_ms / 1e3, args.requests, args.timeout_ms / 1e3)
+    for key, value in report.items():
+        print(f"{key}: {value}")
@@ -0,0 +1,262 @@
+"""
+SQLite-backed user profile store.
+Keeps one row per user in a WAL-mode database so a profile update only touches
+that user's row, regardless of how many profiles are stored. Nothing is loaded
+at startup: profiles are read on demand into a bounded resident set and
+changes are written back in batches.
+"""
+
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import fields
+from typing import Any, Dict, Iterable, Iterator, Optional, Set
+
+from .user_profile_store import ResidentProfileCache, UserProfile
+
+PROFILE_COLUMNS = tuple(f.name for f in fields(UserProfile) if f.name != "user_id")
+
+_COLUMN_TYPES = {
+    "age": "INTEGER",
+    "weight": "REAL",
+    "height": "REAL",
+}
+
+
+class SQLiteUserProfileStore:
+    """Thread-safe SQLite store exposing the same API as UserProfileStore."""
+
+    def __init__(
+        self,
+        storage_path: str = "data/user_profiles.db",
+        batch_size: int = 32,
+        flush_interval: float = 0.5,
+        multiprocess: bool = False,
+        max_resident: int = 1024,
+    ):
+        """
+        Args:
+            storage_path: Location of the SQLite database file.
+            batch_size: Number of pending writes that forces a commit.
+            flush_interval: Maximum seconds a pending write waits before the
+                background flusher commits it.
+            multiprocess: Commit every write immediately and always read
+                from the database so other worker processes' writes are
+                visible. SQLite itself provides the cross-process locking.
+            max_resident: Maximum number of clean profiles kept in memory.
+        """
+        directory = os.path.dirname(storage_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._storage_path = storage_path
+        self._batch_size = 1 if multiprocess else max(1, batch_size)
+        self._flush_interval = flush_interval
+        self._pending = 0
+        self._closed = False
+        self._resident = ResidentProfileCache(0 if multiprocess else max_resident)
+        self._dirty_columns: Dict[str, Set[str]] = {}
+
+        # The timeout makes writers wait on each other's locks instead of
+        # failing with "database is locked".
+        self._conn = sqlite3.connect(storage_path, timeout=30.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        column_defs = ", ".join(
+            f"{name} {_COLUMN_TYPES.get(name, 'TEXT')}" for name in PROFILE_COLUMNS
+        )
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS user_profiles (user_id TEXT PRIMARY KEY, {column_defs})"
+        )
+        self._conn.commit()
+
+        self._flush_event = threading.Event()
+        self._flusher = threading.Thread(
+            target=self._flush_loop, name="profile-store-flusher", daemon=True
+        )
+        self._flusher.start()
+        atexit.register(self.close)
+
+    def get_profile(self, user_id: str) -> UserProfile:
+        """Get user profile, returning an empty one if it doesn't exist."""
+        with self._lock:
+            return self._load(user_id) or UserProfile(user_id=user_id)
+
+    def update_profile(self, user_id: str, **updates) -> UserProfile:
+        """Update the resident profile; only changed columns are written back."""
+        changes = {
+            key: value
+            for key, value in updates.items()
+            if key in PROFILE_COLUMNS and value is not None
+        }
+        with self._lock:
+            profile = self._load(user_id) or UserProfile(user_id=user_id)
+            if changes:
+                for key, value in changes.items():
+                    setattr(profile, key, value)
+                self._dirty_columns.setdefault(user_id, set()).update(changes)
+                self._resident.put(profile, dirty=True)
+                self._pending += 1
+                if self._pending >= self._batch_size:
+                    self._commit()
+                else:
+                    self._flush_event.set()
+            return profile
+
+    def flush(self) -> None:
+        """Write back and commit any pending changes."""
+        with self._lock:
+            self._commit()
+
+    def close(self) -> None:
+        """Commit pending writes and close the database connection."""
+        if self._closed:
+            return
+        self._closed = True
+        self._flush_event.set()
+        self._flusher.join()
+        with self._lock:
+            self._commit()
+            self._conn.close()
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM user_profiles LIMIT 1").fetchone()
+            return row is None
+
+    def iter_profiles(self, page_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        Stream every stored profile as a dictionary.
+
+        Uses a separate read connection so a long export neither holds the
+        store lock nor loads all rows into memory.
+        """
+        self.flush()
+        reader = sqlite3.connect(self._storage_path, timeout=30.0)
+        try:
+            cursor = reader.execute(
+                f"SELECT user_id, {', '.join(PROFILE_COLUMNS)} FROM user_profiles ORDER BY user_id"
+            )
+            while True:
+                rows = cursor.fetchmany(page_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield UserProfile(*row).to_dict()
+        finally:
+            reader.close()
+
+    def import_json_profiles(self, json_path: str) -> int:
+        """
+        One-shot import of a legacy user_profiles.json file.
+
+        Existing rows are overwritten column by column with the JSON values.
+
+        Returns:
+            Number of profiles imported
+        """
+        with open(json_path, "r") as f:
+            data = json.load(f)
+        return self.import_profiles(
+            {**profile_data, "user_id": user_id} for user_id, profile_data in data.items()
+        )
+
+    def import_profiles(self, profiles: Iterable[Dict[str, Any]]) -> int:
+        """Upsert many profile dictionaries in a single transaction."""
+        count = 0
+        with self._lock:
+            self._commit()
+            for profile_data in profiles:
+                changes = {
+                    key: value
+                    for key, value in profile_data.items()
+                    if key in PROFILE_COLUMNS and value is not None
+                }
+                self._upsert(profile_data["user_id"], changes)
+                count += 1
+            self._conn.commit()
+            self._resident.clear()
+        return count
+
+    # ------------------------------------------------------------------
+    # Internal helpers (callers hold self._lock)
+    # ------------------------------------------------------------------
+    def _load(self, user_id: str) -> Optional[UserProfile]:
+        """Return the resident profile, reading its row on a miss."""
+        profile = self._resident.get(user_id)
+        if profile is None:
+            row = self._conn.execute(
+                f"SELECT {', '.join(PROFILE_COLUMNS)} FROM user_profiles WHERE user_id = ?",
+                (user_id,),
+            ).fetchone()
+            if row is None:
+                # Unknown users are not made resident until first updated.
+                return None
+            profile = UserProfile(user_id=user_id, **dict(zip(PROFILE_COLUMNS, row)))
+            self._resident.put(profile)
+        return profile
+
+    def _upsert(self, user_id: str, changes: Dict[str, Any]) -> None:
+        if not changes:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO user_profiles (user_id) VALUES (?)", (user_id,)
+            )
+            return
+        columns = list(changes)
+        placeholders = ", ".join("?" for _ in columns)
+        assignments = ", ".join(f"{col} = excluded.{col}" for col in columns)
+        self._conn.execute(
+            f"INSERT INTO user_profiles (user_id, {', '.join(columns)}) VALUES (?, {placeholders}) "
+            f"ON CONFLICT(user_id) DO UPDATE SET {assignments}",
+            (user_id, *changes.values()),
+        )
+
+    def _commit(self) -> None:
+        dirty = self._resident.dirty_profiles()
+        for profile in dirty:
+            columns = self._dirty_columns.pop(profile.user_id, set())
+            self._upsert(profile.user_id, {col: getattr(profile, col) for col in columns})
+        if dirty or self._conn.in_transaction:
+            self._conn.commit()
+        # Only now is it safe to let eviction drop these profiles.
+        self._resident.mark_clean(p.user_id for p in dirty)
+        self._pending = 0
+
+    def _flush_loop(self) -> None:
+        while not self._closed:
+            self._flush_event.wait()
+            self._flush_event.clear()
+            if self._closed:
+                return
+            # Give concurrent writers a chance to join the same commit.
+            time.sleep(self._flush_interval)
+            try:
+                self.flush()
+            except sqlite3.Error as e:
+                print(f"Warning: Could not commit user profiles: {e}")
+
+
+def import_json_profiles(
+    json_path: str = "data/user_profiles.json",
+    db_path: str = "data/user_profiles.db",
+) -> int:
+    """Import a legacy JSON profile file into a SQLite database."""
+    store = SQLiteUserProfileStore(storage_path=db_path)
+    try:
+        return store.import_json_profiles(json_path)
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Import user_profiles.json into SQLite.")
+    parser.add_argument("json_path", nargs="?", default="data/user_profiles.json")
+    parser.add_argument("db_path", nargs="?", default="data/user_profiles.db")
+    args = parser.parse_args()
+    imported = import_json_profiles(args.json_path, args.db_path)
+    print(f"Imported {imported} profiles into {args.db_path}")
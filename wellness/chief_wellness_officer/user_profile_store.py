@@ -3,12 +3,19 @@ Centralized user profile management for the Chief Wellness Officer.
 Stores and retrieves user demographic and fitness information across sessions.
 """
 
+import contextlib
+from collections import OrderedDict
 from dataclasses import dataclass, asdict
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, Iterator, List, Set
 import json
 import os
 import threading
 
+from utils.file_lock import InterProcessLock, file_signature, multiprocess_enabled
+
+# Above this many users the JSON store warns that it keeps them all loaded.
+LARGE_JSON_STORE_USERS = 100_000
+
 
 @dataclass
 class UserProfile:
@@ -72,53 +79,157 @@ class UserProfile:
         return {k: v for k, v in asdict(self).items() if v is not None}
 
 
+class ResidentProfileCache:
+    """
+    LRU set of resident UserProfile objects.
+
+    Only clean entries are evicted; dirty entries (changes not yet persisted)
+    stay resident until the owning store flushes them and marks them clean,
+    so a write can never be dropped by eviction.
+    """
+
+    def __init__(self, max_resident: int = 1024):
+        self.max_resident = max_resident
+        self._profiles: "OrderedDict[str, UserProfile]" = OrderedDict()
+        self._dirty: Set[str] = set()
+
+    def get(self, user_id: str) -> Optional[UserProfile]:
+        profile = self._profiles.get(user_id)
+        if profile is not None:
+            self._profiles.move_to_end(user_id)
+        return profile
+
+    def put(self, profile: UserProfile, dirty: bool = False) -> None:
+        self._profiles[profile.user_id] = profile
+        self._profiles.move_to_end(profile.user_id)
+        if dirty:
+            self._dirty.add(profile.user_id)
+        self._evict()
+
+    def dirty_profiles(self) -> List[UserProfile]:
+        return [self._profiles[user_id] for user_id in self._dirty]
+
+    def mark_clean(self, user_ids: Iterable[str]) -> None:
+        self._dirty.difference_update(user_ids)
+        self._evict()
+
+    def clear(self) -> None:
+        """Drop clean entries (dirty ones must be flushed first)."""
+        for user_id in [uid for uid in self._profiles if uid not in self._dirty]:
+            del self._profiles[user_id]
+
+    def __len__(self) -> int:
+        return len(self._profiles)
+
+    def _evict(self) -> None:
+        if len(self._profiles) <= self.max_resident:
+            return
+        for user_id in list(self._profiles):
+            if len(self._profiles) <= self.max_resident:
+                break
+            if user_id not in self._dirty:
+                del self._profiles[user_id]
+
+
 class UserProfileStore:
-    """Thread-safe persistent store for user profiles."""
+    """
+    Thread-safe persistent store for user profiles.
+
+    The JSON file is read lazily on first access and profiles are only
+    materialized on demand, keeping at most max_resident UserProfile objects
+    alive. Unknown users get a transient empty profile that is not stored
+    until it is first updated.
+
+    max_resident does not bound memory here: a JSON document has to be
+    parsed whole, so the raw record of every user stays loaded. Tenants
+    with many users should use SQLiteUserProfileStore
+    (WELLNESS_PROFILE_BACKEND=sqlite), which loads profiles one row at a
+    time.
+
+    With multiprocess=True, every operation holds a cross-process file lock
+    and reloads the file when another worker has rewritten it, so several
+    api_server workers can share one profile file.
+    """
     
-    def __init__(self, storage_path: str = "data/user_profiles.json"):
-        self._lock = threading.Lock()
+    def __init__(
+        self,
+        storage_path: str = "data/user_profiles.json",
+        multiprocess: bool = False,
+        max_resident: int = 1024,
+    ):
+        self._multiprocess = multiprocess
+        if multiprocess:
+            self._lock = InterProcessLock(f"{storage_path}.lock")
+        else:
+            self._lock = threading.Lock()
         self._storage_path = storage_path
-        self._profiles: Dict[str, UserProfile] = {}
-        self._load_from_disk()
+        self._records: Optional[Dict[str, Dict[str, Any]]] = None
+        self._resident = ResidentProfileCache(max_resident)
+        self._signature = None
+        self._deferred = 0
+        self._unsaved = False
     
     def _load_from_disk(self) -> None:
-        """Load profiles from disk if file exists."""
+        """Load raw profile records from disk if file exists."""
+        self._records = {}
+        self._resident.clear()
+        self._signature = file_signature(self._storage_path)
         if os.path.exists(self._storage_path):
             try:
                 with open(self._storage_path, 'r') as f:
-                    data = json.load(f)
-                    for user_id, profile_data in data.items():
-                        self._profiles[user_id] = UserProfile(**profile_data)
+                    self._records = json.load(f)
             except Exception as e:
                 print(f"Warning: Could not load user profiles: {e}")
+        if len(self._records) > LARGE_JSON_STORE_USERS:
+            print(
+                f"Warning: {self._storage_path} holds {len(self._records)} profiles, all kept in memory; "
+                "set WELLNESS_PROFILE_BACKEND=sqlite to load them on demand"
+            )
     
     def _save_to_disk(self) -> None:
         """Persist profiles to disk."""
         os.makedirs(os.path.dirname(self._storage_path), exist_ok=True)
         try:
-            data = {
-                user_id: profile.to_dict()
-                for user_id, profile in self._profiles.items()
-            }
-            with open(self._storage_path, 'w') as f:
-                json.dump(data, f, indent=2)
+            # Write-then-rename so concurrent readers never see a partial file.
+            tmp_path = f"{self._storage_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(self._records, f, indent=2)
+            os.replace(tmp_path, self._storage_path)
+            self._signature = file_signature(self._storage_path)
+            self._unsaved = False
         except Exception as e:
             print(f"Warning: Could not save user profiles: {e}")
+
+    def _ensure_loaded(self) -> None:
+        """Load on first use, and reload if another process rewrote the file."""
+        if self._records is None:
+            self._load_from_disk()
+        elif self._multiprocess and file_signature(self._storage_path) != self._signature:
+            self._load_from_disk()
+
+    def _resident_profile(self, user_id: str) -> Optional[UserProfile]:
+        """Return the resident profile, materializing it from its record."""
+        profile = self._resident.get(user_id)
+        if profile is None and user_id in self._records:
+            try:
+                profile = UserProfile(**self._records[user_id])
+            except TypeError as e:
+                print(f"Warning: Could not load profile for {user_id}: {e}")
+                return None
+            self._resident.put(profile)
+        return profile
     
     def get_profile(self, user_id: str) -> UserProfile:
-        """Get user profile, creating a new one if it doesn't exist."""
+        """Get user profile, returning an empty one if it doesn't exist."""
         with self._lock:
-            if user_id not in self._profiles:
-                self._profiles[user_id] = UserProfile(user_id=user_id)
-            return self._profiles[user_id]
+            self._ensure_loaded()
+            return self._resident_profile(user_id) or UserProfile(user_id=user_id)
     
     def update_profile(self, user_id: str, **updates) -> UserProfile:
         """Update user profile with new information."""
-        # Avoid nested locking by operating directly on the internal dict
         with self._lock:
-            if user_id not in self._profiles:
-                self._profiles[user_id] = UserProfile(user_id=user_id)
-            profile = self._profiles[user_id]
+            self._ensure_loaded()
+            profile = self._resident_profile(user_id) or UserProfile(user_id=user_id)
 
             # Update only provided fields
             for key, value in updates.items():
@@ -126,10 +237,88 @@ class UserProfileStore:
                     setattr(profile, key, value)
 
             # Persist and return updated profile
-            self._profiles[user_id] = profile
+            self._records[user_id] = profile.to_dict()
+            self._resident.put(profile)
             self._save_to_disk()
             return profile
 
+    def iter_profiles(self) -> Iterator[Dict[str, Any]]:
+        """Yield every stored profile as a dictionary."""
+        with self._lock:
+            self._ensure_loaded()
+            records = list(self._records.values())
+        return iter(records)
+
+    def import_profiles(self, profiles: Iterable[Dict[str, Any]]) -> int:
+        """Merge many profile dictionaries with a single file rewrite."""
+        count = 0
+        with self._lock:
+            self._ensure_loaded()
+            for profile_data in profiles:
+                user_id = profile_data["user_id"]
+                merged = {**self._records.get(user_id, {}), **profile_data}
+                self._records[user_id] = {k: v for k, v in merged.items() if v is not None}
+                count += 1
+            self._resident.clear()
+            if self._deferred:
+                self._unsaved = True
+            else:
+                self._save_to_disk()
+        return count
+
+    @contextlib.contextmanager
+    def deferred_writes(self) -> Iterator[None]:
+        """
+        Hold import_profiles' file rewrites until the block exits.
+
+        A bulk import then rewrites the JSON file once instead of once per
+        batch. The file is saved even if the block raises. Shared
+        (multiprocess) stores keep saving per call, since holding unsaved
+        records would lose other workers' writes.
+        """
+        if self._multiprocess:
+            yield
+            return
+        with self._lock:
+            self._deferred += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._deferred -= 1
+                if not self._deferred and self._unsaved:
+                    self._save_to_disk()
+
+    def close(self) -> None:
+        # Every update is saved immediately; nothing to flush.
+        pass
+
+
+def create_profile_store():
+    """
+    Build the profile store selected by WELLNESS_PROFILE_BACKEND.
+
+    "json" (default) keeps data/user_profiles.json, which is loaded whole, so
+    its memory use grows with the number of users. "sqlite" uses
+    data/user_profiles.db, loads profiles on demand and keeps memory bounded
+    by max_resident; it imports the JSON file the first time the database is
+    created. WELLNESS_MULTIPROCESS=1 makes either backend safe
+    to share between worker processes.
+    """
+    backend = os.getenv("WELLNESS_PROFILE_BACKEND", "json")
+    multiprocess = multiprocess_enabled()
+    if backend == "json":
+        return UserProfileStore(multiprocess=multiprocess)
+    if backend == "sqlite":
+        from .sqlite_profile_store import SQLiteUserProfileStore
+
+        store = SQLiteUserProfileStore(multiprocess=multiprocess)
+        legacy_path = "data/user_profiles.json"
+        if store.is_empty() and os.path.exists(legacy_path):
+            store.import_json_profiles(legacy_path)
+        return store
+    raise ValueError(f"Unknown profile backend: {backend!r}")
+
 
 # Global instance
-profile_store = UserProfileStore()
+profile_store = create_profile_store()
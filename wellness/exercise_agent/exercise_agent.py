@@ -1,7 +1,9 @@
 
 from .exercise_tools import generate_workout_plan
+from .periodization import generate_program
 from google.adk.models.google_llm import Gemini
 from google.adk.agents import Agent
+from utils.token_budget import enforce_token_budget
 from utils.utils import get_retry_config
 
 
@@ -17,7 +19,9 @@ Responsibilities:
   - Beginners: max 5 days/week
   - Include rest days
   - Substitute exercises to avoid injury areas
-- Once goal + minutes_per_day + days_per_week are known, call generate_workout_plan.
+- Once goal + minutes_per_day + days_per_week are known, call generate_workout_plan. Pass the user's injuries and, if known, their available equipment (e.g. "dumbbells and a bench", "full gym"); omit equipment for bodyweight-only plans.
+- The tool returns concrete exercises for each workout day. Exercises with a "replaces" field were already swapped to avoid the injured body region; present them as given instead of inventing your own substitutions.
+- For multi-week programs (e.g. "a 12-week plan"), call generate_program once instead. It returns the weekly_plan repeated every week and a progression row per week (session minutes, sets, reps, target RPE, deload weeks); present the plan once and the progression as a compact table. If the user's details change mid-program, call it again with the updated values and start_week set to their current week rather than starting over.
 - Output structure:
   1. Summary of goal in user’s own words
   2. Weekly schedule (days + approximate durations)
@@ -36,5 +40,6 @@ exercise_agent = Agent(
     name='exercise_coach',
     description="A personalized exercise coach that creates workout plans. Receives user profile from CWO.",
     instruction=EXERCISE_AGENT_INSTRUCTION,
-    tools=[generate_workout_plan]
+    tools=[generate_workout_plan, generate_program],
+    before_model_callback=enforce_token_budget,
 )
@@ -0,0 +1,371 @@
+"""Local exercise library with contraindication flags and substitutions.
+
+Every exercise is tagged with its muscle group, the equipment it needs
+(bitset), an impact level and the body regions it loads (bitset). At import
+the library is indexed by muscle group, and a substitution graph is
+precomputed: for each exercise, the other exercises of the same group
+ordered from the gentlest to the most demanding. Activities whose label
+names a kind of exercise (walking, bodyweight work) only draw from the
+matching exercises, so a day's label and its exercise list agree.
+
+Injury and equipment free text is parsed once (cached) into region and
+equipment bitsets. Choosing the exercises for a workout day is then a walk
+over small precomputed lists with bit tests: take the default exercise for
+each slot and, when it loads an injured region, needs missing equipment or
+is too high-impact, replace it with the first suitable neighbour in the
+substitution graph.
+"""
+
+from __future__ import annotations
+
+import functools
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+# ------------------------------------------------------------------
+# Tags
+# ------------------------------------------------------------------
+NECK = 1 << 0
+SHOULDER = 1 << 1
+ELBOW = 1 << 2
+WRIST = 1 << 3
+LOWER_BACK = 1 << 4
+HIP = 1 << 5
+KNEE = 1 << 6
+ANKLE = 1 << 7
+
+REGION_NAMES = {
+    NECK: "neck",
+    SHOULDER: "shoulder",
+    ELBOW: "elbow",
+    WRIST: "wrist",
+    LOWER_BACK: "lower back",
+    HIP: "hip",
+    KNEE: "knee",
+    ANKLE: "ankle",
+}
+
+BODYWEIGHT = 0
+DUMBBELL = 1 << 0
+BARBELL = 1 << 1
+KETTLEBELL = 1 << 2
+BAND = 1 << 3
+MACHINE = 1 << 4
+BENCH = 1 << 5
+PULLUP_BAR = 1 << 6
+BIKE = 1 << 7
+POOL = 1 << 8
+
+LOW, MODERATE, HIGH = 0, 1, 2
+
+LEGS = "legs"
+PUSH = "push"
+PULL = "pull"
+SHOULDERS = "shoulders"
+CORE = "core"
+CARDIO = "cardio"
+MOBILITY = "mobility"
+BREATHING = "breathing"
+
+# Slot that only accepts the walking variants of the cardio group.
+WALKING = "walking"
+
+
+@dataclass(frozen=True)
+class Exercise:
+    name: str
+    group: str
+    equipment: int
+    impact: int
+    loads: int
+
+
+# Listed in order of preference within each group.
+EXERCISES: Tuple[Exercise, ...] = (
+    # Legs
+    Exercise("Goblet squat", LEGS, DUMBBELL, LOW, KNEE | HIP),
+    Exercise("Bodyweight squat", LEGS, BODYWEIGHT, LOW, KNEE | HIP),
+    Exercise("Barbell back squat", LEGS, BARBELL, LOW, KNEE | HIP | LOWER_BACK),
+    Exercise("Reverse lunge", LEGS, BODYWEIGHT, LOW, KNEE | HIP),
+    Exercise("Romanian deadlift", LEGS, DUMBBELL, LOW, LOWER_BACK | HIP),
+    Exercise("Jump squat", LEGS, BODYWEIGHT, HIGH, KNEE | HIP | ANKLE),
+    Exercise("Step-up", LEGS, BENCH, LOW, KNEE | ANKLE),
+    Exercise("Leg press", LEGS, MACHINE, LOW, KNEE | HIP),
+    Exercise("Wall sit", LEGS, BODYWEIGHT, LOW, KNEE),
+    Exercise("Glute bridge", LEGS, BODYWEIGHT, LOW, 0),
+    Exercise("Banded lateral walk", LEGS, BAND, LOW, 0),
+    Exercise("Seated leg curl", LEGS, MACHINE, LOW, 0),
+    Exercise("Side-lying leg raise", LEGS, BODYWEIGHT, LOW, 0),
+    # Push
+    Exercise("Push-up", PUSH, BODYWEIGHT, LOW, SHOULDER | ELBOW | WRIST),
+    Exercise("Dumbbell bench press", PUSH, DUMBBELL | BENCH, LOW, SHOULDER | ELBOW),
+    Exercise("Barbell bench press", PUSH, BARBELL | BENCH, LOW, SHOULDER | ELBOW | WRIST),
+    Exercise("Incline push-up", PUSH, BODYWEIGHT, LOW, WRIST),
+    Exercise("Machine chest press", PUSH, MACHINE, LOW, SHOULDER),
+    Exercise("Dumbbell floor press", PUSH, DUMBBELL, LOW, ELBOW),
+    Exercise("Band chest press", PUSH, BAND, LOW, 0),
+    Exercise("Wall push-up", PUSH, BODYWEIGHT, LOW, 0),
+    # Pull
+    Exercise("Pull-up", PULL, PULLUP_BAR, LOW, SHOULDER | ELBOW),
+    Exercise("One-arm dumbbell row", PULL, DUMBBELL, LOW, ELBOW),
+    Exercise("Barbell bent-over row", PULL, BARBELL, LOW, LOWER_BACK | ELBOW),
+    Exercise("Lat pulldown", PULL, MACHINE, LOW, SHOULDER),
+    Exercise("Superman hold", PULL, BODYWEIGHT, LOW, LOWER_BACK | NECK),
+    Exercise("Band row", PULL, BAND, LOW, 0),
+    Exercise("Seated cable row", PULL, MACHINE, LOW, 0),
+    Exercise("Prone Y-T raise", PULL, BODYWEIGHT, LOW, 0),
+    Exercise("Band pull-apart", PULL, BAND, LOW, 0),
+    # Shoulders
+    Exercise("Dumbbell overhead press", SHOULDERS, DUMBBELL, LOW, SHOULDER | ELBOW),
+    Exercise("Pike push-up", SHOULDERS, BODYWEIGHT, LOW, SHOULDER | WRIST | NECK),
+    Exercise("Lateral raise", SHOULDERS, DUMBBELL, LOW, SHOULDER),
+    Exercise("Band face pull", SHOULDERS, BAND, LOW, 0),
+    Exercise("Wall slide", SHOULDERS, BODYWEIGHT, LOW, 0),
+    # Core
+    Exercise("Plank", CORE, BODYWEIGHT, LOW, SHOULDER),
+    Exercise("Mountain climber", CORE, BODYWEIGHT, MODERATE, WRIST | SHOULDER | KNEE),
+    Exercise("Russian twist", CORE, BODYWEIGHT, LOW, LOWER_BACK),
+    Exercise("Crunch", CORE, BODYWEIGHT, LOW, NECK | LOWER_BACK),
+    Exercise("Hanging knee raise", CORE, PULLUP_BAR, LOW, SHOULDER),
+    Exercise("Bird dog", CORE, BODYWEIGHT, LOW, WRIST),
+    Exercise("Side plank", CORE, BODYWEIGHT, LOW, SHOULDER),
+    Exercise("Pallof press", CORE, BAND, LOW, 0),
+    Exercise("Dead bug", CORE, BODYWEIGHT, LOW, 0),
+    # Cardio
+    Exercise("Jogging", CARDIO, BODYWEIGHT, HIGH, KNEE | ANKLE | HIP),
+    Exercise("Brisk walk", CARDIO, BODYWEIGHT, LOW, 0),
+    Exercise("Jumping jacks", CARDIO, BODYWEIGHT, HIGH, KNEE | ANKLE),
+    Exercise("Burpees", CARDIO, BODYWEIGHT, HIGH, KNEE | ANKLE | WRIST | SHOULDER | LOWER_BACK),
+    Exercise("Kettlebell swing", CARDIO, KETTLEBELL, MODERATE, LOWER_BACK | HIP),
+    Exercise("Shadow boxing", CARDIO, BODYWEIGHT, MODERATE, SHOULDER),
+    Exercise("Rowing machine", CARDIO, MACHINE, LOW, LOWER_BACK),
+    Exercise("Swimming", CARDIO, POOL, LOW, SHOULDER),
+    Exercise("Stationary cycling", CARDIO, BIKE, LOW, 0),
+    Exercise("Elliptical", CARDIO, MACHINE, LOW, 0),
+    Exercise("Marching in place", CARDIO, BODYWEIGHT, LOW, 0),
+    Exercise("Walking intervals", CARDIO, BODYWEIGHT, LOW, 0),
+    Exercise("Incline treadmill walk", CARDIO, MACHINE, LOW, ANKLE),
+    Exercise("Stair walking", CARDIO, BODYWEIGHT, MODERATE, KNEE | ANKLE),
+    # Mobility
+    Exercise("Sun salutation", MOBILITY, BODYWEIGHT, LOW, WRIST | SHOULDER | LOWER_BACK),
+    Exercise("Warrior II", MOBILITY, BODYWEIGHT, LOW, KNEE | HIP),
+    Exercise("Downward dog", MOBILITY, BODYWEIGHT, LOW, WRIST | SHOULDER),
+    Exercise("Cat-cow", MOBILITY, BODYWEIGHT, LOW, WRIST),
+    Exercise("Half-kneeling hip flexor stretch", MOBILITY, BODYWEIGHT, LOW, KNEE),
+    Exercise("Child's pose", MOBILITY, BODYWEIGHT, LOW, KNEE),
+    Exercise("Seated hamstring stretch", MOBILITY, BODYWEIGHT, LOW, LOWER_BACK),
+    Exercise("Doorway chest stretch", MOBILITY, BODYWEIGHT, LOW, SHOULDER),
+    Exercise("Gentle neck rolls", MOBILITY, BODYWEIGHT, LOW, NECK),
+    Exercise("Thoracic rotation", MOBILITY, BODYWEIGHT, LOW, 0),
+    Exercise("Supine figure-four stretch", MOBILITY, BODYWEIGHT, LOW, 0),
+    Exercise("Legs-up-the-wall", MOBILITY, BODYWEIGHT, LOW, 0),
+    # Breathing
+    Exercise("Box breathing", BREATHING, BODYWEIGHT, LOW, 0),
+    Exercise("Diaphragmatic breathing", BREATHING, BODYWEIGHT, LOW, 0),
+    Exercise("4-7-8 breathing", BREATHING, BODYWEIGHT, LOW, 0),
+)
+
+_WALKING_VARIANTS = ("Brisk walk", "Marching in place", "Walking intervals", "Incline treadmill walk", "Stair walking")
+
+# Exercise slots (muscle groups, or WALKING) for each activity in the
+# workout templates.
+ACTIVITY_SLOTS: Dict[str, Tuple[str, ...]] = {
+    "Bodyweight Strength": (LEGS, PUSH, PULL, CORE),
+    "Resistance Training": (LEGS, PULL, PUSH, SHOULDERS),
+    "Calisthenics": (PUSH, PULL, LEGS, CORE),
+    "Yoga Flow": (MOBILITY, MOBILITY, MOBILITY, BREATHING),
+    "Walking": (WALKING, MOBILITY),
+    "Breathing Exercises": (BREATHING, BREATHING, MOBILITY),
+    "Stretching": (MOBILITY, MOBILITY, MOBILITY),
+    "Brisk Walking": (WALKING, MOBILITY),
+    "Circuit Training": (LEGS, PUSH, CORE, CARDIO),
+    "Cardio": (CARDIO, CARDIO, CORE),
+}
+
+# Equipment an activity may use; bodyweight work only gets a pull-up bar
+# even when the user has a full gym. Unlisted activities use everything.
+ACTIVITY_EQUIPMENT: Dict[str, int] = {
+    "Bodyweight Strength": PULLUP_BAR,
+    "Calisthenics": PULLUP_BAR,
+}
+
+
+# ------------------------------------------------------------------
+# Indexes (built at import)
+# ------------------------------------------------------------------
+def _popcount(value: int) -> int:
+    return bin(value).count("1")
+
+
+_BY_GROUP: Dict[str, Tuple[int, ...]] = {}
+for _i, _exercise in enumerate(EXERCISES):
+    _BY_GROUP.setdefault(_exercise.group, ())
+    _BY_GROUP[_exercise.group] += (_i,)
+
+
+def _build_substitutions() -> Tuple[Tuple[int, ...], ...]:
+    """Same-group alternatives per exercise, gentlest first."""
+    graph = []
+    for i, exercise in enumerate(EXERCISES):
+        peers = [j for j in _BY_GROUP[exercise.group] if j != i]
+        peers.sort(
+            key=lambda j: (
+                _popcount(EXERCISES[j].loads),
+                EXERCISES[j].impact,
+                EXERCISES[j].equipment != exercise.equipment,
+                j,
+            )
+        )
+        graph.append(tuple(peers))
+    return tuple(graph)
+
+
+SUBSTITUTIONS = _build_substitutions()
+
+# Candidate exercises per slot, in order of preference.
+_BY_SLOT: Dict[str, Tuple[int, ...]] = {
+    **_BY_GROUP,
+    WALKING: tuple(i for i in _BY_GROUP[CARDIO] if EXERCISES[i].name in _WALKING_VARIANTS),
+}
+
+
+# ------------------------------------------------------------------
+# Free-text parsing
+# ------------------------------------------------------------------
+_REGION_KEYWORDS = {
+    "neck": NECK,
+    "cervical": NECK,
+    "shoulder": SHOULDER,
+    "rotator": SHOULDER,
+    "elbow": ELBOW,
+    "wrist": WRIST,
+    "carpal": WRIST,
+    "hand": WRIST,
+    "back": LOWER_BACK,
+    "spine": LOWER_BACK,
+    "spinal": LOWER_BACK,
+    "disc": LOWER_BACK,
+    "sciatica": LOWER_BACK,
+    "lumbar": LOWER_BACK,
+    "hip": HIP,
+    "groin": HIP,
+    "knee": KNEE,
+    "acl": KNEE,
+    "mcl": KNEE,
+    "meniscus": KNEE,
+    "patella": KNEE,
+    "ankle": ANKLE,
+    "achilles": ANKLE,
+    "foot": ANKLE,
+    "feet": ANKLE,
+    "plantar": ANKLE,
+    "shin": ANKLE,
+}
+
+_EQUIPMENT_KEYWORDS = {
+    "dumbbell": DUMBBELL,
+    "barbell": BARBELL,
+    "kettlebell": KETTLEBELL,
+    "band": BAND,
+    "machine": MACHINE,
+    "cable": MACHINE,
+    "bench": BENCH,
+    "pull-up bar": PULLUP_BAR,
+    "pullup bar": PULLUP_BAR,
+    "pull up bar": PULLUP_BAR,
+    "chin-up bar": PULLUP_BAR,
+    "bike": BIKE,
+    "cycle": BIKE,
+    "pool": POOL,
+    "gym": DUMBBELL | BARBELL | KETTLEBELL | BAND | MACHINE | BENCH | PULLUP_BAR | BIKE,
+}
+
+
+def _keyword_re(keywords) -> re.Pattern:
+    alternation = "|".join(sorted(map(re.escape, keywords), key=len, reverse=True))
+    return re.compile(rf"\b({alternation})s?\b")
+
+
+_REGION_RE = _keyword_re(_REGION_KEYWORDS)
+_EQUIPMENT_RE = _keyword_re(_EQUIPMENT_KEYWORDS)
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_injuries(injuries: Optional[str]) -> int:
+    """Body-region bitset for an injury description ("none" -> 0)."""
+    regions = 0
+    for match in _REGION_RE.finditer((injuries or "").lower()):
+        regions |= _REGION_KEYWORDS[match.group(1)]
+    return regions
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_equipment(equipment: Optional[str]) -> int:
+    """Equipment bitset for a description; bodyweight work needs none."""
+    available = BODYWEIGHT
+    for match in _EQUIPMENT_RE.finditer((equipment or "").lower()):
+        available |= _EQUIPMENT_KEYWORDS[match.group(1)]
+    return available
+
+
+def region_names(regions: int) -> List[str]:
+    return [name for bit, name in REGION_NAMES.items() if regions & bit]
+
+
+# ------------------------------------------------------------------
+# Selection
+# ------------------------------------------------------------------
+def _suitable(exercise: Exercise, equipment: int, injured: int, max_impact: int) -> bool:
+    return (
+        exercise.equipment & ~equipment == 0
+        and exercise.loads & injured == 0
+        and exercise.impact <= max_impact
+    )
+
+
+@functools.lru_cache(maxsize=4096)
+def select_exercises(
+    activity: str,
+    day_index: int,
+    equipment: int = BODYWEIGHT,
+    injured: int = 0,
+    max_impact: int = HIGH,
+) -> Tuple[Tuple[str, str, Optional[str]], ...]:
+    """
+    Pick the exercises for one workout day.
+
+    Returns ``(name, group, replaced name or None)`` per slot of
+    ``activity``. The default for a slot is the preferred exercise of the
+    slot that the equipment allows (the user's, narrowed by
+    ACTIVITY_EQUIPMENT), rotated by day so consecutive sessions vary. If
+    it loads an injured region or exceeds ``max_impact``, the first
+    suitable unused neighbour in the substitution graph that also fits the
+    slot replaces it. Slots with no suitable exercise are left out.
+    """
+    equipment &= ACTIVITY_EQUIPMENT.get(activity, equipment)
+    chosen: List[Tuple[str, str, Optional[str]]] = []
+    used = set()
+    for position, slot in enumerate(ACTIVITY_SLOTS.get(activity, ())):
+        candidates = _BY_SLOT[slot]
+        available = [i for i in candidates if EXERCISES[i].equipment & ~equipment == 0 and i not in used]
+        if not available:
+            continue
+        default = available[(day_index + position) % len(available)]
+        if _suitable(EXERCISES[default], equipment, injured, max_impact):
+            pick, replaced = default, None
+        else:
+            pick = next(
+                (
+                    j
+                    for j in SUBSTITUTIONS[default]
+                    if j in candidates and j not in used and _suitable(EXERCISES[j], equipment, injured, max_impact)
+                ),
+                None,
+            )
+            if pick is None:
+                continue
+            replaced = EXERCISES[default].name
+        used.add(pick)
+        chosen.append((EXERCISES[pick].name, EXERCISES[pick].group, replaced))
+    return tuple(chosen)
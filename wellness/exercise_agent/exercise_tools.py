@@ -1,4 +1,135 @@
-from typing import Dict
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from utils.goal_classifier import classify_goal
+from utils.plan_cache import memoize_plan
+
+from .exercise_library import (
+    ANKLE,
+    HIGH,
+    HIP,
+    KNEE,
+    LOW,
+    MODERATE,
+    parse_equipment,
+    parse_injuries,
+    region_names,
+    select_exercises,
+)
+
+# Above these the plan adds joint-friendly guidance and caps impact.
+_OLDER_ADULT_AGE = 50
+_HEAVY_WEIGHT_KG = 90
+
+
+def _goal_category(goal: str) -> str:
+    """Workout program for a goal: "stress", "strength" or "general"."""
+    profile = classify_goal(goal)
+    if profile.stress_reduction:
+        return "stress"
+    if profile.muscle_gain:
+        return "strength"
+    return "general"
+
+
+_WEEK_DAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+_REST_ACTIVITY = "Light active recovery (optional walk)"
+
+# Per goal category: (intensities, activity pool, summary).
+_GOAL_PROGRAMS = {
+    "stress": (
+        ("Very Light", "Light", "Moderate"),
+        ("Yoga Flow", "Walking", "Breathing Exercises", "Stretching"),
+        "To help with stress, this plan focuses on consistent, light movement to regulate cortisol.",
+    ),
+    "strength": (
+        ("Moderate", "Hard"),
+        ("Bodyweight Strength", "Resistance Training", "Calisthenics"),
+        "Focus on progressive overload with strength movements.",
+    ),
+    "general": (
+        ("Light", "Moderate"),
+        ("Brisk Walking", "Circuit Training", "Cardio"),
+        "A balanced mix of cardio and light resistance to boost metabolism.",
+    ),
+}
+
+# Session length caps per fitness level; None means the requested minutes.
+_DURATION_CAPS = {"beginner": 20, "intermediate": 40, "advanced": None}
+
+# Workout day indices (Monday = 0) per days_per_week, clamped to 0..5.
+_WORKOUT_DAYS = {
+    0: (),
+    1: (0,),
+    2: (0, 1),
+    3: (0, 2, 4),
+    4: (0, 2, 4, 6),
+    5: (0, 1, 2, 3, 4),
+}
+
+
+@dataclass(frozen=True)
+class _WorkoutTemplate:
+    """Precompiled schedule for one (goal category, level, days) combination.
+
+    ``days`` holds one read-only schedule entry per weekday; workout entries
+    get the user's session duration filled in, everything else is copied as
+    is. Only the duration and the guideline overlays depend on the user.
+    """
+
+    summary: str
+    duration_cap: Optional[int]
+    days: Tuple[Dict[str, str], ...]
+
+
+def _compile_template(category: str, fitness_level: str, days_per_week: int) -> _WorkoutTemplate:
+    intensities, activities_pool, summary = _GOAL_PROGRAMS[category]
+    if fitness_level == "beginner":
+        activities_pool = tuple(a for a in activities_pool if "Hard" not in a)
+    workout_days = frozenset(_WORKOUT_DAYS[days_per_week])
+
+    days = []
+    for i, day_name in enumerate(_WEEK_DAYS):
+        if i in workout_days:
+            day_plan = {
+                "day": day_name,
+                "type": "Workout",
+                "activity": activities_pool[i % len(activities_pool)],
+                "duration": "",
+                "intensity": intensities[0] if i == 0 else intensities[1 % len(intensities)],
+            }
+        else:
+            day_plan = {"day": day_name, "type": "Rest", "activity": _REST_ACTIVITY, "duration": "-"}
+        days.append(day_plan)
+    return _WorkoutTemplate(summary, _DURATION_CAPS[fitness_level], tuple(days))
+
+
+_TEMPLATES: Mapping[Tuple[str, str, int], _WorkoutTemplate] = MappingProxyType(
+    {
+        (category, level, days): _compile_template(category, level, days)
+        for category in _GOAL_PROGRAMS
+        for level in _DURATION_CAPS
+        for days in _WORKOUT_DAYS
+    }
+)
+
+
+def _template_key(goal: str, fitness_level: str, days_per_week: int) -> Tuple[str, str, int]:
+    level = fitness_level.lower()
+    if level not in _DURATION_CAPS:
+        level = "advanced"
+    return _goal_category(goal), level, min(max(days_per_week, 0), 5)
+
+
+def _session_minutes(key: Tuple[str, str, int], minutes_per_day: int) -> int:
+    """Session length for a template key, after the fitness level's cap."""
+    cap = _TEMPLATES[key].duration_cap
+    return minutes_per_day if cap is None else min(minutes_per_day, cap)
+
+
+def _personalization(gender: str, age: int, weight: float) -> str:
+    return f"Plan customized for {gender}, age {age}, weight {weight}kg"
 
 
 def build_workout_plan(
@@ -10,6 +141,7 @@ def build_workout_plan(
     weight: float,
     gender: str,
     injuries: str = "none",
+    equipment: Optional[str] = None,
 ) -> Dict:
     """Deterministically builds the workout plan payload.
 
@@ -17,91 +149,90 @@ def build_workout_plan(
     ADK tool schema remains compatible with the Google GenAI function-calling API.
     """
 
-    goal = goal.lower()
-    fitness_level = fitness_level.lower()
+    key = _template_key(goal, fitness_level, days_per_week)
+    template = _TEMPLATES[key]
+
+    injured = parse_injuries(injuries)
+    available = parse_equipment(equipment)
+    if injured & (KNEE | ANKLE | HIP):
+        max_impact = LOW
+    elif age > _OLDER_ADULT_AGE or weight > _HEAVY_WEIGHT_KG or key[1] == "beginner":
+        max_impact = MODERATE
+    else:
+        max_impact = HIGH
+
+    duration = f"{_session_minutes(key, minutes_per_day)} mins"
+    schedule = []
+    substituted = False
+    for i, day in enumerate(template.days):
+        if day["type"] != "Workout":
+            schedule.append(day.copy())
+            continue
+        exercises = []
+        for name, group, replaced in select_exercises(day["activity"], i, available, injured, max_impact):
+            exercise = {"name": name, "focus": group}
+            if replaced:
+                exercise["replaces"] = replaced
+                substituted = True
+            exercises.append(exercise)
+        schedule.append({**day, "duration": duration, "exercises": exercises})
 
     plan = {
-        "summary": "",
-        "schedule": [],
+        "summary": template.summary,
+        "schedule": schedule,
         "guidelines": [],
-        "personalization": f"Plan customized for {gender}, age {age}, weight {weight}kg",
+        "personalization": _personalization(gender, age, weight),
     }
 
-    if "stress" in goal:
-        intensities = ["Very Light", "Light", "Moderate"]
-        activities_pool = ["Yoga Flow", "Walking", "Breathing Exercises", "Stretching"]
-        plan["summary"] = (
-            f"To help with stress, this plan focuses on consistent, {intensities[1].lower()} movement to regulate cortisol."
-        )
-    elif "muscle" in goal or "strength" in goal:
-        intensities = ["Moderate", "Hard"]
-        activities_pool = ["Bodyweight Strength", "Resistance Training", "Calisthenics"]
-        plan["summary"] = "Focus on progressive overload with strength movements."
-    else:
-        intensities = ["Light", "Moderate"]
-        activities_pool = ["Brisk Walking", "Circuit Training", "Cardio"]
-        plan["summary"] = "A balanced mix of cardio and light resistance to boost metabolism."
-
-    if fitness_level == "beginner":
-        base_duration = min(minutes_per_day, 20)
-        activities_pool = [a for a in activities_pool if "Hard" not in a]
-    elif fitness_level == "intermediate":
-        base_duration = min(minutes_per_day, 40)
-    else:
-        base_duration = minutes_per_day
-
-    week_days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-    if days_per_week >= 5:
-        workout_indices = [0, 1, 2, 3, 4]
-    elif days_per_week == 4:
-        workout_indices = [0, 2, 4, 6]
-    elif days_per_week == 3:
-        workout_indices = [0, 2, 4]
-    else:
-        workout_indices = range(days_per_week)
-
-    for i, day_name in enumerate(week_days):
-        day_plan = {"day": day_name}
-        if i in workout_indices:
-            activity = activities_pool[i % len(activities_pool)]
-            day_plan.update(
-                {
-                    "type": "Workout",
-                    "activity": activity,
-                    "duration": f"{base_duration} mins",
-                    "intensity": intensities[0] if i == 0 else intensities[1 % len(intensities)],
-                }
-            )
-        else:
-            day_plan.update(
-                {
-                    "type": "Rest",
-                    "activity": "Light active recovery (optional walk)",
-                    "duration": "-",
-                }
-            )
-        plan["schedule"].append(day_plan)
-
     # Age-based adjustments
-    if age > 50:
+    if age > _OLDER_ADULT_AGE:
         plan["guidelines"].append("Focus on joint-friendly movements and proper warm-up.")
         plan["summary"] += " Age-appropriate modifications included."
     
     # Weight-based guidance
-    if weight > 90:
+    if weight > _HEAVY_WEIGHT_KG:
         plan["guidelines"].append("Consider low-impact exercises to protect joints.")
     
     plan["guidelines"].append("Hydrate before and after sessions.")
     if injuries and injuries.lower() != "none":
         plan["guidelines"].append(f"CAUTION: Modify exercises to accommodate your {injuries}.")
         plan["summary"] += f" Please be careful with your {injuries}."
+    if substituted:
+        plan["guidelines"].append(
+            "Exercises marked 'replaces' were swapped for options that avoid loading your "
+            f"{' / '.join(region_names(injured)) or 'joints'}."
+        )
 
-    if "stress" in goal:
+    if key[0] == "stress":
         plan["guidelines"].append("Focus on deep breathing during movement.")
 
     return plan
 
 
+def _plan_cache_key(args: Dict[str, Any]) -> Tuple[Tuple, Dict[str, Any]]:
+    """Key plans on what they depend on, not on raw text or exact age/weight.
+
+    Age and weight only matter through the guideline thresholds, so those
+    flags are the key; the plan is built from the caller's real values and
+    the echoed personalization line is restored on every hit.
+    """
+    key = (
+        _template_key(args["goal"], args["fitness_level"], args["days_per_week"]),
+        args["minutes_per_day"],
+        args["age"] > _OLDER_ADULT_AGE,
+        args["weight"] > _HEAVY_WEIGHT_KG,
+        args["gender"],
+        args["injuries"],
+        parse_equipment(args["equipment"]),
+    )
+    return key, args
+
+
+def _restore_personalization(plan: Dict, args: Dict[str, Any]) -> None:
+    plan["personalization"] = _personalization(args["gender"], args["age"], args["weight"])
+
+
+@memoize_plan(_plan_cache_key, _restore_personalization)
 def generate_workout_plan(
     goal: str,
     minutes_per_day: int,
@@ -111,12 +242,16 @@ def generate_workout_plan(
     weight: float,
     gender: str,
     injuries: str = "none",
+    equipment: Optional[str] = None,
 ) -> Dict:
     """Generate a personalized workout plan.
 
     Called by the Exercise Agent. The CWO provides the user's profile information
     (age, weight, gender, fitness_level, injuries) via context so the agent can
-    fill these parameters when invoking the tool.
+    fill these parameters when invoking the tool. ``equipment`` is free text
+    such as "dumbbells and a bench" or "full gym"; bodyweight only if omitted.
+    Each workout day lists concrete exercises, already substituted to avoid
+    the injured body regions.
     """
 
     plan = build_workout_plan(
@@ -128,6 +263,7 @@ def generate_workout_plan(
         weight=weight,
         gender=gender,
         injuries=injuries,
+        equipment=equipment,
     )
 
     return plan
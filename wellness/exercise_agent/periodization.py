@@ -0,0 +1,260 @@
+"""Multi-week periodized programs built on ``build_workout_plan``.
+
+A program is split into blocks of ``block_length`` weeks. Within a block
+the load rises week over week (progressive overload) and the last week is
+a deload. Each block also starts a little above the previous one, so the
+program trends upward across blocks.
+
+Overload is carried by sets, reps and target effort, not by session
+length: the fitness level's duration cap (20 minutes for beginners) would
+swallow longer sessions anyway. Only deload weeks change the length, by
+shortening the capped session.
+
+Every week is a pure function of the program parameters and its week
+number. Programs are therefore produced lazily by a generator, one week at
+a time, and are never materialized up front. When a user's parameters
+change mid-program, restarting the generator at ``start_week`` recomputes
+only the weeks that remain. :func:`generate_program` gives the agent the
+whole program in one call: the weekly schedule once, plus one short
+progression row per week.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterator, List, Optional
+
+from .exercise_tools import _session_minutes, _template_key, build_workout_plan
+
+DEFAULT_WEEKS = 12
+DEFAULT_BLOCK_LENGTH = 4
+MAX_WEEKS = 52
+
+# Reps added per loading week within a block, and per completed block.
+_WEEKLY_OVERLOAD = 0.10
+_BLOCK_OVERLOAD = 0.05
+# Deload weeks shorten the (capped) session to this share.
+_DELOAD_SESSION = 0.6
+
+# (sets per exercise, reps per set, target RPE) at the start of a block,
+# per fitness level.
+_BASE_LOAD = {"beginner": (2, 10, 6), "intermediate": (3, 10, 7), "advanced": (3, 8, 7)}
+_MAX_RPE = 9
+_DELOAD_RPE = 5
+
+_PHASES = ("Foundation", "Build", "Peak")
+
+
+def _phase(week: int, weeks: int) -> str:
+    """Foundation, Build or Peak: the third of the program ``week`` falls in."""
+    return _PHASES[min((week - 1) * len(_PHASES) // weeks, len(_PHASES) - 1)]
+
+
+def _week_parameters(week: int, block_length: int, fitness_level: str) -> Dict[str, object]:
+    block, position = divmod(week - 1, block_length)
+    base_sets, base_reps, base_rpe = _BASE_LOAD[fitness_level]
+    if block_length > 1 and position == block_length - 1:
+        sets, reps = max(base_sets - 1, 1), base_reps
+        params = {"deload": True, "session": _DELOAD_SESSION, "target_rpe": _DELOAD_RPE}
+    else:
+        overload = 1 + position * _WEEKLY_OVERLOAD + block * _BLOCK_OVERLOAD
+        sets, reps = base_sets + (1 if position >= 2 else 0), int(base_reps * overload + 0.5)
+        params = {"deload": False, "session": 1.0, "target_rpe": min(base_rpe + position, _MAX_RPE)}
+    # Training volume (sets x reps) relative to the first week.
+    params.update(sets=sets, reps=reps, volume=sets * reps / (base_sets * base_reps))
+    return params
+
+
+def _week_summary(week: int, weeks: int, params: Dict[str, object], minutes: int) -> Dict:
+    if params["deload"]:
+        focus = "Deload: lighter sessions and fewer sets so the body can recover."
+    elif week == 1:
+        focus = "Establish the routine and learn each movement with good form."
+    else:
+        focus = "Progressive overload: add reps, sets or effort over last week."
+    return {
+        "week": week,
+        "phase": _phase(week, weeks),
+        "deload": params["deload"],
+        "session_minutes": minutes,
+        "sets_per_exercise": params["sets"],
+        "reps_per_set": params["reps"],
+        "target_rpe": params["target_rpe"],
+        "volume_pct": int(round(params["volume"] * 100)),
+        "focus": focus,
+    }
+
+
+def build_program_week(
+    week: int,
+    goal: str,
+    minutes_per_day: int,
+    days_per_week: int,
+    fitness_level: str,
+    age: int,
+    weight: float,
+    gender: str,
+    injuries: str = "none",
+    equipment: Optional[str] = None,
+    weeks: int = DEFAULT_WEEKS,
+    block_length: int = DEFAULT_BLOCK_LENGTH,
+) -> Dict:
+    """Build week ``week`` (1-based) of a periodized program.
+
+    The week's workout plan comes from :func:`build_workout_plan` at the
+    capped session length (shortened in deload weeks); every workout day
+    also gets the week's sets per exercise, reps per set and target RPE.
+    """
+    _validate(weeks, week, block_length)
+    key = _template_key(goal, fitness_level, days_per_week)
+    params = _week_parameters(week, block_length, key[1])
+
+    minutes = max(int(round(_session_minutes(key, minutes_per_day) * params["session"])), 1)
+    plan = build_workout_plan(
+        goal=goal,
+        minutes_per_day=minutes,
+        days_per_week=days_per_week,
+        fitness_level=fitness_level,
+        age=age,
+        weight=weight,
+        gender=gender,
+        injuries=injuries,
+        equipment=equipment,
+    )
+    for day in plan["schedule"]:
+        if day["type"] == "Workout":
+            day["sets_per_exercise"] = params["sets"]
+            day["reps_per_set"] = params["reps"]
+            day["target_rpe"] = params["target_rpe"]
+            if params["deload"]:
+                day["intensity"] = "Deload"
+
+    return {**_week_summary(week, weeks, params, minutes), "weeks": weeks, "plan": plan}
+
+
+def iter_program_weeks(
+    goal: str,
+    minutes_per_day: int,
+    days_per_week: int,
+    fitness_level: str,
+    age: int,
+    weight: float,
+    gender: str,
+    injuries: str = "none",
+    equipment: Optional[str] = None,
+    weeks: int = DEFAULT_WEEKS,
+    block_length: int = DEFAULT_BLOCK_LENGTH,
+    start_week: int = 1,
+) -> Iterator[Dict]:
+    """Yield the weeks of a periodized program, from ``start_week`` on.
+
+    Weeks are built only as they are consumed. To apply changed
+    parameters (a new injury, fewer training days) mid-program, call again
+    with the new values and ``start_week`` set to the first week that has
+    not been done yet. Arguments are validated immediately, not on the
+    first ``next()``.
+    """
+    _validate(weeks, start_week, block_length)
+    profile = {
+        "goal": goal,
+        "minutes_per_day": minutes_per_day,
+        "days_per_week": days_per_week,
+        "fitness_level": fitness_level,
+        "age": age,
+        "weight": weight,
+        "gender": gender,
+        "injuries": injuries,
+        "equipment": equipment,
+        "weeks": weeks,
+        "block_length": block_length,
+    }
+    return (build_program_week(week, **profile) for week in range(start_week, weeks + 1))
+
+
+def _validate(weeks: int, week: int, block_length: int) -> None:
+    if not 1 <= weeks <= MAX_WEEKS:
+        raise ValueError(f"A program must last between 1 and {MAX_WEEKS} weeks.")
+    if not 1 <= week <= weeks:
+        raise ValueError(f"Week must be between 1 and {weeks}.")
+    if block_length < 1:
+        raise ValueError("Block length must be at least one week.")
+
+
+def build_program(
+    goal: str,
+    minutes_per_day: int,
+    days_per_week: int,
+    fitness_level: str,
+    age: int,
+    weight: float,
+    gender: str,
+    injuries: str = "none",
+    equipment: Optional[str] = None,
+    weeks: int = DEFAULT_WEEKS,
+    block_length: int = DEFAULT_BLOCK_LENGTH,
+    start_week: int = 1,
+) -> Dict:
+    """Compact form of a whole program, from ``start_week`` on.
+
+    The workout days are the same every week, so the weekly plan is built
+    once; each week only adds a progression row (session length, sets,
+    reps, target RPE, deload flag). The rows match what
+    :func:`build_program_week` puts on the workout days of that week.
+    """
+    _validate(weeks, start_week, block_length)
+    key = _template_key(goal, fitness_level, days_per_week)
+    minutes = _session_minutes(key, minutes_per_day)
+    plan = build_workout_plan(
+        goal=goal,
+        minutes_per_day=minutes,
+        days_per_week=days_per_week,
+        fitness_level=fitness_level,
+        age=age,
+        weight=weight,
+        gender=gender,
+        injuries=injuries,
+        equipment=equipment,
+    )
+    progression: List[Dict] = []
+    for week in range(start_week, weeks + 1):
+        params = _week_parameters(week, block_length, key[1])
+        progression.append(_week_summary(week, weeks, params, max(int(round(minutes * params["session"])), 1)))
+    return {"weeks": weeks, "block_length": block_length, "weekly_plan": plan, "progression": progression}
+
+
+def generate_program(
+    goal: str,
+    minutes_per_day: int,
+    days_per_week: int,
+    fitness_level: str,
+    age: int,
+    weight: float,
+    gender: str,
+    injuries: str = "none",
+    equipment: Optional[str] = None,
+    weeks: int = DEFAULT_WEEKS,
+    start_week: int = 1,
+) -> Dict:
+    """Generate a multi-week periodized workout program in one call.
+
+    Called by the Exercise Agent when the user asks for a program spanning
+    several weeks (e.g. a 12-week plan). Programs run in 4-week blocks:
+    three weeks of progressive overload followed by a deload week.
+    ``weekly_plan`` is the schedule and exercises repeated every week;
+    ``progression`` has one row per week with the session length, sets,
+    reps and target RPE to use. If the user's details change mid-program,
+    call again with the new values and ``start_week`` set to their current
+    week.
+    """
+    return build_program(
+        goal=goal,
+        minutes_per_day=minutes_per_day,
+        days_per_week=days_per_week,
+        fitness_level=fitness_level,
+        age=age,
+        weight=weight,
+        gender=gender,
+        injuries=injuries,
+        equipment=equipment,
+        weeks=weeks,
+        start_week=start_week,
+    )
@@ -0,0 +1,218 @@
+"""
+Benchmark for the precompiled workout templates.
+Builds plans for the same randomized users twice:
+
+* per-call compilation: the template is rebuilt on every call, which is
+  what build_workout_plan did before the templates were precompiled;
+* build_workout_plan with the precompiled table.
+
+Every plan is also checked against legacy_build_workout_plan, the body
+of build_workout_plan from before the templates were precompiled.
+
+Run from the wellness/ directory:
+    python -m exercise_agent.workout_plan_bench            # 100k users
+    python -m exercise_agent.workout_plan_bench 20000
+"""
+
+import contextlib
+import random
+import sys
+import time
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from . import exercise_tools
+from .exercise_tools import build_workout_plan
+
+GOALS = ["reduce stress", "Build Muscle", "gain STRENGTH", "lose weight", "get fit", ""]
+LEVELS = ["beginner", "Intermediate", "ADVANCED", "expert", "pro"]
+INJURIES = ["none", "None", "knee pain", "", "lower back", "sore shoulder"]
+EQUIPMENT = [None, "dumbbells", "full gym", "resistance bands and a bench"]
+
+
+def random_profiles(size: int, seed: int = 5) -> List[Dict[str, Any]]:
+    """Keyword arguments of build_workout_plan for ``size`` random users."""
+    rng = random.Random(seed)
+    return [
+        {
+            "goal": rng.choice(GOALS),
+            "minutes_per_day": rng.choice([10, 20, 30, 45, 60, 90]),
+            "days_per_week": rng.randint(-2, 8),
+            "fitness_level": rng.choice(LEVELS),
+            "age": rng.randint(16, 80),
+            "weight": round(rng.uniform(40, 140), 1),
+            "gender": rng.choice(["male", "female"]),
+            "injuries": rng.choice(INJURIES),
+            "equipment": rng.choice(EQUIPMENT),
+        }
+        for _ in range(size)
+    ]
+
+
+def legacy_build_workout_plan(
+    goal: str,
+    minutes_per_day: int,
+    days_per_week: int,
+    fitness_level: str,
+    age: int,
+    weight: float,
+    gender: str,
+    injuries: str = "none",
+    equipment: Optional[str] = None,
+) -> Dict:
+    """build_workout_plan as it was before the templates were precompiled.
+
+    ``equipment`` is accepted and ignored; it only drives the exercise
+    lists, which :func:`template_fields` leaves out of the comparison.
+    """
+
+    category = exercise_tools._goal_category(goal)
+    fitness_level = fitness_level.lower()
+
+    plan = {
+        "summary": "",
+        "schedule": [],
+        "guidelines": [],
+        "personalization": f"Plan customized for {gender}, age {age}, weight {weight}kg",
+    }
+
+    if category == "stress":
+        intensities = ["Very Light", "Light", "Moderate"]
+        activities_pool = ["Yoga Flow", "Walking", "Breathing Exercises", "Stretching"]
+        plan["summary"] = (
+            f"To help with stress, this plan focuses on consistent, {intensities[1].lower()} movement to regulate cortisol."
+        )
+    elif category == "strength":
+        intensities = ["Moderate", "Hard"]
+        activities_pool = ["Bodyweight Strength", "Resistance Training", "Calisthenics"]
+        plan["summary"] = "Focus on progressive overload with strength movements."
+    else:
+        intensities = ["Light", "Moderate"]
+        activities_pool = ["Brisk Walking", "Circuit Training", "Cardio"]
+        plan["summary"] = "A balanced mix of cardio and light resistance to boost metabolism."
+
+    if fitness_level == "beginner":
+        base_duration = min(minutes_per_day, 20)
+        activities_pool = [a for a in activities_pool if "Hard" not in a]
+    elif fitness_level == "intermediate":
+        base_duration = min(minutes_per_day, 40)
+    else:
+        base_duration = minutes_per_day
+
+    week_days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+    if days_per_week >= 5:
+        workout_indices = [0, 1, 2, 3, 4]
+    elif days_per_week == 4:
+        workout_indices = [0, 2, 4, 6]
+    elif days_per_week == 3:
+        workout_indices = [0, 2, 4]
+    else:
+        workout_indices = range(days_per_week)
+
+    for i, day_name in enumerate(week_days):
+        day_plan = {"day": day_name}
+        if i in workout_indices:
+            activity = activities_pool[i % len(activities_pool)]
+            day_plan.update(
+                {
+                    "type": "Workout",
+                    "activity": activity,
+                    "duration": f"{base_duration} mins",
+                    "intensity": intensities[0] if i == 0 else intensities[1 % len(intensities)],
+                }
+            )
+        else:
+            day_plan.update(
+                {
+                    "type": "Rest",
+                    "activity": "Light active recovery (optional walk)",
+                    "duration": "-",
+                }
+            )
+        plan["schedule"].append(day_plan)
+
+    # Age-based adjustments
+    if age > 50:
+        plan["guidelines"].append("Focus on joint-friendly movements and proper warm-up.")
+        plan["summary"] += " Age-appropriate modifications included."
+
+    # Weight-based guidance
+    if weight > 90:
+        plan["guidelines"].append("Consider low-impact exercises to protect joints.")
+
+    plan["guidelines"].append("Hydrate before and after sessions.")
+    if injuries and injuries.lower() != "none":
+        plan["guidelines"].append(f"CAUTION: Modify exercises to accommodate your {injuries}.")
+        plan["summary"] += f" Please be careful with your {injuries}."
+
+    if category == "stress":
+        plan["guidelines"].append("Focus on deep breathing during movement.")
+
+    return plan
+
+
+_SUBSTITUTION_GUIDELINE = "Exercises marked 'replaces'"
+
+
+def template_fields(plan: Dict) -> Dict:
+    """``plan`` without the exercise lists added after the templates were.
+
+    Drops each day's ``exercises`` and the guideline explaining
+    substitutions; everything else, key order included, is kept.
+    """
+    return {
+        **plan,
+        "schedule": [{k: v for k, v in day.items() if k != "exercises"} for day in plan["schedule"]],
+        "guidelines": [g for g in plan["guidelines"] if not g.startswith(_SUBSTITUTION_GUIDELINE)],
+    }
+
+
+class _CompileOnLookup(Mapping):
+    """Stand-in for the template table that compiles on every lookup."""
+
+    def __getitem__(self, key: Tuple[str, str, int]):
+        return exercise_tools._compile_template(*key)
+
+    def __iter__(self) -> Iterator:
+        return iter(exercise_tools._TEMPLATES)
+
+    def __len__(self) -> int:
+        return len(exercise_tools._TEMPLATES)
+
+
+@contextlib.contextmanager
+def templates_compiled_per_call():
+    """Make build_workout_plan rebuild its template on every call."""
+    precompiled = exercise_tools._TEMPLATES
+    exercise_tools._TEMPLATES = _CompileOnLookup()
+    try:
+        yield
+    finally:
+        exercise_tools._TEMPLATES = precompiled
+
+
+def run(size: int) -> Dict[str, Any]:
+    profiles = random_profiles(size)
+    with templates_compiled_per_call():
+        start = time.perf_counter()
+        [build_workout_plan(**profile) for profile in profiles]
+        per_call_compile = time.perf_counter() - start
+
+    start = time.perf_counter()
+    plans = [build_workout_plan(**profile) for profile in profiles]
+    precompiled = time.perf_counter() - start
+
+    return {
+        "users": size,
+        "mismatches": sum(
+            template_fields(plan) != legacy_build_workout_plan(**profile) for plan, profile in zip(plans, profiles)
+        ),
+        "compile_per_call_us": round(per_call_compile / size * 1e6, 2),
+        "precompiled_us": round(precompiled / size * 1e6, 2),
+        "speedup": round(per_call_compile / precompiled, 2),
+    }
+
+
+if __name__ == "__main__":
+    report = run(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
+    for key, value in report.items():
+        print(f"{key}: {value}")
@@ -0,0 +1,354 @@
+"""Compact binary memory store with a memory-mapped per-user offset index.
+
+Layout (next to the JSON path, e.g. ``data/user_memory.bin`` / ``.idx``):
+
+* ``.bin`` - a 12-byte header (``WMDB`` + 64-bit file id) followed by
+  length-prefixed records: ``<u32 length><u32 crc32><json payload>`` where
+  the payload is ``{"user_id": ..., "entries": [...]}``. Updates append a new
+  record for the user; the newest record wins.
+* ``.idx`` - a 24-byte header (``WMIX``, version, slot count, data file id,
+  covered data length) followed by fixed-width ``<u64 hash><u64 offset>
+  <u32 length>`` slots sorted by the 64-bit hash of the user id.
+
+Both files are memory-mapped. A lookup binary-searches the index slots and
+decodes only that user's record, so ``read_user`` never touches other users'
+bytes. Records appended after the index was built are tracked in a small
+in-memory overlay (rebuilt by scanning the tail on open) until the next
+``compact`` rewrites both files with only live records.
+"""
+
+from __future__ import annotations
+
+import atexit
+import contextlib
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from utils.file_lock import InterProcessLock, file_signature
+
+_DATA_MAGIC = b"WMDB"
+_INDEX_MAGIC = b"WMIX"
+_INDEX_VERSION = 1
+_DATA_HEADER = struct.Struct("<4sQ")
+_INDEX_HEADER = struct.Struct("<4sIQQQ")
+_RECORD_HEADER = struct.Struct("<II")
+_SLOT = struct.Struct("<QQI")
+
+
+def _user_hash(user_id: str) -> int:
+    return int.from_bytes(hashlib.blake2b(user_id.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _encode_record(user_id: str, entries: List[Dict]) -> bytes:
+    payload = json.dumps(
+        {"user_id": user_id, "entries": entries}, separators=(",", ":"), ensure_ascii=False
+    ).encode("utf-8")
+    return _RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def _map(path: Path) -> Optional[mmap.mmap]:
+    with open(path, "rb") as fh:
+        if os.fstat(fh.fileno()).st_size == 0:
+            return None
+        return mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class BinaryMemoryStore:
+    """Length-prefixed record file plus sorted, memory-mapped offset index."""
+
+    def __init__(
+        self,
+        storage_path: Path,
+        reindex_every: int = 10_000,
+        fsync: bool = False,
+        process_lock: Optional[InterProcessLock] = None,
+    ) -> None:
+        self.storage_path = storage_path
+        self.data_path = storage_path.with_suffix(".bin")
+        self.index_path = storage_path.with_suffix(".idx")
+        self.reindex_every = reindex_every
+        self.fsync = fsync
+        self._process_lock = process_lock
+
+        self._lock = threading.RLock()
+        self._data_map: Optional[mmap.mmap] = None
+        self._index_map: Optional[mmap.mmap] = None
+        self._slot_count = 0
+        self._overlay: Dict[str, Tuple[int, int]] = {}
+        self._end = 0
+        self._data_ino: Optional[int] = None
+        self._closed = False
+
+        with self._process_guard():
+            if not self.data_path.exists():
+                self._write_files({})
+            self._open()
+        atexit.register(self.close)
+
+    # ------------------------------------------------------------------
+    # Store interface
+    # ------------------------------------------------------------------
+    def refresh(self) -> None:
+        """Pick up records written by other processes (process lock held)."""
+        if self._process_lock is None:
+            return
+        with self._lock:
+            signature = file_signature(self.data_path)
+            if signature is None or signature[0] != self._data_ino:
+                self._open()
+            elif signature[2] != self._end:
+                self._scan_tail()
+
+    def signature(self) -> Tuple:
+        return file_signature(self.data_path), file_signature(self.index_path)
+
+    def read_user(self, user_id: str) -> List[Dict]:
+        self.refresh()
+        with self._lock:
+            location = self._overlay.get(user_id) or self._lookup(user_id)
+            if location is None:
+                return []
+            record = self._read_record(*location)
+        return list(record[1]) if record and record[0] == user_id else []
+
+    def read_all(self) -> Dict[str, List[Dict]]:
+        return dict(self.iter_users())
+
+    def iter_users(self) -> Iterator[Tuple[str, List[Dict]]]:
+        """Yield ``(user_id, entries)`` for every stored user."""
+        self.refresh()
+        with self._lock:
+            overlay = dict(self._overlay)
+            slots = [self._slot(i) for i in range(self._slot_count)]
+        for _, offset, length in slots:
+            with self._lock:
+                record = self._read_record(offset, length)
+            if record and record[0] not in overlay:
+                yield record
+        for offset, length in overlay.values():
+            with self._lock:
+                record = self._read_record(offset, length)
+            if record:
+                yield record
+
+    def write_user(self, user_id: str, entries: List[Dict]) -> None:
+        self.write_many([(user_id, entries)])
+
+    def write_many(self, items: Iterable[Tuple[str, List[Dict]]]) -> None:
+        records = [(user_id, _encode_record(user_id, entries)) for user_id, entries in items]
+        self.refresh()
+        with self._lock:
+            with open(self.data_path, "ab") as fh:
+                fh.write(b"".join(record for _, record in records))
+                fh.flush()
+                if self.fsync:
+                    os.fsync(fh.fileno())
+            for user_id, record in records:
+                self._overlay[user_id] = (self._end, len(record))
+                self._end += len(record)
+            due = len(self._overlay) >= self.reindex_every
+        if due:
+            self.compact()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        with self._lock:
+            for mapping in (self._data_map, self._index_map):
+                if mapping is not None:
+                    mapping.close()
+            self._data_map = self._index_map = None
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+    def compact(self) -> None:
+        """Rewrite both files with only the newest record per user."""
+        with self._process_guard(), self._lock:
+            self.refresh()
+            self._write_files(self.read_all())
+            self._open()
+
+    def bulk_load(self, data: Dict[str, List[Dict]]) -> None:
+        """Replace the store's contents with ``data`` (used by converters)."""
+        with self._process_guard(), self._lock:
+            self._write_files(data)
+            self._open()
+
+    def _write_files(self, data: Dict[str, List[Dict]]) -> None:
+        file_id = int.from_bytes(os.urandom(8), "little")
+        slots = []
+        tmp_data = self.data_path.with_name(f"{self.data_path.name}.{os.getpid()}.tmp")
+        with open(tmp_data, "wb") as fh:
+            fh.write(_DATA_HEADER.pack(_DATA_MAGIC, file_id))
+            offset = _DATA_HEADER.size
+            for user_id, entries in data.items():
+                record = _encode_record(user_id, entries)
+                fh.write(record)
+                slots.append((_user_hash(user_id), offset, len(record)))
+                offset += len(record)
+            fh.flush()
+            os.fsync(fh.fileno())
+        slots.sort()
+
+        tmp_index = self.index_path.with_name(f"{self.index_path.name}.{os.getpid()}.tmp")
+        with open(tmp_index, "wb") as fh:
+            fh.write(_INDEX_HEADER.pack(_INDEX_MAGIC, _INDEX_VERSION, len(slots), file_id, offset))
+            fh.write(b"".join(_SLOT.pack(*slot) for slot in slots))
+            fh.flush()
+            os.fsync(fh.fileno())
+        # The data file goes first: an index whose file id does not match
+        # the data file is ignored and rebuilt on open.
+        os.replace(tmp_data, self.data_path)
+        os.replace(tmp_index, self.index_path)
+
+    # ------------------------------------------------------------------
+    # Opening / scanning
+    # ------------------------------------------------------------------
+    def _open(self) -> None:
+        for mapping in (self._data_map, self._index_map):
+            if mapping is not None:
+                mapping.close()
+        self._data_map = _map(self.data_path)
+        self._data_ino = os.stat(self.data_path).st_ino
+        magic, file_id = _DATA_HEADER.unpack_from(self._data_map, 0)
+        if magic != _DATA_MAGIC:
+            raise ValueError(f"{self.data_path} is not a binary memory file")
+
+        self._index_map = None
+        self._slot_count = 0
+        self._overlay = {}
+        self._end = _DATA_HEADER.size
+        if self.index_path.exists():
+            index_map = _map(self.index_path)
+            if index_map is not None:
+                magic, version, count, index_file_id, covered = _INDEX_HEADER.unpack_from(index_map, 0)
+                if magic == _INDEX_MAGIC and version == _INDEX_VERSION and index_file_id == file_id:
+                    self._index_map = index_map
+                    self._slot_count = count
+                    self._end = covered
+                else:
+                    index_map.close()
+        # Without a matching index every record lands in the overlay.
+        self._scan_tail()
+
+    def _scan_tail(self) -> None:
+        """Add records past ``_end`` to the overlay; drop a torn tail."""
+        size = os.path.getsize(self.data_path)
+        if self._data_map is None or len(self._data_map) < size:
+            self._remap()
+        offset = self._end
+        while offset + _RECORD_HEADER.size <= size:
+            length, _ = _RECORD_HEADER.unpack_from(self._data_map, offset)
+            total = _RECORD_HEADER.size + length
+            record = self._read_record(offset, total) if offset + total <= size else None
+            if record is None:
+                break
+            self._overlay[record[0]] = (offset, total)
+            offset += total
+        if offset < size:
+            with open(self.data_path, "r+b") as fh:
+                fh.truncate(offset)
+            self._remap()
+        self._end = offset
+
+    def _remap(self) -> None:
+        if self._data_map is not None:
+            self._data_map.close()
+        self._data_map = _map(self.data_path)
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+    def _slot(self, i: int) -> Tuple[int, int, int]:
+        return _SLOT.unpack_from(self._index_map, _INDEX_HEADER.size + i * _SLOT.size)
+
+    def _lookup(self, user_id: str) -> Optional[Tuple[int, int]]:
+        if not self._slot_count:
+            return None
+        target = _user_hash(user_id)
+        lo, hi = 0, self._slot_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._slot(mid)[0] < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        # Walk the (almost always single) run of slots sharing this hash.
+        while lo < self._slot_count:
+            slot_hash, offset, length = self._slot(lo)
+            if slot_hash != target:
+                break
+            record = self._read_record(offset, length)
+            if record and record[0] == user_id:
+                return offset, length
+            lo += 1
+        return None
+
+    def _read_record(self, offset: int, length: int) -> Optional[Tuple[str, List[Dict]]]:
+        if self._data_map is None or offset + length > len(self._data_map):
+            self._remap()
+        if self._data_map is None or offset + length > len(self._data_map):
+            return None
+        payload_length, checksum = _RECORD_HEADER.unpack_from(self._data_map, offset)
+        start = offset + _RECORD_HEADER.size
+        payload = self._data_map[start : start + payload_length]
+        if payload_length != length - _RECORD_HEADER.size or zlib.crc32(payload) != checksum:
+            return None
+        record = json.loads(payload)
+        return record["user_id"], record["entries"]
+
+    def _process_guard(self):
+        return self._process_lock or contextlib.nullcontext()
+
+
+def convert_json_to_binary(json_path: str, binary_path: Optional[str] = None) -> int:
+    """Convert a legacy ``user_memory.json`` into the binary layout.
+
+    ``binary_path`` names the base path of the ``.bin``/``.idx`` pair and
+    defaults to ``json_path``. Returns the number of users written.
+    """
+    from .memory_stores import JsonMemoryStore
+
+    data = JsonMemoryStore(Path(json_path)).read_all()
+    store = BinaryMemoryStore(Path(binary_path or json_path))
+    try:
+        store.bulk_load(data)
+    finally:
+        store.close()
+    return len(data)
+
+
+def convert_binary_to_json(binary_path: str, json_path: Optional[str] = None) -> int:
+    """Write the binary store at ``binary_path`` back out as pretty JSON."""
+    store = BinaryMemoryStore(Path(binary_path))
+    try:
+        data = store.read_all()
+    finally:
+        store.close()
+    target = Path(json_path or Path(binary_path).with_suffix(".json"))
+    target.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    return len(data)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Convert user memories between JSON and binary.")
+    parser.add_argument("direction", choices=["to-binary", "to-json"])
+    parser.add_argument("source")
+    parser.add_argument("target", nargs="?")
+    args = parser.parse_args()
+    if args.direction == "to-binary":
+        count = convert_json_to_binary(args.source, args.target)
+    else:
+        count = convert_binary_to_json(args.source, args.target)
+    print(f"Converted {count} users")
@@ -0,0 +1,103 @@
+"""
+Cold and warm read latency: JSON memory file vs the binary store.
+For each tenant size a JSON file with three entries per user is generated
+and converted with convert_json_to_binary. Cold reads run in a fresh
+interpreter (open the store and read one user, module import included);
+warm reads repeat single-user lookups on an already open store.
+
+Run from the wellness/ directory:
+    python -m memory.binary_store_bench               # 10k, 100k and 1M users
+    python -m memory.binary_store_bench 10000 100000
+"""
+
+import argparse
+import json
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Sequence
+
+from .binary_store import BinaryMemoryStore, convert_json_to_binary
+from .memory_stores import JsonMemoryStore
+
+SIZES = (10_000, 100_000, 1_000_000)
+ENTRIES_PER_USER = 3
+
+_WELLNESS_DIR = Path(__file__).resolve().parent.parent
+_COLD_READ = """
+import sys, time
+from pathlib import Path
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+if {kind!r} == "json":
+    from memory.memory_stores import JsonMemoryStore as Store
+else:
+    from memory.binary_store import BinaryMemoryStore as Store
+Store(Path({path!r})).read_user({user!r})
+print(time.perf_counter() - start)
+"""
+
+
+def _write_json(path: Path, users: int) -> None:
+    entry = {
+        "summary": "Prefers evening workouts and vegetarian meals",
+        "timestamp": "2025-01-01T00:00:00",
+        "metadata": {"domain": "exercise"},
+    }
+    path.write_text(json.dumps({f"user_{i}": [entry] * ENTRIES_PER_USER for i in range(users)}, indent=2))
+
+
+def _cold_read(kind: str, path: Path, user: str) -> float:
+    code = _COLD_READ.format(root=str(_WELLNESS_DIR), kind=kind, path=str(path), user=user)
+    return float(subprocess.check_output([sys.executable, "-c", code]))
+
+
+def _warm_read(store, users: Sequence[str]) -> float:
+    start = time.perf_counter()
+    for user in users:
+        store.read_user(user)
+    return (time.perf_counter() - start) / len(users)
+
+
+def run(users: int, directory: Path) -> Dict[str, Any]:
+    json_path = directory / f"memory_{users}.json"
+    _write_json(json_path, users)
+    start = time.perf_counter()
+    convert_json_to_binary(str(json_path))
+    convert_seconds = time.perf_counter() - start
+
+    sample = [f"user_{random.randrange(users)}" for _ in range(1000)]
+    json_store = JsonMemoryStore(json_path)
+    binary_store = BinaryMemoryStore(json_path)
+    try:
+        assert binary_store.read_user(sample[0]) == json_store.read_user(sample[0])
+        # Every JSON read parses the whole file, so a few samples suffice.
+        json_warm = _warm_read(json_store, sample[:5])
+        binary_warm = _warm_read(binary_store, sample)
+    finally:
+        binary_store.close()
+    return {
+        "users": users,
+        "convert_s": round(convert_seconds, 2),
+        "json_cold_ms": round(_cold_read("json", json_path, sample[1]) * 1e3, 1),
+        "binary_cold_ms": round(_cold_read("binary", json_path, sample[1]) * 1e3, 1),
+        "json_warm_ms": round(json_warm * 1e3, 2),
+        "binary_warm_us": round(binary_warm * 1e6, 1),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("sizes", nargs="*", type=int, default=SIZES)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            row = run(size, Path(tmp))
+            print(
+                f"{row['users']:>9} users: cold JSON {row['json_cold_ms']} ms / binary {row['binary_cold_ms']} ms; "
+                f"warm JSON {row['json_warm_ms']} ms / binary {row['binary_warm_us']} us "
+                f"(convert {row['convert_s']} s)"
+            )
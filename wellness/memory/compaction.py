@@ -0,0 +1,210 @@
+"""Tiered, size-bounded compaction of a user's memory entries.
+
+Entries are split into three recency tiers:
+
+* recent    - the newest ``max_recent`` entries, kept verbatim;
+* weekly    - older entries from the last ``weekly_days`` days, rolled up
+              into a single "Recent weeks:" entry;
+* long-term - everything older, rolled up into a single
+              "Historical preferences:" entry.
+
+Roll-ups are rebuilt from clauses rather than by concatenating previous
+roll-ups, duplicate clauses are dropped, and the whole user record is held
+under a hard ``max_bytes`` cap, so what reaches the CWO prompt stays flat no
+matter how many insights a user accumulates.
+"""
+
+from __future__ import annotations
+
+import re
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Protocol, Sequence, Tuple
+
+WEEKLY_PREFIX = "Recent weeks: "
+LONG_TERM_PREFIX = "Historical preferences: "
+
+_CLAUSE_SPLIT_RE = re.compile(r"\s*(?:\||;|(?<=[.!?])\s)\s*")
+_NORMALIZE_RE = re.compile(r"[^a-z0-9]+")
+
+
+class Summarizer(Protocol):
+    """Turns clauses (newest first) into a roll-up of at most ``max_bytes``."""
+
+    def summarize(self, clauses: Sequence[str], max_bytes: int) -> str:
+        ...
+
+
+class ExtractiveSummarizer:
+    """Deterministic summarizer that keeps whole clauses, newest first.
+
+    Clauses whose normalized text was already kept are skipped, and clauses
+    are added until the next one would exceed the byte budget.
+    """
+
+    separator = "; "
+
+    def summarize(self, clauses: Sequence[str], max_bytes: int) -> str:
+        kept: List[str] = []
+        seen = set()
+        used = 0
+        for clause in clauses:
+            key = _normalize(clause)
+            if not key or key in seen:
+                continue
+            cost = _size(clause) + (_size(self.separator) if kept else 0)
+            if used + cost > max_bytes:
+                break
+            seen.add(key)
+            kept.append(clause)
+            used += cost
+        return self.separator.join(kept)
+
+
+def split_clauses(summary: str) -> List[str]:
+    """Split a summary (or an older roll-up) into individual clauses."""
+    for prefix in (WEEKLY_PREFIX, LONG_TERM_PREFIX):
+        # Legacy roll-ups nested the prefix once per compaction pass.
+        while summary.startswith(prefix):
+            summary = summary[len(prefix):]
+    clauses = (clause.strip(" .") for clause in _CLAUSE_SPLIT_RE.split(summary))
+    return [clause for clause in clauses if clause]
+
+
+def _normalize(clause: str) -> str:
+    return _NORMALIZE_RE.sub(" ", clause.lower()).strip()
+
+
+def _size(text: str) -> int:
+    return len(text.encode("utf-8"))
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(value) if value else None
+    except ValueError:
+        return None
+
+
+class TieredCompactor:
+    """Compacts a user's entries into recent / weekly / long-term tiers."""
+
+    def __init__(
+        self,
+        max_recent: int = 5,
+        max_bytes: int = 2048,
+        weekly_days: int = 7,
+        weekly_share: float = 0.5,
+        summarizer: Optional[Summarizer] = None,
+        clock: Callable[[], datetime] = datetime.now,
+    ) -> None:
+        """
+        Args:
+            max_recent: Entries kept verbatim.
+            max_bytes: Hard cap on the UTF-8 size of all summaries combined.
+            weekly_days: Age in days after which entries move to long-term.
+            weekly_share: Fraction of the budget left after recent entries
+                that the weekly roll-up may use.
+            summarizer: Roll-up strategy; defaults to ExtractiveSummarizer.
+            clock: Source of "now", injectable for deterministic replays.
+        """
+        self.max_recent = max_recent
+        self.max_bytes = max_bytes
+        self.weekly_window = timedelta(days=weekly_days)
+        self.weekly_share = weekly_share
+        self.summarizer = summarizer or ExtractiveSummarizer()
+        self.clock = clock
+
+    def compact(self, entries: List[Dict]) -> List[Dict]:
+        rollups = [e for e in entries if (e.get("metadata") or {}).get("compacted") == "true"]
+        raw = [e for e in entries if (e.get("metadata") or {}).get("compacted") != "true"]
+        if len(raw) <= self.max_recent and _total_size(entries) <= self.max_bytes and len(rollups) <= 2:
+            return entries
+
+        recent = raw[-self.max_recent:] if self.max_recent else []
+        demoted = raw[: len(raw) - len(recent)]
+        # Recent entries alone must fit the cap; spill the oldest otherwise.
+        while len(recent) > 1 and _total_size(recent) > self.max_bytes:
+            demoted.append(recent.pop(0))
+        if recent and _total_size(recent) > self.max_bytes:
+            recent = [self._truncate(recent[0], self.max_bytes)]
+
+        cutoff = self.clock() - self.weekly_window
+        weekly: List[Dict] = []
+        long_term: List[Dict] = []
+        for entry in [*rollups, *demoted]:
+            ts = _parse_timestamp(entry.get("timestamp"))
+            tier = (entry.get("metadata") or {}).get("tier")
+            if ts is not None and ts >= cutoff and tier != "long_term":
+                weekly.append(entry)
+            else:
+                long_term.append(entry)
+
+        budget = self.max_bytes - _total_size(recent)
+        weekly_budget = int(budget * self.weekly_share) - _size(WEEKLY_PREFIX)
+        weekly_clauses, spilled = _fit(_clauses(weekly), weekly_budget)
+        weekly_entry = self._rollup(weekly_clauses, weekly, WEEKLY_PREFIX, "weekly", weekly_budget)
+        budget -= _total_size([weekly_entry]) if weekly_entry else 0
+        # Clauses that no longer fit the weekly roll-up age into long-term
+        # instead of being dropped; the long-term roll-up drops the oldest.
+        long_term_entry = self._rollup(
+            spilled + _clauses(long_term),
+            long_term + weekly,
+            LONG_TERM_PREFIX,
+            "long_term",
+            budget - _size(LONG_TERM_PREFIX),
+        )
+
+        return [e for e in (long_term_entry, weekly_entry) if e] + recent
+
+    def _rollup(
+        self,
+        clauses: List[str],
+        sources: List[Dict],
+        prefix: str,
+        tier: str,
+        budget: int,
+    ) -> Optional[Dict]:
+        if not clauses or budget <= 0:
+            return None
+        text = self.summarizer.summarize(clauses, budget)
+        if not text:
+            return None
+        # A roll-up is as old as its oldest source, so a weekly roll-up
+        # ages into long-term once its oldest clause leaves the window
+        # instead of being refreshed to "now" on every pass.
+        stamps = [e["timestamp"] for e in sources if e.get("timestamp")]
+        return {
+            "summary": f"{prefix}{text}",
+            "timestamp": min(stamps) if stamps else self.clock().isoformat(),
+            "metadata": {"compacted": "true", "tier": tier},
+        }
+
+    @staticmethod
+    def _truncate(entry: Dict, max_bytes: int) -> Dict:
+        summary = entry.get("summary", "").encode("utf-8")[:max_bytes].decode("utf-8", "ignore")
+        return {**entry, "summary": summary}
+
+
+def _total_size(entries: Sequence[Dict]) -> int:
+    return sum(_size(e.get("summary", "")) for e in entries)
+
+
+def _clauses(entries: Sequence[Dict]) -> List[str]:
+    """Unique clauses of ``entries``, newest entry first."""
+    ordered = sorted(entries, key=lambda e: e.get("timestamp") or "", reverse=True)
+    unique: Dict[str, str] = {}
+    for entry in ordered:
+        for clause in split_clauses(entry.get("summary", "")):
+            unique.setdefault(_normalize(clause), clause)
+    unique.pop("", None)
+    return list(unique.values())
+
+
+def _fit(clauses: List[str], budget: int) -> Tuple[List[str], List[str]]:
+    """Split ``clauses`` into the newest ones fitting ``budget`` and the rest."""
+    used = 0
+    for i, clause in enumerate(clauses):
+        used += _size(clause) + (_size(ExtractiveSummarizer.separator) if i else 0)
+        if used > budget:
+            return clauses[:i], clauses[i:]
+    return clauses, []
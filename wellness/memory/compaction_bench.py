@@ -0,0 +1,63 @@
+"""
+Prompt-size benchmark for the tiered memory compaction.
+Feeds one user an ever-growing stream of insights, compacting after each
+one as UserMemoryManager.add_memory does, and reports the size of what
+would reach the CWO prompt. With TieredCompactor the size levels off at the
+byte cap instead of growing with the number of insights.
+
+Run from the wellness/ directory:
+    python -m memory.compaction_bench
+"""
+
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Sequence
+
+from .compaction import TieredCompactor
+
+_GOALS = ["lose weight", "build muscle", "sleep better", "reduce stress", "run a 10k", "eat more protein"]
+_DETAILS = ["prefers mornings", "has a sore knee", "works night shifts", "is vegetarian", "trains at home"]
+
+CHECKPOINTS = (10, 100, 1000, 5000)
+
+
+def _insight(i: int) -> str:
+    return f"Week {i // 7}: wants to {_GOALS[i % len(_GOALS)]}; {_DETAILS[i % len(_DETAILS)]}. Session note {i}."
+
+
+def run(checkpoints: Sequence[int] = CHECKPOINTS, step_hours: float = 6.0) -> List[Dict[str, Any]]:
+    """Compact after every insight; report prompt size at each checkpoint.
+
+    The compactor's clock advances ``step_hours`` per insight, so entries
+    age through the recent, weekly and long-term tiers.
+    """
+    start = datetime(2025, 1, 1)
+    clock = {"now": start}
+    compactor = TieredCompactor(clock=lambda: clock["now"])
+    entries: List[Dict] = []
+    results = []
+    elapsed = 0.0
+    for i in range(1, max(checkpoints) + 1):
+        clock["now"] = start + timedelta(hours=step_hours * i)
+        entries.append({"summary": _insight(i), "timestamp": clock["now"].isoformat(), "metadata": None})
+        t0 = time.perf_counter()
+        entries = compactor.compact(entries)
+        elapsed += time.perf_counter() - t0
+        if i in checkpoints:
+            results.append(
+                {
+                    "insights": i,
+                    "entries": len(entries),
+                    "prompt_bytes": sum(len(e["summary"].encode("utf-8")) for e in entries),
+                    "avg_compact_us": round(elapsed / i * 1e6, 1),
+                }
+            )
+    return results
+
+
+if __name__ == "__main__":
+    for row in run():
+        print(
+            f"{row['insights']:>6} insights: {row['entries']} entries, "
+            f"{row['prompt_bytes']} B, {row['avg_compact_us']} us/compaction"
+        )
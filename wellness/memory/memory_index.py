@@ -0,0 +1,169 @@
+"""Local BM25 index over stored memory summaries and metadata.
+
+The index is kept per user (retrieval never crosses users) while document
+frequencies are shared, so IDF stays meaningful even though each user only
+holds a handful of entries. ``sync_user`` diffs the user's current entries
+against what is indexed, which makes updates after ``add_memory`` touch only
+the entries that were added or compacted away.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Tuple
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+_STOPWORDS = frozenset(
+    """
+    a an and are as at be but by for from has have i in is it its me my of on
+    or so that the their them they this to user users was were with wants want
+    """.split()
+)
+
+# Query words that should also match the domain tags the CWO stores in
+# memory metadata (e.g. {"domain": "nutrition"}).
+_QUERY_EXPANSIONS = {
+    "meal": ("nutrition",),
+    "diet": ("nutrition",),
+    "food": ("nutrition",),
+    "calorie": ("nutrition",),
+    "eat": ("nutrition",),
+    "workout": ("exercise",),
+    "train": ("exercise",),
+    "gym": ("exercise",),
+    "fitness": ("exercise",),
+    "stress": ("mindfulness",),
+    "anxiety": ("mindfulness",),
+    "sleep": ("mindfulness",),
+    "meditation": ("mindfulness",),
+}
+
+DocKey = Tuple[str, str]
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-case word tokens with stopwords removed and suffixes folded."""
+    tokens = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        if token in _STOPWORDS:
+            continue
+        if len(token) > 5 and token.endswith("ing"):
+            token = token[:-3]
+        elif len(token) > 5 and token.endswith("ed"):
+            token = token[:-2]
+        elif len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def query_terms(query: str) -> set:
+    """Tokenize a query and add the metadata domains its words imply."""
+    terms = set(tokenize(query))
+    for term in list(terms):
+        terms.update(_QUERY_EXPANSIONS.get(term, ()))
+    return terms
+
+
+def _entry_text(entry: Dict) -> str:
+    metadata = entry.get("metadata") or {}
+    return " ".join([entry.get("summary", ""), *map(str, metadata.values())])
+
+
+def _doc_key(entry: Dict) -> DocKey:
+    return entry.get("timestamp", ""), entry.get("summary", "")
+
+
+@dataclass
+class _Doc:
+    entry: Dict
+    term_freqs: Counter
+    length: int
+
+
+class MemoryIndex:
+    """Incrementally maintained BM25 index, bounded to ``max_users`` users."""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75, max_users: int = 4096) -> None:
+        self.k1 = k1
+        self.b = b
+        self.max_users = max_users
+        self._users: "OrderedDict[str, Dict[DocKey, _Doc]]" = OrderedDict()
+        self._doc_freq: Counter = Counter()
+        self._num_docs = 0
+        self._total_length = 0
+        self._lock = threading.Lock()
+
+    def sync_user(self, user_id: str, entries: Iterable[Dict]) -> None:
+        """Make the indexed documents for ``user_id`` match ``entries``."""
+        wanted = {_doc_key(entry): entry for entry in entries}
+        with self._lock:
+            docs = self._users.setdefault(user_id, {})
+            self._users.move_to_end(user_id)
+            for key in [key for key in docs if key not in wanted]:
+                self._remove(docs.pop(key))
+            for key, entry in wanted.items():
+                if key not in docs:
+                    docs[key] = self._add(entry)
+            while len(self._users) > self.max_users:
+                _, evicted = self._users.popitem(last=False)
+                for doc in evicted.values():
+                    self._remove(doc)
+
+    def search(self, user_id: str, query: str, k: int) -> List[Dict]:
+        """Return up to ``k`` of the user's entries, best BM25 match first.
+
+        Entries that share a score (including when nothing matches) are
+        ordered newest first, so an unhelpful query degrades to recency.
+        """
+        terms = query_terms(query)
+        with self._lock:
+            docs = list(self._users.get(user_id, {}).values())
+            if not docs or k <= 0:
+                return []
+            avg_length = self._total_length / self._num_docs if self._num_docs else 0.0
+            idf = {term: self._idf(term) for term in terms}
+            scored = [
+                (self._score(doc, idf, avg_length), doc.entry.get("timestamp", ""), doc.entry)
+                for doc in docs
+            ]
+        scored.sort(key=lambda item: (item[0], item[1]), reverse=True)
+        return [entry for _, _, entry in scored[:k]]
+
+    # ------------------------------------------------------------------
+    # Internal helpers (callers hold self._lock)
+    # ------------------------------------------------------------------
+    def _add(self, entry: Dict) -> _Doc:
+        tokens = tokenize(_entry_text(entry))
+        doc = _Doc(entry=entry, term_freqs=Counter(tokens), length=len(tokens))
+        self._doc_freq.update(doc.term_freqs.keys())
+        self._num_docs += 1
+        self._total_length += doc.length
+        return doc
+
+    def _remove(self, doc: _Doc) -> None:
+        self._doc_freq.subtract(doc.term_freqs.keys())
+        for term in doc.term_freqs:
+            if self._doc_freq[term] <= 0:
+                del self._doc_freq[term]
+        self._num_docs -= 1
+        self._total_length -= doc.length
+
+    def _idf(self, term: str) -> float:
+        df = self._doc_freq.get(term, 0)
+        return math.log(1 + (self._num_docs - df + 0.5) / (df + 0.5))
+
+    def _score(self, doc: _Doc, idf: Dict[str, float], avg_length: float) -> float:
+        score = 0.0
+        norm = self.k1 * (1 - self.b + self.b * doc.length / avg_length) if avg_length else self.k1
+        for term, weight in idf.items():
+            tf = doc.term_freqs.get(term)
+            if tf:
+                score += weight * tf * (self.k1 + 1) / (tf + norm)
+        return score
+
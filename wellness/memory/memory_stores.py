@@ -0,0 +1,337 @@
+"""Storage backends used by :class:`UserMemoryManager`.
+
+All stores expose the same small interface (``read_user``, ``write_user``,
+``write_many``, ``read_all``, ``iter_users``, ``signature`` and ``close``)
+and persist each user's entries as a list of plain dictionaries, so the
+manager's compaction logic stays backend-agnostic.
+
+``JsonMemoryStore`` keeps the original single-document layout. The
+``JournalMemoryStore`` appends one checksummed record per write and folds the
+journal into that same JSON document in the background, which keeps the
+checkpoint readable by older builds and makes migration a no-op.
+
+When several worker processes share the files, the manager serialises
+operations with an :class:`~utils.file_lock.InterProcessLock` and calls
+``refresh`` before reading so each process picks up the others' writes.
+"""
+
+from __future__ import annotations
+
+import atexit
+import contextlib
+import json
+import os
+import shutil
+import threading
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from utils.file_lock import InterProcessLock, file_signature
+
+
+class JsonMemoryStore:
+    """Single pretty-printed JSON document holding every user's entries."""
+
+    def __init__(self, storage_path: Path, process_lock: Optional[InterProcessLock] = None) -> None:
+        self.storage_path = storage_path
+        if not self.storage_path.exists():
+            with process_lock or contextlib.nullcontext():
+                if not self.storage_path.exists():
+                    self._write({})
+
+    def refresh(self) -> None:
+        # Every read parses the file, so there is no state to go stale.
+        pass
+
+    def signature(self) -> Tuple:
+        """Changes whenever the on-disk state changes."""
+        return (file_signature(self.storage_path),)
+
+    def read_user(self, user_id: str) -> List[Dict]:
+        return list(self._read().get(user_id, []))
+
+    def read_all(self) -> Dict[str, List[Dict]]:
+        return self._read()
+
+    def iter_users(self) -> Iterator[Tuple[str, List[Dict]]]:
+        # A single JSON document has to be parsed whole before iterating.
+        return iter(self._read().items())
+
+    def write_user(self, user_id: str, entries: List[Dict]) -> None:
+        self.write_many([(user_id, entries)])
+
+    def write_many(self, items: Iterable[Tuple[str, List[Dict]]]) -> None:
+        data = self._read()
+        data.update(items)
+        self._write(data)
+
+    def close(self) -> None:
+        pass
+
+    def _read(self) -> Dict[str, List[Dict]]:
+        if not self.storage_path.exists():
+            return {}
+        try:
+            return json.loads(self.storage_path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            return {}
+
+    def _write(self, data: Dict[str, List[Dict]]) -> None:
+        # Write-then-rename so concurrent readers never see a partial file.
+        tmp_path = self.storage_path.with_name(f"{self.storage_path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        os.replace(tmp_path, self.storage_path)
+
+
+def _encode_record(user_id: str, entries: List[Dict]) -> bytes:
+    payload = json.dumps(
+        {"user_id": user_id, "entries": entries}, separators=(",", ":"), ensure_ascii=False
+    ).encode("utf-8")
+    return b"%08x %s\n" % (zlib.crc32(payload), payload)
+
+
+def _decode_record(line: bytes) -> Optional[Tuple[str, List[Dict]]]:
+    """Return ``(user_id, entries)`` or ``None`` for a torn/corrupt line."""
+    if not line.endswith(b"\n") or len(line) < 10:
+        return None
+    checksum, payload = line[:8], line[9:-1]
+    try:
+        if int(checksum, 16) != zlib.crc32(payload):
+            return None
+        record = json.loads(payload)
+        return record["user_id"], record["entries"]
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+class JournalMemoryStore:
+    """Append-only journal with periodic background checkpoints.
+
+    Each write appends a single ``<crc32> <json>`` line holding the user's
+    full (already compacted) entry list. Records are "put" operations, so
+    replaying a record twice is harmless; a torn final line left by a crash
+    fails its checksum and is truncated on the next start.
+
+    Checkpointing rotates the live journal to ``*.journal.1``, writes a
+    snapshot to the JSON checkpoint via an atomic rename and only then drops
+    the rotated journal, so a crash at any point leaves enough on disk to
+    rebuild the latest state.
+
+    With a ``process_lock`` the journal doubles as the change feed between
+    workers: ``refresh`` replays whatever other processes appended since the
+    last read, and reloads from the checkpoint when another process rotated
+    the journal. Checkpoints then run entirely under the process lock.
+    """
+
+    def __init__(
+        self,
+        storage_path: Path,
+        checkpoint_every: int = 200,
+        fsync: bool = True,
+        process_lock: Optional[InterProcessLock] = None,
+    ) -> None:
+        self.storage_path = storage_path
+        self.journal_path = storage_path.with_suffix(".journal")
+        self.rotated_path = storage_path.with_suffix(".journal.1")
+        self.checkpoint_every = checkpoint_every
+        self.fsync = fsync
+        self._process_lock = process_lock
+
+        self._lock = threading.Lock()
+        self._checkpoint_lock = threading.Lock()
+        self._data: Dict[str, List[Dict]] = {}
+        self._offset = 0
+        self._journal_ino: Optional[int] = None
+        self._pending = 0
+        self._closed = False
+
+        with self._process_guard():
+            self._recover()
+            self._open_journal()
+
+        self._wake = threading.Event()
+        self._worker = threading.Thread(
+            target=self._checkpoint_loop, name="memory-journal-checkpoint", daemon=True
+        )
+        self._worker.start()
+        atexit.register(self.close)
+
+    # ------------------------------------------------------------------
+    # Store interface
+    # ------------------------------------------------------------------
+    def refresh(self) -> None:
+        """Apply records written by other processes (process lock held)."""
+        if self._process_lock is None:
+            return
+        with self._lock:
+            try:
+                st = os.stat(self.journal_path)
+            except FileNotFoundError:
+                st = None
+            if st is None or st.st_ino != self._journal_ino:
+                # Another process checkpointed and rotated the journal.
+                self._journal.close()
+                self._data = {}
+                self._recover()
+                self._open_journal()
+            elif st.st_size != self._offset:
+                self._catch_up()
+
+    def signature(self) -> Tuple:
+        """Changes whenever the on-disk state changes."""
+        return file_signature(self.storage_path), file_signature(self.journal_path)
+
+    def read_user(self, user_id: str) -> List[Dict]:
+        self.refresh()
+        with self._lock:
+            return list(self._data.get(user_id, []))
+
+    def read_all(self) -> Dict[str, List[Dict]]:
+        self.refresh()
+        with self._lock:
+            return dict(self._data)
+
+    def iter_users(self) -> Iterator[Tuple[str, List[Dict]]]:
+        """Yield users one at a time instead of copying the whole state.
+
+        The replayed state itself stays resident (that is how this store
+        serves reads); iterating only adds the list of user ids.
+        """
+        self.refresh()
+        with self._lock:
+            user_ids = list(self._data)
+        for user_id in user_ids:
+            with self._lock:
+                entries = self._data.get(user_id)
+            if entries is not None:
+                yield user_id, list(entries)
+
+    def write_user(self, user_id: str, entries: List[Dict]) -> None:
+        self.write_many([(user_id, entries)])
+
+    def write_many(self, items: Iterable[Tuple[str, List[Dict]]]) -> None:
+        """Append one record per user with a single flush/fsync."""
+        items = list(items)
+        records = b"".join(_encode_record(user_id, entries) for user_id, entries in items)
+        self.refresh()
+        with self._lock:
+            self._journal.write(records)
+            self._journal.flush()
+            if self.fsync:
+                os.fsync(self._journal.fileno())
+            self._offset += len(records)
+            for user_id, entries in items:
+                self._data[user_id] = list(entries)
+            self._pending += len(items)
+            due = self._pending >= self.checkpoint_every
+        if due:
+            self._wake.set()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._worker.join()
+        self.checkpoint()
+        with self._lock:
+            self._journal.close()
+
+    # ------------------------------------------------------------------
+    # Checkpointing
+    # ------------------------------------------------------------------
+    def checkpoint(self) -> None:
+        """Fold the journal into the JSON checkpoint."""
+        with self._checkpoint_lock, self._process_guard():
+            self.refresh()
+            with self._lock:
+                if self._pending == 0 and not self.rotated_path.exists():
+                    return
+                self._rotate_journal()
+                snapshot = dict(self._data)
+                self._pending = 0
+            self._write_checkpoint(snapshot)
+            self.rotated_path.unlink(missing_ok=True)
+
+    def _process_guard(self):
+        return self._process_lock or contextlib.nullcontext()
+
+    def _checkpoint_loop(self) -> None:
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            if self._closed:
+                return
+            try:
+                self.checkpoint()
+            except OSError as exc:
+                print(f"Warning: Could not checkpoint user memories: {exc}")
+
+    def _rotate_journal(self) -> None:
+        """Move the live journal aside and start a fresh one (lock held)."""
+        self._journal.close()
+        if self.rotated_path.exists():
+            # A previous checkpoint failed part-way; keep both generations.
+            with open(self.rotated_path, "ab") as dst, open(self.journal_path, "rb") as src:
+                shutil.copyfileobj(src, dst)
+            self.journal_path.unlink()
+        elif self.journal_path.exists():
+            os.replace(self.journal_path, self.rotated_path)
+        self._open_journal()
+
+    def _open_journal(self) -> None:
+        self._journal = open(self.journal_path, "ab")
+        st = os.fstat(self._journal.fileno())
+        self._journal_ino = st.st_ino
+        self._offset = st.st_size
+
+    def _write_checkpoint(self, snapshot: Dict[str, List[Dict]]) -> None:
+        tmp_path = self.storage_path.with_name(f"{self.storage_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump(snapshot, fh, indent=2)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp_path, self.storage_path)
+
+    # ------------------------------------------------------------------
+    # Startup replay
+    # ------------------------------------------------------------------
+    def _recover(self) -> None:
+        self._data = JsonMemoryStore(self.storage_path).read_all()
+        self._offset = 0
+        if self.rotated_path.exists():
+            self._replay(self.rotated_path, 0)
+        if self.journal_path.exists():
+            self._catch_up()
+
+        if self.rotated_path.exists():
+            # Crashed mid-checkpoint: fold everything now so the rotated
+            # generation can be dropped before new appends start.
+            self._write_checkpoint(dict(self._data))
+            self.journal_path.unlink(missing_ok=True)
+            self.rotated_path.unlink()
+
+    def _catch_up(self) -> None:
+        """Replay the live journal from ``_offset`` and drop a torn tail."""
+        self._offset = self._replay(self.journal_path, self._offset)
+        if self._offset < self.journal_path.stat().st_size:
+            # Only a crashed writer leaves a torn record behind (appends
+            # happen under the lock); cut it off before anyone appends.
+            with open(self.journal_path, "r+b") as fh:
+                fh.truncate(self._offset)
+
+    def _replay(self, path: Path, offset: int) -> int:
+        """Apply every intact record in ``path`` after ``offset``; return the end offset."""
+        consumed = offset
+        with open(path, "rb") as fh:
+            fh.seek(offset)
+            for line in fh:
+                record = _decode_record(line)
+                if record is None:
+                    break
+                user_id, entries = record
+                self._data[user_id] = entries
+                consumed += len(line)
+                self._pending += 1
+        return consumed
@@ -0,0 +1,242 @@
+"""Sliding-window compaction of session event history.
+
+``InMemorySessionService`` keeps every event of a conversation. Each turn
+copies the whole list in ``get_session`` and resends it to the model, so
+long coaching sessions get slower with every message.
+``CompactingSessionService`` bounds that history:
+
+* the last ``keep_turns`` turns are kept verbatim;
+* older turns are folded into one rolling summary event at the head of
+  the session. The summary is rebuilt from the previous summary plus the
+  folded turns with the same extractive summarizer as the memory tiers
+  (see ``compaction``), so it stays under ``max_summary_bytes``. It is
+  authored by ``SUMMARY_AUTHOR``, not the user, so agents see it as quoted
+  context rather than as something the user said;
+* compaction is triggered once a session holds more than ``max_events``
+  events or more than ``max_tokens`` estimated tokens;
+* it runs as a background task after the turn's final response, with the
+  summarization itself in a worker thread, so no turn waits for it;
+* the cut is only ever made at the start of a turn. An older event whose
+  function call is still waiting for its response (e.g. a long-running
+  tool) is kept verbatim after the summary, so pending calls are never
+  dropped.
+
+Set ``WELLNESS_SESSION_COMPACTION=0`` to use the plain in-memory service.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from google.adk.events import Event
+from google.adk.sessions.in_memory_session_service import InMemorySessionService
+from google.genai import types
+
+from utils.token_budget import content_tokens
+
+from .compaction import ExtractiveSummarizer, Summarizer, split_clauses
+
+SUMMARY_PREFIX = "Summary of the earlier conversation (newest first): "
+SUMMARY_AUTHOR = "session_summary"
+
+_CLAUSE_CHARS = 240
+
+_SessionKey = Tuple[str, str, str]
+
+
+def session_compaction_enabled() -> bool:
+    """Whether WELLNESS_SESSION_COMPACTION bounds session history."""
+    return os.getenv("WELLNESS_SESSION_COMPACTION", "1").lower() not in {"0", "false", "no"}
+
+
+def _event_text(event: Event) -> str:
+    parts = event.content.parts if event.content and event.content.parts else ()
+    return " ".join(part.text.strip() for part in parts if part.text and not getattr(part, "thought", False))
+
+
+def _is_summary(event: Event) -> bool:
+    return event.author == SUMMARY_AUTHOR and _event_text(event).startswith(SUMMARY_PREFIX)
+
+
+def _is_turn_start(event: Event) -> bool:
+    return event.author == "user" and bool(_event_text(event))
+
+
+def _event_tokens(event: Event) -> int:
+    return content_tokens(event.content) if event.content else 0
+
+
+def _pending_call_ids(events: Sequence[Event]) -> Set[str]:
+    calls: Set[str] = set()
+    responses: Set[str] = set()
+    for event in events:
+        calls.update(call.id for call in event.get_function_calls() if call.id)
+        responses.update(response.id for response in event.get_function_responses() if response.id)
+    return calls - responses
+
+
+def _clip(text: str) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= _CLAUSE_CHARS else text[:_CLAUSE_CHARS].rstrip() + "…"
+
+
+def _event_clauses(event: Event) -> List[str]:
+    """What a folded event contributes to the summary."""
+    clauses = []
+    text = _event_text(event)
+    if text:
+        speaker = "User" if event.author == "user" else event.author
+        clauses.append(_clip(f"{speaker}: {text}"))
+    clauses.extend(f"{event.author} called {call.name}" for call in event.get_function_calls())
+    return clauses
+
+
+class CompactingSessionService(InMemorySessionService):
+    """In-memory session service that folds old turns into a rolling summary."""
+
+    def __init__(
+        self,
+        keep_turns: int = 6,
+        max_events: int = 60,
+        max_tokens: int = 8000,
+        max_summary_bytes: int = 2048,
+        summarizer: Optional[Summarizer] = None,
+    ) -> None:
+        """
+        Args:
+            keep_turns: Most recent turns always kept verbatim.
+            max_events: Event count above which a session is compacted.
+            max_tokens: Estimated history tokens above which a session is
+                compacted.
+            max_summary_bytes: Cap on the UTF-8 size of the rolling summary.
+            summarizer: Roll-up strategy; defaults to ExtractiveSummarizer.
+        """
+        super().__init__()
+        self.keep_turns = max(keep_turns, 1)
+        self.max_events = max_events
+        self.max_tokens = max_tokens
+        self.max_summary_bytes = max_summary_bytes
+        self.summarizer = summarizer or ExtractiveSummarizer()
+        self._tokens: Dict[_SessionKey, int] = {}
+        self._tasks: Dict[_SessionKey, asyncio.Task] = {}
+        self._stats = {"compactions": 0, "folded_events": 0, "folded_tokens": 0, "skipped": 0}
+
+    # ------------------------------------------------------------------
+    # Session service hooks
+    # ------------------------------------------------------------------
+    async def append_event(self, session, event: Event) -> Event:
+        event = await super().append_event(session=session, event=event)
+        if event.partial:
+            return event
+        key = (session.app_name, session.user_id, session.id)
+        self._tokens[key] = self._tokens.get(key, 0) + _event_tokens(event)
+        # Only after the turn's final answer: the next turn is not waiting
+        # on anything and the folded turns are complete.
+        if event.author != "user" and event.is_final_response() and self._over_threshold(key):
+            self._schedule(key)
+        return event
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        key = (app_name, user_id, session_id)
+        self._tokens.pop(key, None)
+        task = self._tasks.pop(key, None)
+        if task is not None:
+            task.cancel()
+        await super().delete_session(app_name=app_name, user_id=user_id, session_id=session_id)
+
+    # ------------------------------------------------------------------
+    # Compaction
+    # ------------------------------------------------------------------
+    def _storage(self, key: _SessionKey):
+        app_name, user_id, session_id = key
+        return self.sessions.get(app_name, {}).get(user_id, {}).get(session_id)
+
+    def _over_threshold(self, key: _SessionKey) -> bool:
+        storage = self._storage(key)
+        if storage is None:
+            return False
+        return len(storage.events) > self.max_events or self._tokens.get(key, 0) > self.max_tokens
+
+    def _schedule(self, key: _SessionKey) -> None:
+        if key in self._tasks:
+            return
+        task = asyncio.get_running_loop().create_task(self._compact(key))
+        self._tasks[key] = task
+        task.add_done_callback(lambda _, key=key: self._tasks.pop(key, None))
+
+    async def _compact(self, key: _SessionKey) -> None:
+        storage = self._storage(key)
+        if storage is None:
+            return
+        snapshot = list(storage.events)
+        plan = await asyncio.to_thread(self._plan, snapshot)
+        if plan is None:
+            self._stats["skipped"] += 1
+            return
+        cut, head, folded, folded_tokens = plan
+
+        # Events are only ever appended, so the folded prefix is unchanged
+        # as long as its last event is still in place.
+        storage = self._storage(key)
+        if storage is None or len(storage.events) < cut or storage.events[cut - 1] is not snapshot[cut - 1]:
+            self._stats["skipped"] += 1
+            return
+        storage.events[:cut] = head
+        self._tokens[key] = self._tokens.get(key, 0) - folded_tokens + _event_tokens(head[0])
+        self._stats["compactions"] += 1
+        self._stats["folded_events"] += folded
+        self._stats["folded_tokens"] += folded_tokens
+
+    def _cut_index(self, events: Sequence[Event]) -> int:
+        """Index of the first turn kept verbatim (0: nothing to fold)."""
+        first = 1 if events and _is_summary(events[0]) else 0
+        starts = [i for i in range(first, len(events)) if _is_turn_start(events[i])]
+        if len(starts) <= self.keep_turns:
+            return 0
+        return starts[-self.keep_turns]
+
+    def _plan(self, events: List[Event]) -> Optional[Tuple[int, List[Event], int, int]]:
+        """Build the events replacing ``events[:cut]``: a summary, then pinned events.
+
+        Events holding a function call that has no response yet are pinned:
+        they are kept verbatim right after the summary instead of folded.
+        """
+        cut = self._cut_index(events)
+        if not cut:
+            return None
+        pending = _pending_call_ids(events[:cut])
+        pinned = [event for event in events[:cut] if any(call.id in pending for call in event.get_function_calls())]
+        folded = [event for event in events[:cut] if not any(event is kept for kept in pinned)]
+        if not folded or (len(folded) == 1 and _is_summary(folded[0])):
+            return None
+        clauses = []
+        for event in reversed(folded):
+            if _is_summary(event):
+                clauses.extend(split_clauses(_event_text(event)[len(SUMMARY_PREFIX):]))
+            else:
+                clauses.extend(reversed(_event_clauses(event)))
+        text = self.summarizer.summarize(clauses, self.max_summary_bytes - len(SUMMARY_PREFIX))
+        summary = Event(
+            author=SUMMARY_AUTHOR,
+            invocation_id=folded[-1].invocation_id,
+            timestamp=folded[-1].timestamp,
+            content=types.Content(role="model", parts=[types.Part(text=f"{SUMMARY_PREFIX}{text}")]),
+        )
+        return cut, [summary, *pinned], len(folded), sum(_event_tokens(event) for event in folded)
+
+    async def compact_session(self, app_name: str, user_id: str, session_id: str) -> None:
+        """Compact one session now, regardless of the thresholds."""
+        await self._compact((app_name, user_id, session_id))
+
+    async def wait_for_compactions(self) -> None:
+        """Wait for scheduled background compactions (e.g. before shutdown)."""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks.values()), return_exceptions=True)
+
+    def compaction_stats(self) -> Dict[str, Any]:
+        stats = dict(self._stats)
+        stats["sessions_tracked"] = len(self._tokens)
+        stats["running"] = len(self._tasks)
+        return stats
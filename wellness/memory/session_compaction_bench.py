@@ -0,0 +1,148 @@
+"""
+Benchmark for session history compaction.
+Plays a 100-turn coaching session through the plain InMemorySessionService
+and through CompactingSessionService, using real ADK events: each turn
+is a user message, a specialist call, its response and the CWO's answer.
+In one early turn the call never gets a response (a long-running tool),
+so the run also checks that pending calls survive compaction. Every turn
+reads the session and counts the tokens that would be resent to the
+model, as the runner does, before appending the turn's events.
+
+Run from the wellness/ directory:
+    python -m memory.session_compaction_bench            # 100 turns
+    python -m memory.session_compaction_bench 300
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+from typing import Any, Dict, List
+
+from google.adk.events import Event
+from google.adk.sessions.in_memory_session_service import InMemorySessionService
+from google.genai import types
+
+from utils.token_budget import content_tokens
+
+from .session_compaction import CompactingSessionService, _is_summary
+
+APP_NAME = "session_compaction_bench"
+USER_ID = "bench_user"
+SESSION_ID = "bench_session"
+AGENT = "chief_wellness_officer"
+PENDING_TURN = 3
+# Pause between user messages, so background compactions can run.
+THINK_SECONDS = 0.003
+
+
+def turn_events(turn: int) -> List[Event]:
+    """User message, specialist call and response, final answer."""
+    invocation = f"turn-{turn}"
+    call_id = f"call-{turn}"
+    events = [
+        Event(
+            author="user",
+            invocation_id=invocation,
+            content=types.Content(
+                role="user",
+                parts=[types.Part(text=f"Turn {turn}. I want to adjust my plan because my knee hurts a bit. " * 3)],
+            ),
+        ),
+        Event(
+            author=AGENT,
+            invocation_id=invocation,
+            content=types.Content(
+                role="model",
+                parts=[
+                    types.Part(
+                        function_call=types.FunctionCall(
+                            id=call_id, name="exercise_coach", args={"request": "Adjust the plan. " * 10}
+                        )
+                    )
+                ],
+            ),
+        ),
+    ]
+    if turn != PENDING_TURN:
+        events.append(
+            Event(
+                author=AGENT,
+                invocation_id=invocation,
+                content=types.Content(
+                    role="user",
+                    parts=[
+                        types.Part(
+                            function_response=types.FunctionResponse(
+                                id=call_id, name="exercise_coach", response={"result": "Day 1: squats 3x10. " * 60}
+                            )
+                        )
+                    ],
+                ),
+            )
+        )
+    events.append(
+        Event(
+            author=AGENT,
+            invocation_id=invocation,
+            content=types.Content(
+                role="model",
+                parts=[types.Part(text=f"Answer {turn}: here is your updated plan with lower knee load. " * 10)],
+            ),
+        )
+    )
+    return events
+
+
+async def _play(service: InMemorySessionService, turns: int) -> Dict[str, Any]:
+    await service.create_session(app_name=APP_NAME, user_id=USER_ID, session_id=SESSION_ID)
+    timings, prompt_tokens = [], []
+    for turn in range(turns):
+        start = time.perf_counter()
+        session = await service.get_session(app_name=APP_NAME, user_id=USER_ID, session_id=SESSION_ID)
+        prompt_tokens.append(sum(content_tokens(event.content) for event in session.events if event.content))
+        for event in turn_events(turn):
+            await service.append_event(session, event)
+        timings.append(time.perf_counter() - start)
+        await asyncio.sleep(THINK_SECONDS)
+    if isinstance(service, CompactingSessionService):
+        await service.wait_for_compactions()
+    session = await service.get_session(app_name=APP_NAME, user_id=USER_ID, session_id=SESSION_ID)
+    return {"timings": timings, "prompt_tokens": prompt_tokens, "events": session.events}
+
+
+def _summary(result: Dict[str, Any]) -> Dict[str, Any]:
+    timings = result["timings"]
+    return {
+        "first_10_turns_ms": round(statistics.mean(timings[:10]) * 1e3, 2),
+        "last_10_turns_ms": round(statistics.mean(timings[-10:]) * 1e3, 2),
+        "prompt_tokens_turn_10": result["prompt_tokens"][min(9, len(timings) - 1)],
+        "prompt_tokens_last_turn": result["prompt_tokens"][-1],
+        "events": len(result["events"]),
+    }
+
+
+def run(turns: int = 100) -> Dict[str, Any]:
+    plain = asyncio.run(_play(InMemorySessionService(), turns))
+    compacting_service = CompactingSessionService()
+    compacting = asyncio.run(_play(compacting_service, turns))
+
+    events = compacting["events"]
+    pending_call = f"call-{PENDING_TURN}"
+    report = {"turns": turns}
+    report.update({f"in_memory_{key}": value for key, value in _summary(plain).items()})
+    report.update({f"compacting_{key}": value for key, value in _summary(compacting).items()})
+    report.update(
+        {
+            "compactions": compacting_service.compaction_stats()["compactions"],
+            "summary_author": events[0].author if events and _is_summary(events[0]) else None,
+            "pending_call_kept": any(call.id == pending_call for event in events for call in event.get_function_calls()),
+        }
+    )
+    return report
+
+
+if __name__ == "__main__":
+    report = run(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
+    for key, value in report.items():
+        print(f"{key}: {value}")
@@ -2,18 +2,47 @@
 
 The manager persists lightweight summaries per user so the Chief Wellness
 Officer can tailor recommendations when users return. It also applies a
-simple compaction strategy that collapses older entries into
-chronological summaries and caps the total entries retained per user.
+tiered compaction strategy (see ``compaction``) that keeps the newest
+entries verbatim, rolls older ones up into weekly and long-term summaries
+and caps the total size retained per user.
+
+Entries are persisted through a pluggable store (see ``memory_stores``).
+The shared instance uses the append-only journal by default; set
+``WELLNESS_MEMORY_BACKEND=json`` to fall back to rewriting the whole file,
+or ``binary`` for the memory-mapped record format used by large tenants.
+Set ``WELLNESS_MULTIPROCESS=1`` when several worker processes share the
+same data directory.
+
+Reads go through a bounded per-user LRU cache of parsed entries. The cache
+is updated on local writes and dropped whenever the store's files change
+underneath it (new inode, mtime or size), so repeat reads skip parsing.
+``search_memories`` ranks a user's entries against a query with a local
+BM25 index (see ``memory_index``) so only the most relevant ones need to be
+sent to the model.
 """
 
 from __future__ import annotations
 
-import json
+import os
 import threading
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from utils.file_lock import InterProcessLock, multiprocess_enabled
+from utils.lru_cache import LRUCache
+
+from .binary_store import BinaryMemoryStore
+from .compaction import TieredCompactor
+from .memory_index import MemoryIndex
+from .memory_stores import JournalMemoryStore, JsonMemoryStore
+
+_BACKENDS = {
+    "json": JsonMemoryStore,
+    "journal": JournalMemoryStore,
+    "binary": BinaryMemoryStore,
+}
 
 
 @dataclass
@@ -28,64 +57,125 @@ class MemoryEntry:
 class UserMemoryManager:
     """File-backed memory store with basic compaction policies."""
 
-    def __init__(self, storage_path: str = "data/user_memory.json", max_entries: int = 5) -> None:
+    def __init__(
+        self,
+        storage_path: str = "data/user_memory.json",
+        max_entries: int = 5,
+        backend: str = "json",
+        multiprocess: bool = False,
+        cache_size: int = 1024,
+        compactor: TieredCompactor | None = None,
+    ) -> None:
+        if backend not in _BACKENDS:
+            raise ValueError(f"Unknown memory backend: {backend!r}")
         self.storage_path = Path(storage_path)
         self.storage_path.parent.mkdir(parents=True, exist_ok=True)
         self.max_entries = max_entries
-        self._lock = threading.Lock()
-        if not self.storage_path.exists():
-            self._write({})
+        self.compactor = compactor or TieredCompactor(max_recent=max_entries)
+        self.multiprocess = multiprocess
+        if multiprocess:
+            # Held around every read-modify-write so workers never interleave.
+            self._lock = InterProcessLock(f"{self.storage_path}.lock")
+            self._store = _BACKENDS[backend](self.storage_path, process_lock=self._lock)
+        else:
+            self._lock = threading.Lock()
+            self._store = _BACKENDS[backend](self.storage_path)
+        self._cache = LRUCache(maxsize=cache_size)
+        self._cache_signature = self._store.signature()
+        self._index = MemoryIndex(max_users=cache_size)
 
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
     def get_user_memories(self, user_id: str) -> List[MemoryEntry]:
-        data = self._read()
-        raw_entries = data.get(user_id, [])
-        return [MemoryEntry(**entry) for entry in raw_entries]
+        with self._lock:
+            raw_entries = self._cached_entries(user_id)
+        return [_to_entry(entry) for entry in raw_entries]
+
+    def search_memories(self, user_id: str, query: str, k: int = 5) -> List[MemoryEntry]:
+        """Return the ``k`` entries most relevant to ``query`` (BM25)."""
+        with self._lock:
+            raw_entries = self._cached_entries(user_id)
+            self._index.sync_user(user_id, raw_entries)
+            ranked = self._index.search(user_id, query, k)
+        return [_to_entry(entry) for entry in ranked]
 
     def add_memory(self, user_id: str, summary: str, metadata: Dict[str, str] | None = None) -> MemoryEntry:
         entry = MemoryEntry(summary=summary, metadata=metadata)
         with self._lock:
-            data = self._read()
-            entries = data.get(user_id, [])
-            entries.append(entry.__dict__)
+            self._validate_cache()
+            entries = self._store.read_user(user_id)
+            # Store a copy: the cache must not share dicts with the caller.
+            entries.append(dict(entry.__dict__, metadata=dict(metadata or {})))
             entries = self._compact_entries(entries)
-            data[user_id] = entries
-            self._write(data)
+            self._store.write_user(user_id, entries)
+            # Our own write must not look like an external change.
+            self._cache.put(user_id, tuple(entries))
+            self._cache_signature = self._store.signature()
+            self._index.sync_user(user_id, entries)
         return entry
 
+    def iter_users(self) -> Iterator[Tuple[str, List[Dict]]]:
+        """Yield ``(user_id, raw entries)`` for every stored user."""
+        return self._store.iter_users()
+
+    def import_users(self, items: Iterable[Tuple[str, List[Dict]]]) -> int:
+        """Store raw entry lists as-is (no compaction), replacing existing ones."""
+        items = list(items)
+        with self._lock:
+            self._store.write_many(items)
+            for user_id, _ in items:
+                self._cache.pop(user_id)
+            self._cache_signature = self._store.signature()
+        return len(items)
+
+    def cache_stats(self) -> Dict[str, object]:
+        """Hit/miss counters for the per-user read cache."""
+        return self._cache.stats()
+
+    def close(self) -> None:
+        """Flush and release the underlying store."""
+        self._store.close()
+
     # ------------------------------------------------------------------
-    # Compaction strategies
+    # Read cache
     # ------------------------------------------------------------------
-    def _compact_entries(self, entries: List[Dict]) -> List[Dict]:
-        if len(entries) <= self.max_entries:
-            return entries
-
-        # Summarize everything older than the newest window into a single entry
-        stale = entries[: -self.max_entries]
-        recent = entries[-self.max_entries :]
-        summary_text = " | ".join(item.get("summary", "") for item in stale if item.get("summary"))
-        compounded = MemoryEntry(
-            summary=f"Historical preferences: {summary_text}",
-            metadata={"compacted": "true"},
-        )
-        return [compounded.__dict__, *recent]
+    def _cached_entries(self, user_id: str) -> Tuple[Dict, ...]:
+        """Return the user's raw entries, reading through the cache (lock held)."""
+        self._validate_cache()
+        raw_entries = self._cache.get(user_id)
+        if raw_entries is None:
+            raw_entries = tuple(self._store.read_user(user_id))
+            self._cache.put(user_id, raw_entries)
+        return raw_entries
+
+    def _validate_cache(self) -> None:
+        """Drop cached entries if the backing files changed (lock held)."""
+        signature = self._store.signature()
+        if signature != self._cache_signature:
+            self._cache.clear()
+            self._cache_signature = signature
 
     # ------------------------------------------------------------------
-    # Persistence helpers
+    # Compaction strategies
     # ------------------------------------------------------------------
-    def _read(self) -> Dict[str, List[Dict]]:
-        if not self.storage_path.exists():
-            return {}
-        try:
-            return json.loads(self.storage_path.read_text(encoding="utf-8"))
-        except json.JSONDecodeError:
-            return {}
+    def _compact_entries(self, entries: List[Dict]) -> List[Dict]:
+        return self.compactor.compact(entries)
+
 
-    def _write(self, data: Dict[str, List[Dict]]) -> None:
-        self.storage_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+def _to_entry(raw: Dict) -> MemoryEntry:
+    # Copy metadata so callers can't mutate the cached dictionaries.
+    metadata = raw.get("metadata")
+    return MemoryEntry(
+        summary=raw["summary"],
+        # Entries written before timestamps were recorded have none.
+        timestamp=raw.get("timestamp", ""),
+        metadata=dict(metadata) if metadata else metadata,
+    )
 
 
 # Shared singleton instance used across the app
-memory_manager = UserMemoryManager()
+memory_manager = UserMemoryManager(
+    backend=os.getenv("WELLNESS_MEMORY_BACKEND", "journal"),
+    multiprocess=multiprocess_enabled(),
+)
@@ -0,0 +1,96 @@
+"""
+Crisis resources by country.
+A small, hand-checked table of emergency numbers and national crisis lines,
+so the crisis specialist can hand out a real resource without a network
+lookup and without relying on the model to recall phone numbers.
+Only add entries that have been verified against the provider's own site.
+"""
+
+from typing import Any, Dict, Optional
+
+from utils.country_names import lookup_country_name
+
+# ISO 3166 code -> (country name, emergency number, crisis lines).
+CRISIS_RESOURCES = {
+    "US": ("United States", "911", (
+        {"name": "988 Suicide & Crisis Lifeline", "contact": "Call or text 988"},
+    )),
+    "CA": ("Canada", "911", (
+        {"name": "9-8-8 Suicide Crisis Helpline", "contact": "Call or text 988"},
+    )),
+    "GB": ("United Kingdom", "999", (
+        {"name": "Samaritans", "contact": "Call 116 123"},
+        {"name": "Shout", "contact": "Text SHOUT to 85258"},
+    )),
+    "IE": ("Ireland", "112 or 999", (
+        {"name": "Samaritans", "contact": "Call 116 123"},
+        {"name": "50808", "contact": "Text HELLO to 50808"},
+    )),
+    "AU": ("Australia", "000", (
+        {"name": "Lifeline", "contact": "Call 13 11 14"},
+        {"name": "Beyond Blue", "contact": "Call 1300 22 4636"},
+    )),
+    "NZ": ("New Zealand", "111", (
+        {"name": "Need to talk?", "contact": "Call or text 1737"},
+        {"name": "Lifeline Aotearoa", "contact": "Call 0800 543 354"},
+    )),
+    "IN": ("India", "112", (
+        {"name": "Tele-MANAS", "contact": "Call 14416"},
+    )),
+    "DE": ("Germany", "112", (
+        {"name": "TelefonSeelsorge", "contact": "Call 0800 111 0 111 or 0800 111 0 222"},
+    )),
+    "FR": ("France", "112", (
+        {"name": "Numéro national de prévention du suicide", "contact": "Call 3114"},
+    )),
+    "ES": ("Spain", "112", (
+        {"name": "Línea 024 de atención a la conducta suicida", "contact": "Call 024"},
+    )),
+    "NL": ("Netherlands", "112", (
+        {"name": "113 Zelfmoordpreventie", "contact": "Call 113 or 0800 0113"},
+    )),
+}
+
+# Used when a code is not an assigned ISO 3166 country.
+UNKNOWN_COUNTRY = "your country"
+
+INTERNATIONAL_DIRECTORY = {
+    "name": "Find A Helpline (international directory of crisis lines)",
+    "contact": "https://findahelpline.com",
+}
+
+
+def country_name(country_code: Optional[str]) -> Optional[str]:
+    """English name for a country code, or UNKNOWN_COUNTRY if unassigned."""
+    if not country_code:
+        return None
+    entry = CRISIS_RESOURCES.get(country_code.upper())
+    if entry:
+        return entry[0]
+    return lookup_country_name(country_code) or UNKNOWN_COUNTRY
+
+
+def crisis_resources(country_code: Optional[str]) -> Dict[str, Any]:
+    """Emergency number and crisis lines for a country.
+
+    Countries outside the table get the generic advice to call local
+    emergency services plus the international directory.
+    """
+    entry = CRISIS_RESOURCES.get((country_code or "").upper())
+    if entry is None:
+        return {
+            "country_code": country_code.upper() if country_code else None,
+            "country": country_name(country_code),
+            "emergency_number": None,
+            "emergency_advice": "Call your local emergency number (for example 112 or 911).",
+            "crisis_lines": [dict(INTERNATIONAL_DIRECTORY)],
+            "verified": False,
+        }
+    name, emergency, lines = entry
+    return {
+        "country_code": country_code.upper(),
+        "country": name,
+        "emergency_number": emergency,
+        "crisis_lines": [dict(line) for line in lines] + [dict(INTERNATIONAL_DIRECTORY)],
+        "verified": True,
+    }
@@ -5,17 +5,34 @@ This agent can be exposed via A2A protocol for communication with other agents.
 """
 
 import textwrap
-from google.adk.agents import Agent
+from typing import AsyncGenerator
+
+from google.adk.agents import Agent, BaseAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
 from google.adk.tools import AgentTool
 from google.genai import types
 from google.adk.models.google_llm import Gemini
+from utils.token_budget import enforce_token_budget
 from utils.utils import get_retry_config
 
-from .mindfulness_tools import get_current_locality
+from .mindfulness_tools import get_crisis_resources
+from .prescreen import prescreen
 
 
 # ----- Specialist Agents --------------------------------------------------
 
+# Session state counter bumped every time the crisis specialist runs, however
+# it was reached (pre-screen or orchestrator). Response caches compare it
+# before and after a call and never share an answer it changed.
+CRISIS_RUNS_KEY = "crisis_specialist_runs"
+
+
+def _count_crisis_run(callback_context: CallbackContext) -> None:
+    callback_context.state[CRISIS_RUNS_KEY] = callback_context.state.get(CRISIS_RUNS_KEY, 0) + 1
+
+
 # 1. Crisis Agent – handles self-harm / emergency messages
 crisis_agent = Agent(
     name="crisis_specialist",
@@ -23,16 +40,17 @@ crisis_agent = Agent(
         model="gemini-2.5-flash",
         retry_options=get_retry_config(),
     ),
-    tools=[get_current_locality],
+    tools=[get_crisis_resources],
+    before_agent_callback=_count_crisis_run,
     description="Use this tool for any input mentioning self-harm, suicide, severe distress, or 'ending it'.",
     instruction=textwrap.dedent(
         """
         You are a Crisis Intervention Specialist focused on immediate safety and real human help.
 
     CRITICAL INSTRUCTION:
-1. IMMEDIATELY call the `get_current_locality` tool to determine the user’s city and country if possible.
-2. If the location is known, provide the most relevant, real local emergency number or crisis resource you are certain about.
-3. If the location cannot be determined reliably:
+1. IMMEDIATELY call the `get_crisis_resources` tool. It returns the user’s location together with verified crisis resources for it.
+2. If it returns an emergency_number and crisis_lines, give the user exactly those. Do not substitute other numbers.
+3. If emergency_number is empty (the location or country is not covered):
    - Tell the user to contact their local emergency services (e.g., 112/911 depending on region).
    - You MAY include well-known international mental health resources that are broadly valid, but ONLY if you are sure.
 4. NEVER invent or guess hotline numbers or resource names.
@@ -84,7 +102,7 @@ educator_agent = Agent(
 
 # ----- Main Orchestrator ------------------------------------------------------
 
-mindfulness_agent = Agent(
+mindfulness_orchestrator = Agent(
     name="mindfulness_orchestrator",
     model=Gemini(
         model="gemini-2.5-pro",
@@ -95,6 +113,7 @@ mindfulness_agent = Agent(
         AgentTool(agent=coach_agent),
         AgentTool(agent=educator_agent),
     ],
+    before_model_callback=enforce_token_budget,
     description="A mindfulness specialist that provides meditation techniques, crisis support, and mindfulness education.",
     instruction=textwrap.dedent(
         """
@@ -130,10 +149,58 @@ Output format:
     ),
 )
 
+# ----- Local Pre-screen Router ------------------------------------------------
+
+class MindfulnessRouter(BaseAgent):
+    """Routes clear requests straight to a specialist, skipping the orchestrator.
+
+    The local pre-screen (see prescreen.py) sends any self-harm signal to the
+    crisis specialist and clear practice or theory requests to the coach or
+    professor, but only when no risk phrase appears anywhere in the message.
+    Everything else, including general distress, goes to the orchestrator as
+    before.
+    """
+
+    orchestrator: BaseAgent
+
+    model_config = {"arbitrary_types_allowed": True}
+
+    def __init__(self, name: str, orchestrator: BaseAgent, specialists: list[BaseAgent], **kwargs):
+        for agent in [orchestrator, *specialists]:
+            # Routed agents answer the user directly; they must not hand the
+            # conversation back to the router or to each other.
+            agent.disallow_transfer_to_parent = True
+            agent.disallow_transfer_to_peers = True
+        super().__init__(
+            name=name,
+            orchestrator=orchestrator,
+            sub_agents=[orchestrator, *specialists],
+            **kwargs,
+        )
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        text = ""
+        if ctx.user_content and ctx.user_content.parts:
+            text = " ".join(part.text for part in ctx.user_content.parts if part.text)
+        route = prescreen(text).route
+        target = self.find_sub_agent(route) if route else None
+        async for event in (target or self.orchestrator).run_async(ctx):
+            yield event
+
+
+mindfulness_agent = MindfulnessRouter(
+    name="mindfulness_specialist",
+    orchestrator=mindfulness_orchestrator,
+    specialists=[crisis_agent, coach_agent, educator_agent],
+    description=mindfulness_orchestrator.description,
+)
+
 # Export the main agent
 __all__ = [
     "mindfulness_agent",
+    "mindfulness_orchestrator",
     "crisis_agent",
     "coach_agent",
     "educator_agent",
+    "CRISIS_RUNS_KEY",
 ]
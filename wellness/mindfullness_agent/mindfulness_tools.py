@@ -1,29 +1,154 @@
 """
 Mindfulness Agent Tools
 These are the tools available to the mindfulness agents.
+
+Locality is resolved offline first: WELLNESS_COUNTRY pins the country
+outright, and otherwise the public IP (WELLNESS_PUBLIC_IP, or ipify) is
+looked up in the local GeoIP database (utils.geoip). ip-api.com is only
+used when the local database cannot place the IP, and
+WELLNESS_GEOIP_NETWORK=0 disables the network entirely. Results are
+cached for an hour (five minutes when the location stays unknown).
+
+Network lookups go through the shared async client (utils.http_client),
+so they never block the event loop, share one deadline budget, and skip
+hosts whose circuit breaker is open.
 """
 
-import requests
+import asyncio
+import os
+from typing import Any, Dict, NamedTuple, Optional
 
-def get_public_ip() -> str:
-    """Return the public IP address of the current machine."""
+from utils.geoip import lookup_country, preload_geoip_database
+from utils.http_client import Deadline, get_http_client
+from utils.lru_cache import LRUCache
+
+from .crisis_resources import country_name, crisis_resources
+
+LOCALITY_TTL = 3600
+UNKNOWN_LOCALITY_TTL = 300
+# Overall budget for the network lookups of one resolution.
+NETWORK_BUDGET = 4.0
+
+PUBLIC_IP_URL = "https://api.ipify.org"
+# Without an IP, ip-api.com locates the caller.
+IP_API_URL = "http://ip-api.com/json/"
+
+_FALLBACK_IP = "8.8.8.8"
+_locality_cache = LRUCache(maxsize=16)
+
+preload_geoip_database()
+
+
+class Locality(NamedTuple):
+    city: Optional[str]
+    country: Optional[str]
+    country_code: Optional[str]
+    source: str  # "configured", "local", "network" or "unknown"
+
+
+_UNKNOWN = Locality(None, None, None, "unknown")
+
+
+def _network_enabled() -> bool:
+    return os.getenv("WELLNESS_GEOIP_NETWORK", "1").lower() not in {"0", "false", "no"}
+
+
+async def _fetch_public_ip(deadline: Deadline) -> Optional[str]:
     try:
-        return requests.get("https://api.ipify.org", timeout=5).text
+        return (await get_http_client().get_text(PUBLIC_IP_URL, deadline)).strip() or None
     except Exception:
-        return "8.8.8.8"
+        return None
 
-def get_current_locality() -> str:
-    """Return a human-readable location (city, country) for the public IP.
-    Falls back to "Unknown Location" on any error.
-    """
-    ip = get_public_ip()
-    if ip == "8.8.8.8":
-        return "Unknown Location"
+
+async def get_public_ip() -> str:
+    """Return the public IP address of the current machine."""
+    configured = os.getenv("WELLNESS_PUBLIC_IP")
+    if configured:
+        return configured.strip()
+    if not _network_enabled():
+        return _FALLBACK_IP
+    return await _fetch_public_ip(Deadline(NETWORK_BUDGET)) or _FALLBACK_IP
+
+
+async def _network_locality(ip: str, deadline: Deadline) -> Optional[Locality]:
     try:
-        resp = requests.get(f"http://ip-api.com/json/{ip}", timeout=5)
-        data = resp.json()
+        data = await get_http_client().get_json(IP_API_URL + ip, deadline)
         if data.get("status") == "success":
-            return f"{data.get('city', 'Unknown City')}, {data.get('country', 'Unknown Country')}"
+            return Locality(data.get("city"), data.get("country"), data.get("countryCode"), "network")
     except Exception:
         pass
-    return "Unknown Location"
+    return None
+
+
+async def _local_locality(ip: str) -> Optional[Locality]:
+    # The database may still be loading; wait for it off the event loop.
+    code = await asyncio.to_thread(lookup_country, ip)
+    return Locality(None, country_name(code), code, "local") if code else None
+
+
+async def _resolve_locality() -> Locality:
+    code = os.getenv("WELLNESS_COUNTRY")
+    if code:
+        code = code.strip().upper()
+        return Locality(None, country_name(code), code, "configured")
+
+    network = _network_enabled()
+    configured_ip = os.getenv("WELLNESS_PUBLIC_IP")
+    if configured_ip:
+        configured_ip = configured_ip.strip()
+        locality = await _local_locality(configured_ip)
+        if locality is None and network:
+            locality = await _network_locality(configured_ip, Deadline(NETWORK_BUDGET))
+        return locality or _UNKNOWN
+    if not network:
+        return _UNKNOWN
+
+    # Offline first: place our public IP with the local database, and only
+    # ask ip-api.com when that fails. Both share one deadline budget.
+    deadline = Deadline(NETWORK_BUDGET)
+    ip = await _fetch_public_ip(deadline)
+    if ip:
+        locality = await _local_locality(ip)
+        if locality is not None:
+            return locality
+    # Without an IP, ip-api.com places the caller itself.
+    return await _network_locality(ip or "", deadline) or _UNKNOWN
+
+
+async def resolve_locality() -> Locality:
+    """Locality of the current machine, cached with a TTL."""
+    locality = _locality_cache.get("self")
+    if locality is None:
+        locality = await _resolve_locality()
+        ttl = UNKNOWN_LOCALITY_TTL if locality.source == "unknown" else LOCALITY_TTL
+        _locality_cache.put("self", locality, ttl=ttl)
+    return locality
+
+
+def _describe(locality: Locality) -> str:
+    if locality.country is None:
+        return "Unknown Location"
+    if locality.city:
+        return f"{locality.city}, {locality.country}"
+    return locality.country
+
+
+async def get_current_locality() -> str:
+    """Return a human-readable location (city, country) for the public IP.
+    Falls back to "Unknown Location" on any error.
+    """
+    return _describe(await resolve_locality())
+
+
+async def get_crisis_resources() -> Dict[str, Any]:
+    """Return the user's location with verified crisis resources for it.
+
+    Includes the local emergency number and national crisis lines when the
+    country is in the verified table; otherwise generic advice to call local
+    emergency services plus an international helpline directory.
+    """
+    locality = await resolve_locality()
+    result = crisis_resources(locality.country_code)
+    result["location"] = _describe(locality)
+    result["location_source"] = locality.source
+    return result
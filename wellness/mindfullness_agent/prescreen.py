@@ -0,0 +1,205 @@
+"""
+Local pre-screen for mindfulness requests.
+Runs before the mindfulness orchestrator so that clear cases skip its
+(slowest-in-the-system) routing hop:
+
+* A high-recall lexicon of self-harm signals, compiled into one regular
+  expression. Any hit routes to the crisis specialist. There is
+  deliberately no negation handling: a false alarm costs a gentle check-in,
+  a miss costs far more.
+* A second, broader lexicon of risk and distress ("hopeless", "end it",
+  "pills") that vetoes any other local route and leaves the decision to
+  the orchestrator. A message is only routed to the coach or professor
+  when neither lexicon matches anywhere in it, whatever else it asks for.
+* A small linear intent model over weighted phrase features that tells
+  practice requests ("walk me through a body scan") from theory questions
+  ("how does meditation change the brain?"). Only confident, clear-margin
+  decisions are routed; anything else goes to the orchestrator as before.
+
+Route values are the names of the agents they select.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+CRISIS = "crisis_specialist"
+PRACTICE = "meditation_coach"
+EDUCATION = "mindfulness_professor"
+
+# Self-harm signals, matched against normalized text (lowercase, straight
+# apostrophes, punctuation folded to spaces).
+_CRISIS_PATTERNS = (
+    r"suicid\w*",
+    r"kill(?:ing)? my ?self",
+    r"(?:end|ending|take|taking) my (?:own )?life",
+    r"end(?:ing)? it (?:all|tonight|today|now|soon|this week(?:end)?)",
+    r"ending it",
+    r"(?:feel|feeling|felt) like dying",
+    r"(?:want|wanna|wanted|wish|going|plan(?:ning)?|ready) (?:to )?die",
+    r"wish (?:i (?:was|were) |to be |i could be )?dead",
+    r"better off (?:dead|without me|if i (?:was|were)n'?t here)",
+    r"(?:better|happier|easier) (?:off )?(?:without me|if i(?: am| m| was| were|'m) gone)",
+    r"self ?harm\w*",
+    r"(?:hurt|harm|cut|cutt|burn|starv)(?:ing|e)? my ?self",
+    r"cut(?:ting)? (?:my )?(?:wrists?|arms?|thighs?|skin)",
+    r"(?:reason|point) (?:to|in|of) (?:keep(?:ing)? |go(?:ing)? on )?(?:live|living|going on|being alive|existing)",
+    r"can'?t (?:go on|do this anymore|take (?:it|this) any ?more|keep going)",
+    r"don'?t think i can (?:go on|keep going|do this any ?more)",
+    r"(?:don'?t|do not|no longer) want to (?:live|be alive|exist|wake up|be here)",
+    r"(?:not|isn'?t|no longer) worth living",
+    r"want (?:it all|everything|the pain|my life) to (?:end|stop)",
+    r"(?:want|wanna|wish) to (?:stop existing|not exist|cease to exist)",
+    r"(?:not|stop) (?:being|be) (?:here|around|alive) any ?more",
+    r"(?:think|thinking|thought) (?:about|of) not (?:being here|being around|being alive|waking up|existing)",
+    r"(?:sleep|fall asleep) and (?:never|not) wake up",
+    r"never wake up again",
+    r"sleep forever",
+    r"done with (?:life|living)",
+    r"overdos\w*",
+    r"(?:took|take|taking|swallow\w*) (?:a (?:bunch|lot|handful) of|all (?:my|the|of my)) (?:pills|meds|medication)",
+    r"(?:sav|stockpil|hoard|stash|collect)(?:ed|ing)? (?:up )?(?:my |the |some |all |enough )?(?:pills|meds|medication|tablets)",
+    r"(?:pills|meds|medication|tablets) (?:saved|stockpiled|hoarded|stashed)",
+    r"take them all",
+    r"hang(?:ing)? my ?self",
+    r"jump(?:ing)? (?:off|from) (?:a |the )?(?:bridge|building|roof|cliff)",
+    r"unalive",
+    # "kms" as in "kill myself", but not "5 kms".
+    r"(?<!\d )(?<!\d)kms",
+    r"give up on (?:life|living)",
+    r"disappear forever",
+    r"say(?:ing)? goodbye (?:to everyone|forever|for good)",
+    r"goodbye (?:letter|note)s?",
+    r"giv(?:e|ing|en) (?:away (?:my|all my) (?:things|stuff|belongings|possessions)|(?:my|all my) (?:things|stuff|belongings|possessions) away)",
+)
+
+# Distress without an explicit self-harm signal. These never route to the
+# crisis specialist on their own, but they stop the message from being
+# routed anywhere else locally: the orchestrator makes the call.
+_RISK_PATTERNS = (
+    r"hopeless\w*",
+    r"worthless",
+    r"(?:a|such a) burden",
+    r"no way out",
+    r"trapped",
+    r"give up",
+    r"giving up",
+    r"pointless",
+    r"nothing matters",
+    r"(?:feel|feeling) (?:empty|numb|dead inside)",
+    r"can'?t (?:cope|handle (?:it|this|anything))",
+    r"(?:hate|hating) my ?(?:self|life)",
+    r"nobody would (?:care|notice|miss me)",
+    r"(?:abus\w*|assault\w*|violen\w*)",
+    r"di(?:e|es|ed)|dying|dead|death",
+    r"end(?:ing)? it",
+    r"end (?:things|everything)",
+    r"pills|tablets|meds",
+    r"rope|noose|razors?|blades?|guns?",
+    r"cut again",
+    r"not (?:being|be) (?:here|around)",
+    r"(?:won'?t|not|still) be (?:here|around)",
+    r"disappear\w*",
+    r"meaningless",
+    r"waste of space",
+    r"tired of (?:everything|living|life|it all|being alive)",
+    r"(?:no|what'?s the|what is the) point",
+    r"point (?:of|in) (?:life|anything|it all|trying)",
+)
+
+# Phrase feature -> (intent, weight).
+_INTENT_FEATURES: Dict[str, Tuple[str, float]] = {
+    r"guide me": (PRACTICE, 2.0),
+    r"walk me through": (PRACTICE, 2.0),
+    r"lead me": (PRACTICE, 2.0),
+    r"body scan": (PRACTICE, 2.0),
+    r"grounding": (PRACTICE, 2.0),
+    r"5 4 3 2 1|54321": (PRACTICE, 2.0),
+    r"box breathing|4 7 8": (PRACTICE, 2.0),
+    r"breathing (?:exercise|technique)s?": (PRACTICE, 2.0),
+    r"help me (?:relax|calm down|unwind|sleep|fall asleep|breathe|focus)": (PRACTICE, 2.0),
+    r"calm (?:me )?down": (PRACTICE, 1.5),
+    r"can'?t sleep|fall asleep|trouble sleeping": (PRACTICE, 1.5),
+    r"(?:let'?s|i want to|can we|teach me to) (?:practice|meditate|breathe|try)": (PRACTICE, 2.0),
+    r"practice": (PRACTICE, 1.0),
+    r"panic(?:king)?": (PRACTICE, 1.5),
+    r"anxious|overwhelmed|stressed|tense|on edge": (PRACTICE, 1.0),
+    r"right now": (PRACTICE, 1.0),
+    r"relax\w*|breathe|breathing": (PRACTICE, 0.5),
+    r"meditat\w*": (PRACTICE, 0.5),
+    r"what (?:is|are|does)": (EDUCATION, 2.0),
+    r"how (?:does|do|can) (?:it|mindfulness|meditation|breathing)": (EDUCATION, 2.0),
+    r"why (?:does|do|is|are)": (EDUCATION, 2.0),
+    r"explain": (EDUCATION, 2.0),
+    r"difference between": (EDUCATION, 2.0),
+    r"scien\w*|research|studies|study|evidence": (EDUCATION, 1.5),
+    r"neuroplasticity|dopamine|cortisol|vagus|amygdala|prefrontal|nervous system": (EDUCATION, 1.5),
+    r"tell me about|learn about|curious about": (EDUCATION, 1.5),
+    r"brain": (EDUCATION, 1.0),
+    r"benefits? of|history of|theory|mean(?:s|ing)?": (EDUCATION, 1.0),
+}
+
+# An intent is routed only when its score reaches MIN_SCORE and beats the
+# other intent by at least MIN_MARGIN.
+MIN_SCORE = 2.0
+MIN_MARGIN = 1.5
+
+_CRISIS_RE = re.compile(r"\b(?:%s)\b" % "|".join(sorted(_CRISIS_PATTERNS, key=len, reverse=True)))
+_RISK_RE = re.compile(r"\b(?:%s)\b" % "|".join(_RISK_PATTERNS))
+_FEATURES = tuple(_INTENT_FEATURES.items())
+_FEATURE_RE = re.compile(
+    "|".join(r"\b(?P<f%d>%s)\b" % (i, pattern) for i, (pattern, _) in enumerate(_FEATURES))
+)
+_APOSTROPHES = str.maketrans({"’": "'", "‘": "'", "`": "'"})
+_SEPARATORS_RE = re.compile(r"[^a-z0-9']+")
+
+
+@dataclass(frozen=True)
+class Prescreen:
+    """Pre-screen decision for one message.
+
+    Attributes:
+        route: CRISIS, PRACTICE or EDUCATION, or None to let the
+            orchestrator decide.
+        matched: The phrases that drove the decision.
+        scores: Intent model scores (empty for crisis matches).
+        distress: A self-harm or general-distress phrase matched.
+    """
+
+    route: Optional[str]
+    matched: Tuple[str, ...] = ()
+    scores: Tuple[Tuple[str, float], ...] = ()
+    distress: bool = False
+
+
+def normalize(text: str) -> str:
+    text = (text or "").lower().translate(_APOSTROPHES)
+    return " ".join(_SEPARATORS_RE.sub(" ", text).split())
+
+
+def has_risk(text: str) -> bool:
+    """Whether any crisis or risk phrase appears anywhere in ``text``."""
+    text = normalize(text)
+    return bool(_CRISIS_RE.search(text) or _RISK_RE.search(text))
+
+
+def prescreen(text: str) -> Prescreen:
+    """Route ``text`` locally when the decision is clear."""
+    text = normalize(text)
+    crisis = [m.group(0) for m in _CRISIS_RE.finditer(text)]
+    if crisis:
+        return Prescreen(CRISIS, tuple(crisis), distress=True)
+
+    risk = _RISK_RE.search(text)
+    if risk:
+        return Prescreen(None, (risk.group(0),), distress=True)
+
+    scores = {PRACTICE: 0.0, EDUCATION: 0.0}
+    matched = []
+    for m in _FEATURE_RE.finditer(text):
+        intent, weight = _FEATURES[int(m.lastgroup[1:])][1]
+        scores[intent] += weight
+        matched.append(m.group(0))
+    (best, top), (_, runner_up) = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    route = best if top >= MIN_SCORE and top - runner_up >= MIN_MARGIN else None
+    return Prescreen(route, tuple(matched), tuple(scores.items()))
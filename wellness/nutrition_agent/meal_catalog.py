@@ -0,0 +1,532 @@
+"""Local meal catalogue with bitset diet/allergen filtering.
+
+The catalogue is generated from small component tables (a protein, a base,
+vegetables and a sauce for bowls; base, topping and extra for breakfasts;
+and so on), which yields several thousand meals with summed macros. Each
+component carries a ``contains`` bitset (meat, fish, dairy, gluten, tree
+nuts, ...), and a meal's bitset is the OR of its components'. Meals also
+carry a meal-slot bitset.
+
+Dietary preferences and allergies are parsed once into an exclusion mask,
+so picking eligible meals is a single vectorized ``contains & mask == 0``
+over the whole catalogue. Allergy words that map to no known allergen are
+matched against component names instead, and reported back when nothing
+in the catalogue matches them.
+
+The arrays are built lazily on first use and shared by every caller.
+"""
+
+from __future__ import annotations
+
+import functools
+import re
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# ------------------------------------------------------------------
+# Tags
+# ------------------------------------------------------------------
+MEAT = 1 << 0
+PORK = 1 << 1
+POULTRY = 1 << 2
+FISH = 1 << 3
+SHELLFISH = 1 << 4
+DAIRY = 1 << 5
+EGG = 1 << 6
+GLUTEN = 1 << 7
+TREE_NUT = 1 << 8
+PEANUT = 1 << 9
+SOY = 1 << 10
+SESAME = 1 << 11
+COCONUT = 1 << 12
+
+BREAKFAST = 1 << 0
+LUNCH = 1 << 1
+DINNER = 1 << 2
+SNACK = 1 << 3
+POST_WORKOUT = 1 << 4
+
+_FLESH = MEAT | PORK | POULTRY | FISH | SHELLFISH
+
+# Component: (name, kcal, protein g, carbs g, fat g, contains bitset)
+Component = Tuple[str, int, int, int, int, int]
+
+
+@dataclass(frozen=True)
+class _Family:
+    """Meals built from every combination of one item per component table."""
+
+    template: str
+    slots: int
+    tables: Tuple[Tuple[Component, ...], ...]
+
+
+_FAMILIES: Tuple[_Family, ...] = (
+    _Family(
+        template="{0} over {1} with {2}, topped with {3}",
+        slots=LUNCH | DINNER,
+        tables=(
+            (
+                ("Grilled chicken breast", 165, 31, 0, 4, POULTRY),
+                ("Roast turkey", 150, 30, 0, 3, POULTRY),
+                ("Lean beef strips", 215, 26, 0, 12, MEAT),
+                ("Pork tenderloin", 180, 30, 0, 6, MEAT | PORK),
+                ("Lamb kofta", 250, 22, 3, 17, MEAT),
+                ("Baked salmon", 230, 25, 0, 14, FISH),
+                ("Seared tuna", 160, 34, 0, 2, FISH),
+                ("Baked cod", 120, 26, 0, 1, FISH),
+                ("Garlic shrimp", 140, 27, 1, 3, SHELLFISH),
+                ("Crispy tofu", 180, 18, 4, 11, SOY),
+                ("Tempeh", 195, 20, 8, 11, SOY),
+                ("Spiced chickpeas", 210, 11, 35, 3, 0),
+                ("Red lentil dal", 230, 18, 40, 1, 0),
+                ("Black beans", 225, 15, 41, 1, 0),
+                ("Soft-boiled eggs", 155, 13, 1, 11, EGG),
+                ("Grilled paneer", 265, 18, 4, 20, DAIRY),
+            ),
+            (
+                ("brown rice", 215, 5, 45, 2, 0),
+                ("quinoa", 220, 8, 39, 4, 0),
+                ("whole-wheat pasta", 175, 7, 37, 1, GLUTEN),
+                ("roasted sweet potato", 180, 4, 41, 0, 0),
+                ("couscous", 175, 6, 36, 0, GLUTEN),
+                ("rice noodles", 190, 3, 42, 0, 0),
+                ("corn tortillas", 170, 4, 35, 2, 0),
+                ("cauliflower rice", 50, 4, 10, 0, 0),
+            ),
+            (
+                ("roasted broccoli", 55, 4, 11, 1, 0),
+                ("mixed greens", 20, 2, 4, 0, 0),
+                ("peppers and snap peas", 60, 3, 12, 0, 0),
+                ("zucchini and cherry tomatoes", 45, 2, 9, 1, 0),
+                ("steamed spinach", 40, 5, 6, 1, 0),
+                ("kale and mushrooms", 60, 4, 9, 2, 0),
+            ),
+            (
+                ("tahini drizzle", 90, 3, 3, 8, SESAME),
+                ("peanut sauce", 95, 4, 5, 7, PEANUT | SOY),
+                ("basil pesto", 80, 2, 1, 8, TREE_NUT | DAIRY),
+                ("soy-ginger glaze", 35, 2, 6, 0, SOY | GLUTEN),
+                ("lemon-olive oil dressing", 80, 0, 1, 9, 0),
+                ("yogurt-herb sauce", 40, 3, 3, 2, DAIRY),
+                ("tomato salsa", 20, 1, 4, 0, 0),
+                ("coconut curry sauce", 110, 1, 5, 10, COCONUT),
+            ),
+        ),
+    ),
+    _Family(
+        template="{0} with {1} and {2}",
+        slots=BREAKFAST,
+        tables=(
+            (
+                # Oats are tagged gluten: most are cross-contaminated.
+                ("Overnight oats", 150, 5, 27, 3, GLUTEN),
+                ("Greek yogurt bowl", 130, 17, 6, 4, DAIRY),
+                ("Soy yogurt bowl", 110, 6, 10, 5, SOY),
+                ("Chia pudding", 140, 5, 12, 9, 0),
+                ("Buckwheat porridge", 155, 6, 33, 1, 0),
+            ),
+            (
+                ("mixed berries", 40, 1, 10, 0, 0),
+                ("sliced banana", 90, 1, 23, 0, 0),
+                ("apple and cinnamon", 50, 0, 14, 0, 0),
+                ("mango", 60, 1, 15, 0, 0),
+                ("poached pear", 60, 0, 16, 0, 0),
+            ),
+            (
+                ("chia seeds", 60, 2, 5, 4, 0),
+                ("flax seeds", 55, 2, 3, 4, 0),
+                ("toasted almonds", 85, 3, 3, 7, TREE_NUT),
+                ("walnuts", 90, 2, 2, 9, TREE_NUT),
+                ("peanut butter", 95, 4, 3, 8, PEANUT),
+                ("pumpkin seeds", 80, 4, 2, 7, 0),
+                ("hemp hearts", 90, 5, 1, 7, 0),
+            ),
+        ),
+    ),
+    _Family(
+        template="{0} with {1} and {2}",
+        slots=BREAKFAST,
+        tables=(
+            (
+                ("Whole-grain toast", 160, 8, 28, 2, GLUTEN),
+                ("Veggie omelette", 210, 15, 3, 15, EGG),
+                ("Tofu scramble", 180, 15, 5, 11, SOY),
+                ("Breakfast tacos on corn tortillas", 170, 4, 35, 2, 0),
+            ),
+            (
+                ("avocado", 120, 1, 6, 11, 0),
+                ("sauteed spinach", 20, 2, 3, 0, 0),
+                ("cherry tomatoes", 25, 1, 5, 0, 0),
+                ("mushrooms", 20, 3, 3, 0, 0),
+            ),
+            (
+                ("pumpkin seeds", 80, 4, 2, 7, 0),
+                ("hemp hearts", 90, 5, 1, 7, 0),
+                ("smoked salmon", 70, 11, 0, 3, FISH),
+                ("crumbled feta", 75, 4, 1, 6, DAIRY),
+                ("black beans", 110, 7, 20, 0, 0),
+                ("turkey sausage", 100, 10, 1, 6, POULTRY),
+            ),
+        ),
+    ),
+    _Family(
+        template="{0} with {1}",
+        slots=SNACK,
+        tables=(
+            (
+                ("Apple slices", 95, 0, 25, 0, 0),
+                ("Carrot sticks", 35, 1, 8, 0, 0),
+                ("Rice cakes", 70, 1, 15, 1, 0),
+                ("Whole-grain crackers", 120, 3, 20, 4, GLUTEN),
+                ("Cucumber slices", 15, 1, 3, 0, 0),
+                ("Pear slices", 100, 1, 27, 0, 0),
+                ("Celery sticks", 10, 0, 2, 0, 0),
+                ("Steamed edamame", 120, 11, 9, 5, SOY),
+            ),
+            (
+                ("almond butter", 100, 3, 3, 9, TREE_NUT),
+                ("hummus", 80, 3, 7, 5, SESAME),
+                ("peanut butter", 95, 4, 3, 8, PEANUT),
+                ("cottage cheese", 90, 12, 4, 2, DAIRY),
+                ("Greek yogurt dip", 60, 6, 4, 2, DAIRY),
+                ("guacamole", 80, 1, 4, 7, 0),
+                ("sunflower seed butter", 95, 3, 4, 8, 0),
+                ("a hard-boiled egg", 78, 6, 1, 5, EGG),
+                ("roasted chickpeas", 120, 6, 18, 3, 0),
+            ),
+        ),
+    ),
+    _Family(
+        template="{2} smoothie with {1} and {0}",
+        slots=POST_WORKOUT,
+        tables=(
+            (
+                ("water", 0, 0, 0, 0, 0),
+                ("milk", 120, 8, 12, 5, DAIRY),
+                ("soy milk", 100, 7, 8, 4, SOY),
+                ("oat milk", 120, 3, 16, 5, GLUTEN),
+                ("almond milk", 40, 1, 2, 3, TREE_NUT),
+                ("coconut water", 45, 0, 11, 0, COCONUT),
+            ),
+            (
+                ("whey protein", 120, 24, 3, 1, DAIRY),
+                ("pea protein", 110, 22, 2, 2, 0),
+                ("soy protein", 100, 22, 2, 1, SOY),
+                ("Greek yogurt", 100, 17, 6, 0, DAIRY),
+                ("silken tofu", 80, 8, 3, 4, SOY),
+                ("egg-white protein", 110, 24, 2, 0, EGG),
+            ),
+            (
+                ("banana and spinach", 110, 2, 27, 0, 0),
+                ("mixed berries", 60, 1, 14, 0, 0),
+                ("mango", 100, 1, 25, 0, 0),
+                ("cherries", 90, 1, 22, 0, 0),
+                ("pineapple", 80, 1, 21, 0, 0),
+            ),
+        ),
+    ),
+)
+
+# Slot -> (label, share of daily calories, focus text)
+_SLOTS: Tuple[Tuple[int, str, float, str], ...] = (
+    (BREAKFAST, "Breakfast", 0.25, "Slow-release carbs + protein to stabilize morning energy."),
+    (LUNCH, "Lunch", 0.30, "High protein + colorful vegetables for micronutrients."),
+    (SNACK, "Snack", 0.15, "Keeps blood sugar steady between meals."),
+    (DINNER, "Dinner", 0.30, "Fiber-rich carbs for recovery and satiety."),
+)
+_POST_WORKOUT_SLOT = (
+    POST_WORKOUT,
+    "Post-workout",
+    0.10,
+    "Protein + carbs within 60 minutes of training.",
+)
+
+
+# ------------------------------------------------------------------
+# Parsing preferences and allergies into masks
+# ------------------------------------------------------------------
+@dataclass(frozen=True)
+class MealFilter:
+    """Everything that decides which catalogue meals a user may be offered.
+
+    Attributes:
+        exclude: Bitset of ``contains`` tags the user must avoid.
+        max_carbs: Per-meal carbohydrate cap in grams (low-carb diets).
+        no_meat_with_dairy: Kosher rule; drop meals mixing meat and dairy.
+        name_terms: Allergy words without a tag, matched against
+            component names.
+    """
+
+    exclude: int = 0
+    max_carbs: Optional[int] = None
+    no_meat_with_dairy: bool = False
+    name_terms: Tuple[str, ...] = ()
+
+
+_DIET_RULES: Dict[str, Tuple[int, Optional[int], bool]] = {
+    "vegan": (_FLESH | DAIRY | EGG, None, False),
+    "plant": (_FLESH | DAIRY | EGG, None, False),
+    "vegetarian": (_FLESH, None, False),
+    "veggie": (_FLESH, None, False),
+    "veg": (_FLESH, None, False),
+    "pescatarian": (MEAT | PORK | POULTRY, None, False),
+    "pescetarian": (MEAT | PORK | POULTRY, None, False),
+    "halal": (PORK, None, False),
+    "kosher": (PORK | SHELLFISH, None, True),
+    "gluten": (GLUTEN, None, False),
+    "celiac": (GLUTEN, None, False),
+    "coeliac": (GLUTEN, None, False),
+    "dairy": (DAIRY, None, False),
+    "lactose": (DAIRY, None, False),
+    "keto": (0, 20, False),
+    "low-carb": (0, 30, False),
+    "low carb": (0, 30, False),
+}
+
+_ALLERGENS: Dict[str, int] = {
+    "nut": TREE_NUT | PEANUT,
+    "tree nut": TREE_NUT,
+    "peanut": PEANUT,
+    "almond": TREE_NUT,
+    "cashew": TREE_NUT,
+    "walnut": TREE_NUT,
+    "pecan": TREE_NUT,
+    "pistachio": TREE_NUT,
+    "hazelnut": TREE_NUT,
+    "shellfish": SHELLFISH,
+    "shrimp": SHELLFISH,
+    "prawn": SHELLFISH,
+    "crab": SHELLFISH,
+    "lobster": SHELLFISH,
+    "fish": FISH,
+    "salmon": FISH,
+    "tuna": FISH,
+    "cod": FISH,
+    "dairy": DAIRY,
+    "milk": DAIRY,
+    "lactose": DAIRY,
+    "cheese": DAIRY,
+    "yogurt": DAIRY,
+    "whey": DAIRY,
+    "egg": EGG,
+    "gluten": GLUTEN,
+    "wheat": GLUTEN,
+    "celiac": GLUTEN,
+    "coeliac": GLUTEN,
+    "soy": SOY,
+    "soya": SOY,
+    "tofu": SOY,
+    "sesame": SESAME,
+    "tahini": SESAME,
+    "coconut": COCONUT,
+}
+
+# Words in an allergy description that are not foods.
+_ALLERGY_STOPWORDS = frozenset(
+    """
+    a allergic allergies allergy an and avoid can cannot eat free i intolerance
+    intolerant known mild minor my n na nil no none not or other reported
+    sensitive sensitivity severe slight some to very with
+    """.split()
+)
+
+
+# "non-dairy" means dairy-free, but "non-vegetarian" or "non veg" means
+# the opposite of the diet: no restriction at all.
+_FREE_FROM_RULES = frozenset({"gluten", "celiac", "coeliac", "dairy", "lactose"})
+
+
+def _keyword_re(keywords, prefix: str = "") -> re.Pattern:
+    alternation = "|".join(sorted(map(re.escape, keywords), key=len, reverse=True))
+    return re.compile(rf"\b{prefix}({alternation})(?:s|es)?\b")
+
+
+_DIET_RE = _keyword_re(_DIET_RULES, prefix=r"(?P<negated>non[- ]?)?")
+_ALLERGEN_RE = _keyword_re(_ALLERGENS)
+_WORD_RE = re.compile(r"[a-z]+")
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_meal_filter(dietary_preference: Optional[str], allergies: Optional[str]) -> MealFilter:
+    """Turn free-text preference and allergy fields into a :class:`MealFilter`."""
+    exclude = 0
+    max_carbs = None
+    no_meat_with_dairy = False
+    for match in _DIET_RE.finditer((dietary_preference or "").lower()):
+        if match.group("negated") and match.group(2) not in _FREE_FROM_RULES:
+            continue
+        mask, carbs, kosher = _DIET_RULES[match.group(2)]
+        exclude |= mask
+        if carbs is not None:
+            max_carbs = carbs if max_carbs is None else min(max_carbs, carbs)
+        no_meat_with_dairy |= kosher
+
+    text = (allergies or "").lower()
+    for match in _ALLERGEN_RE.finditer(text):
+        exclude |= _ALLERGENS[match.group(1)]
+    leftover = _ALLERGEN_RE.sub(" ", text)
+    terms = tuple(
+        dict.fromkeys(
+            word for word in _WORD_RE.findall(leftover) if len(word) > 2 and word not in _ALLERGY_STOPWORDS
+        )
+    )
+    return MealFilter(exclude, max_carbs, no_meat_with_dairy, terms)
+
+
+# ------------------------------------------------------------------
+# Catalogue
+# ------------------------------------------------------------------
+class MealCatalog:
+    """Column arrays for every generated meal, one row per meal."""
+
+    def __init__(self, families: Sequence[_Family] = _FAMILIES) -> None:
+        self.families = tuple(families)
+        width = max(len(f.tables) for f in self.families)
+        family_ids, components, macros, contains, slots = [], [], [], [], []
+        for family_id, family in enumerate(self.families):
+            sizes = [len(table) for table in family.tables]
+            # Every combination of one row per table, as index columns.
+            grid = np.indices(sizes).reshape(len(sizes), -1)
+            count = grid.shape[1]
+            padded = np.full((width, count), -1, dtype=np.int16)
+            padded[: len(sizes)] = grid
+            components.append(padded)
+
+            family_macros = np.zeros((4, count))
+            family_contains = np.zeros(count, dtype=np.uint32)
+            for column, table in zip(grid, family.tables):
+                values = np.array([row[1:5] for row in table], dtype=float)
+                family_macros += values[column].T
+                family_contains |= np.array([row[5] for row in table], dtype=np.uint32)[column]
+            macros.append(family_macros)
+            contains.append(family_contains)
+            family_ids.append(np.full(count, family_id, dtype=np.int16))
+            slots.append(np.full(count, family.slots, dtype=np.uint8))
+
+        self.family = np.concatenate(family_ids)
+        self.components = np.concatenate(components, axis=1)
+        self.kcal, self.protein, self.carbs, self.fat = np.concatenate(macros, axis=1)
+        self.contains = np.concatenate(contains)
+        self.slots = np.concatenate(slots)
+        # Row numbers per meal slot, so ranking only touches that slot's meals.
+        self.slot_rows = {
+            bit: np.flatnonzero(self.slots & bit)
+            for bit, *_ in (*_SLOTS, _POST_WORKOUT_SLOT)
+        }
+
+    def __len__(self) -> int:
+        return len(self.family)
+
+    def name(self, index: int) -> str:
+        family = self.families[self.family[index]]
+        parts = [table[c][0] for table, c in zip(family.tables, self.components[:, index])]
+        text = family.template.format(*parts)
+        return text[0].upper() + text[1:]
+
+    @functools.lru_cache(maxsize=1024)
+    def eligible(self, meal_filter: MealFilter) -> np.ndarray:
+        """Boolean mask of meals allowed by ``meal_filter`` (cached, read-only)."""
+        mask = (self.contains & np.uint32(meal_filter.exclude)) == 0
+        if meal_filter.max_carbs is not None:
+            mask &= self.carbs <= meal_filter.max_carbs
+        if meal_filter.no_meat_with_dairy:
+            mask &= ~(((self.contains & (MEAT | POULTRY)) != 0) & ((self.contains & DAIRY) != 0))
+        for term in meal_filter.name_terms:
+            mask &= ~self._name_matches(term)
+        mask.flags.writeable = False
+        return mask
+
+    def unmatched_terms(self, meal_filter: MealFilter) -> List[str]:
+        """Allergy words that no catalogue ingredient name contains."""
+        return [term for term in meal_filter.name_terms if not self._name_matches(term).any()]
+
+    def _name_matches(self, term: str) -> np.ndarray:
+        hits = np.zeros(len(self), dtype=bool)
+        for family_id, family in enumerate(self.families):
+            rows = self.family == family_id
+            for column, table in enumerate(family.tables):
+                flagged = np.array([term in row[0].lower() for row in table])
+                if flagged.any():
+                    hits[rows] |= flagged[self.components[column, rows]]
+        return hits
+
+
+_catalog: Optional[MealCatalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog() -> MealCatalog:
+    """Build the catalogue on first use and return the shared instance."""
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = MealCatalog()
+    return _catalog
+
+
+def suggest_meals(
+    calories: int,
+    meal_filter: MealFilter,
+    high_protein: bool = False,
+    post_workout: bool = False,
+    alternatives: int = 2,
+) -> List[Dict[str, object]]:
+    """Pick one meal per slot (plus alternatives) that fits the filter.
+
+    Meals are ranked by how close they are to the slot's share of
+    ``calories``, with a bonus per gram of protein (larger when
+    ``high_protein``). Slots with no eligible meal are reported as such
+    instead of being filled with something unsafe.
+    """
+    catalog = get_catalog()
+    eligible = catalog.eligible(meal_filter)
+    protein_weight = 8.0 if high_protein else 3.0
+    slots = list(_SLOTS)
+    if post_workout:
+        slots.append(_POST_WORKOUT_SLOT)
+    scale = 1.0 / sum(share for _, _, share, _ in slots)
+
+    suggestions = []
+    offered = np.zeros(len(catalog), dtype=bool)
+    for bit, label, share, focus in slots:
+        rows = catalog.slot_rows[bit]
+        allowed = eligible[rows]
+        # Prefer meals not already offered for an earlier slot (lunch vs
+        # dinner), but repeat one rather than leave the slot empty.
+        fresh = allowed & ~offered[rows]
+        candidates = rows[fresh if fresh.any() else allowed]
+        if not len(candidates):
+            suggestions.append(
+                {
+                    "meal": label,
+                    "idea": "No catalogue meal fits these restrictions; build this meal from safe staples.",
+                    "focus": focus,
+                }
+            )
+            continue
+        target = calories * share * scale
+        score = np.abs(catalog.kcal[candidates] - target) - protein_weight * catalog.protein[candidates]
+        top = min(1 + alternatives, len(candidates))
+        picked = np.argpartition(score, top - 1)[:top]
+        ranked = candidates[picked[np.lexsort((picked, score[picked]))]]
+        offered[ranked] = True
+        best = int(ranked[0])
+        suggestions.append(
+            {
+                "meal": label,
+                "idea": catalog.name(best),
+                "focus": focus,
+                "calories": int(catalog.kcal[best]),
+                "protein_g": int(catalog.protein[best]),
+                "carbs_g": int(catalog.carbs[best]),
+                "fat_g": int(catalog.fat[best]),
+                "alternatives": [catalog.name(int(i)) for i in ranked[1:]],
+            }
+        )
+    return suggestions
+
@@ -0,0 +1,98 @@
+"""
+Benchmark for the meal catalogue.
+Reports how long the catalogue takes to build, how long one filter's
+eligible mask takes uncached and cached, and the per-plan cost of
+suggest_meals for a spread of dietary preferences and allergies. It also
+counts suggestions containing an excluded tag, which must be zero.
+
+Run from the wellness/ directory:
+    python -m nutrition_agent.meal_catalog_bench            # 20k plans
+    python -m nutrition_agent.meal_catalog_bench 5000
+"""
+
+import itertools
+import random
+import sys
+import time
+from typing import Any, Dict, List
+
+from .meal_catalog import MealCatalog, MealFilter, get_catalog, parse_meal_filter, suggest_meals
+
+PREFERENCES = [None, "vegan", "vegetarian", "halal", "keto", "gluten-free", "kosher", "pescatarian"]
+ALLERGIES = [None, "nuts", "dairy", "egg", "fish", "shellfish", "sesame", "soy", "gluten", "coconut", "peanut"]
+
+
+def filters() -> List[MealFilter]:
+    """One MealFilter per preference/allergy combination."""
+    return [parse_meal_filter(pref, allergy) for pref, allergy in itertools.product(PREFERENCES, ALLERGIES)]
+
+
+def rows_by_name(catalog: MealCatalog) -> Dict[str, List[int]]:
+    """Catalogue rows for every meal name."""
+    rows: Dict[str, List[int]] = {}
+    for i in range(len(catalog)):
+        rows.setdefault(catalog.name(i), []).append(i)
+    return rows
+
+
+def violations(
+    catalog: MealCatalog,
+    rows: Dict[str, List[int]],
+    meal_filter: MealFilter,
+    suggestions: List[Dict[str, Any]],
+) -> int:
+    """Suggested meals (best and alternatives) containing an excluded tag."""
+    count = 0
+    for suggestion in suggestions:
+        if "calories" not in suggestion:
+            continue
+        for name in [suggestion["idea"], *suggestion["alternatives"]]:
+            count += any(int(catalog.contains[i]) & meal_filter.exclude for i in rows[name])
+    return count
+
+
+def run(plans: int) -> Dict[str, Any]:
+    start = time.perf_counter()
+    catalog = MealCatalog()
+    build_seconds = time.perf_counter() - start
+
+    meal_filter = parse_meal_filter("vegetarian", "nuts, strawberries")
+    start = time.perf_counter()
+    MealCatalog.eligible.__wrapped__(catalog, meal_filter)
+    mask_seconds = time.perf_counter() - start
+    catalog.eligible(meal_filter)
+    start = time.perf_counter()
+    catalog.eligible(meal_filter)
+    cached_mask_seconds = time.perf_counter() - start
+
+    rng = random.Random(14)
+    cases = filters()
+    requests = [(rng.randint(1400, 3200), rng.choice(cases), rng.random() < 0.5) for _ in range(plans)]
+    for meal_filter in cases:
+        get_catalog().eligible(meal_filter)
+    start = time.perf_counter()
+    for calories, meal_filter, post_workout in requests:
+        suggest_meals(calories, meal_filter, post_workout=post_workout)
+    suggest_seconds = time.perf_counter() - start
+
+    shared = get_catalog()
+    rows = rows_by_name(shared)
+    bad = sum(
+        violations(shared, rows, meal_filter, suggest_meals(calories, meal_filter, post_workout=True))
+        for calories, meal_filter in zip(range(1400, 3200, 20), cases)
+    )
+    return {
+        "meals": len(catalog),
+        "build_ms": round(build_seconds * 1e3, 1),
+        "eligible_mask_us": round(mask_seconds * 1e6, 1),
+        "eligible_cached_us": round(cached_mask_seconds * 1e6, 2),
+        "plans": plans,
+        "suggest_us": round(suggest_seconds / plans * 1e6, 1),
+        "violations": bad,
+    }
+
+
+if __name__ == "__main__":
+    report = run(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
+    for key, value in report.items():
+        print(f"{key}: {value}")
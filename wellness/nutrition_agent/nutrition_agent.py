@@ -4,6 +4,7 @@ import textwrap
 
 from google.adk.agents import Agent
 from google.adk.models.google_llm import Gemini
+from utils.token_budget import enforce_token_budget
 from utils.utils import get_retry_config
 
 from .nutrition_tools import generate_nutrition_plan
@@ -43,7 +44,7 @@ NUTRITION_AGENT_INSTRUCTION = textwrap.dedent(
    5. Present the plan in a clear, structured format:
    - Brief restatement of the user’s goal in their own words.
    - Daily calorie and macro targets, with a short explanation.
-   - Example meals for a full day (or several options), including timing guidance.
+   - Example meals for a full day (or several options), including timing guidance. Use the tool's `meal_suggestions`: they are already filtered for the user's dietary preference and allergies, so present them (and their alternatives) rather than inventing new meals. If a tip says an allergy could not be screened, pass that warning on.
    - Hydration and basic lifestyle tips tailored to their situation.
    - Any important modifications or alternatives based on dietary preferences and cultural context.
 
@@ -72,4 +73,5 @@ nutrition_agent = Agent(
     description="Evidence-based nutrition planner that personalizes macros, calories, and meals based on demographics.",
     instruction=NUTRITION_AGENT_INSTRUCTION,
     tools=[generate_nutrition_plan],
+    before_model_callback=enforce_token_budget,
 )
\ No newline at end of file
@@ -0,0 +1,152 @@
+"""Columnar batch version of the nutrition calculations.
+
+``compute_nutrition_targets`` takes one array per demographic field and
+computes BMR, calorie targets, macros and BMI for every user with NumPy
+array operations. String columns (gender, goal, activity level) are reduced
+to their distinct values, classified once each with the same helpers the
+scalar tools use, and broadcast back, so the batch path cannot drift from
+``generate_nutrition_plan``.
+
+Results are identical to the scalar functions: arithmetic is done in the
+same float64 order, ``np.rint`` matches Python's round-half-to-even
+``round``, and BMI values near a rounding tie fall back to ``round`` because
+``np.round(x, 1)`` is not correctly rounded for every input.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterator, Optional, Sequence, Union
+
+import numpy as np
+
+from .nutrition_tools import (
+    _BMI_CATEGORIES,
+    _activity_multiplier,
+    _fat_ratio,
+    _gender_offset,
+    _goal_calorie_adjustment,
+    _protein_factor,
+)
+
+Column = Union[Sequence, np.ndarray]
+
+
+class _Categorical:
+    """A string column reduced to its distinct values plus one code per row."""
+
+    def __init__(self, values: Column, size: int) -> None:
+        if isinstance(values, str) or values is None:
+            self.distinct = [values]
+            self.codes = np.zeros(size, dtype=np.intp)
+            return
+        column = np.asarray(values, dtype=object)
+        if column.shape != (size,):
+            raise ValueError(f"Expected {size} values, got shape {column.shape}.")
+        distinct: Dict[Optional[str], int] = {}
+        self.codes = np.fromiter(
+            (distinct.setdefault(v, len(distinct)) for v in column), dtype=np.intp, count=size
+        )
+        self.distinct = list(distinct)
+
+    def map(self, classify) -> np.ndarray:
+        """Apply ``classify`` once per distinct value and broadcast the results."""
+        return np.array([classify(v) for v in self.distinct], dtype=float)[self.codes]
+
+
+def _round_tenths(values: np.ndarray) -> np.ndarray:
+    """Vectorised ``round(x, 1)`` that agrees with Python for every input."""
+    scaled = values * 10
+    rounded = np.rint(scaled) / 10
+    # rint(x * 10) can only pick a different integer than Python's correctly
+    # rounded decimal arithmetic when x * 10 lands next to a .5 tie.
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    for i in np.flatnonzero(near_tie).tolist():
+        rounded[i] = round(float(values[i]), 1)
+    return rounded
+
+
+def compute_nutrition_targets(
+    age: Column,
+    gender: Column,
+    weight: Column,
+    height: Column,
+    goal: Column,
+    activity_level: Column = "moderate",
+) -> Dict[str, np.ndarray]:
+    """
+    Compute nutrition targets for many users at once.
+
+    Every argument is a column with one value per user; ``gender``, ``goal``
+    and ``activity_level`` may also be a single string shared by all users.
+
+    Returns:
+        Dictionary of equally sized arrays: ``bmr``, ``calorie_target``,
+        ``protein_grams``, ``carbs_grams``, ``fat_grams``, ``bmi`` and
+        ``bmi_category``.
+    """
+    age = np.asarray(age, dtype=float)
+    weight = np.asarray(weight, dtype=float)
+    height = np.asarray(height, dtype=float)
+    if not age.shape == weight.shape == height.shape or age.ndim != 1:
+        raise ValueError("age, weight and height must be 1-D arrays of the same length.")
+    size = age.shape[0]
+    if size and min(age.min(), weight.min(), height.min()) <= 0:
+        raise ValueError("Age, weight, and height must be positive values.")
+
+    goals = _Categorical(goal, size)
+
+    bmr = 10 * weight + 6.25 * height - 5 * age
+    bmr += _Categorical(gender, size).map(_gender_offset)
+
+    maintenance = bmr * _Categorical(activity_level, size).map(_activity_multiplier)
+    maintenance += goals.map(_goal_calorie_adjustment)
+    calories = np.maximum(np.rint(maintenance), 1200).astype(np.int64)
+
+    protein_grams = np.rint(goals.map(_protein_factor) * weight).astype(np.int64)
+    fat_cal = calories * goals.map(_fat_ratio)
+    fat_grams = np.rint(fat_cal / 9).astype(np.int64)
+    carb_cal = np.maximum(calories - protein_grams * 4 - fat_cal, calories * 0.35)
+    carb_grams = np.rint(carb_cal / 4).astype(np.int64)
+
+    height_m = height / 100
+    bmi = weight / (height_m ** 2)
+    limits = np.array([limit for limit, _ in _BMI_CATEGORIES])
+    names = np.array([name for _, name in _BMI_CATEGORIES] + ["obese"])
+    bmi_category = names[np.searchsorted(limits, bmi, side="right")]
+
+    return {
+        "bmr": bmr,
+        "calorie_target": calories,
+        "protein_grams": protein_grams,
+        "carbs_grams": carb_grams,
+        "fat_grams": fat_grams,
+        "bmi": _round_tenths(bmi),
+        "bmi_category": bmi_category,
+    }
+
+
+def iter_target_records(targets: Dict[str, np.ndarray]) -> Iterator[Dict[str, object]]:
+    """
+    Yield one dictionary per user shaped like the scalar plan fields.
+
+    Each record has ``calorie_target``, ``macros`` (as returned by
+    ``_macro_breakdown``) and ``bmi`` (as returned by ``_bmi``).
+    """
+    columns = zip(
+        targets["calorie_target"].tolist(),
+        targets["protein_grams"].tolist(),
+        targets["carbs_grams"].tolist(),
+        targets["fat_grams"].tolist(),
+        targets["bmi"].tolist(),
+        targets["bmi_category"].tolist(),
+    )
+    for calories, protein, carbs, fat, bmi, category in columns:
+        yield {
+            "calorie_target": calories,
+            "macros": {
+                "protein": {"grams": protein, "calories": protein * 4},
+                "carbs": {"grams": carbs, "calories": carbs * 4},
+                "fat": {"grams": fat, "calories": fat * 9},
+            },
+            "bmi": {"value": bmi, "category": category},
+        }
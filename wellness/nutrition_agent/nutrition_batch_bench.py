@@ -0,0 +1,99 @@
+"""
+Throughput benchmark: scalar nutrition functions vs the batch API.
+Randomized columns cover every gender, goal and activity-level keyword
+(including case variants and unknown values). The scalar path calls
+_mifflin_st_jeor_bmr, _calorie_target, _macro_breakdown and _bmi per user;
+the batch path is one compute_nutrition_targets call, timed apart from
+turning its columns back into records. Mismatching users are counted.
+
+Run from the wellness/ directory:
+    python -m nutrition_agent.nutrition_batch_bench            # 200k users
+    python -m nutrition_agent.nutrition_batch_bench 1000000
+"""
+
+import random
+import sys
+import time
+from typing import Any, Dict, List
+
+from . import nutrition_tools
+from .nutrition_batch import compute_nutrition_targets, iter_target_records
+
+GENDERS = ["male", "Female", "non-binary", None, "M", "f", "other"]
+GOALS = [
+    "lose fat", "Build Muscle", "wellness", "cut", "gain strength",
+    "bulk", "maintain", "deficit", "lose weight and gain muscle",
+]
+ACTIVITY_LEVELS = ["sedentary", "light", "moderate", "active", "very active", "Unknown", "VERY ACTIVE"]
+
+
+def random_columns(size: int, seed: int = 1) -> Dict[str, List[Any]]:
+    """Columns for ``size`` random users, with integer and fractional weights and heights."""
+    rng = random.Random(seed)
+    return {
+        "age": [rng.randint(14, 90) for _ in range(size)],
+        "gender": [rng.choice(GENDERS) for _ in range(size)],
+        "weight": [round(rng.uniform(35, 180), rng.choice([0, 1, 2])) for _ in range(size)],
+        "height": [rng.choice([rng.randint(140, 210), round(rng.uniform(140, 210), 1)]) for _ in range(size)],
+        "goal": [rng.choice(GOALS) for _ in range(size)],
+        "activity_level": [rng.choice(ACTIVITY_LEVELS) for _ in range(size)],
+    }
+
+
+def scalar_targets(columns: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """The scalar path, one user at a time, shaped like iter_target_records plus ``bmr``."""
+    records = []
+    for age, gender, weight, height, goal, activity in zip(
+        columns["age"], columns["gender"], columns["weight"],
+        columns["height"], columns["goal"], columns["activity_level"],
+    ):
+        bmr = nutrition_tools._mifflin_st_jeor_bmr(age, gender, weight, height)
+        calories = nutrition_tools._calorie_target(bmr, goal, activity)
+        records.append(
+            {
+                "bmr": bmr,
+                "calorie_target": calories,
+                "macros": nutrition_tools._macro_breakdown(calories, weight, goal),
+                "bmi": nutrition_tools._bmi(height, weight),
+            }
+        )
+    return records
+
+
+def batch_records(targets: Dict[str, Any]) -> List[Dict[str, Any]]:
+    records = list(iter_target_records(targets))
+    for record, bmr in zip(records, targets["bmr"].tolist()):
+        record["bmr"] = bmr
+    return records
+
+
+def run(size: int) -> Dict[str, Any]:
+    """Time both paths on ``size`` users.
+
+    ``batch_s`` is the array computation alone; ``records_s`` is the extra
+    cost of turning its columns back into per-user dictionaries.
+    """
+    columns = random_columns(size)
+    start = time.perf_counter()
+    scalar = scalar_targets(columns)
+    scalar_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    targets = compute_nutrition_targets(**columns)
+    batch_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    batch = batch_records(targets)
+    records_seconds = time.perf_counter() - start
+    return {
+        "users": size,
+        "mismatches": sum(a != b for a, b in zip(scalar, batch)),
+        "scalar_s": round(scalar_seconds, 3),
+        "batch_s": round(batch_seconds, 3),
+        "records_s": round(records_seconds, 3),
+        "speedup": round(scalar_seconds / batch_seconds, 1),
+    }
+
+
+if __name__ == "__main__":
+    report = run(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
+    for key, value in report.items():
+        print(f"{key}: {value}")
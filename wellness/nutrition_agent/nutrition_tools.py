@@ -2,7 +2,12 @@
 
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.goal_classifier import classify_goal
+from utils.plan_cache import memoize_plan, quantize
+
+from .meal_catalog import get_catalog, parse_meal_filter, suggest_meals
 
 
 _ACTIVITY_MULTIPLIERS = {
@@ -13,44 +18,69 @@ _ACTIVITY_MULTIPLIERS = {
     "very active": 1.9,
 }
 
+# Upper bounds (exclusive) of each BMI category; anything above is "obese".
+_BMI_CATEGORIES = ((18.5, "underweight"), (25, "normal"), (30, "overweight"))
 
-def _mifflin_st_jeor_bmr(age: int, gender: str, weight: float, height: float) -> float:
-    """Calculate resting metabolic rate using the Mifflin-St Jeor equation."""
+# Plan cache granularity: users within half a kilo / one centimetre share a
+# cached plan's calorie and macro targets. Set to None to cache on exact
+# values only.
+PLAN_CACHE_WEIGHT_STEP: Optional[float] = 0.5
+PLAN_CACHE_HEIGHT_STEP: Optional[float] = 1.0
+
+
+def _gender_offset(gender: Optional[str]) -> int:
     gender = (gender or "unspecified").lower()
-    base = 10 * weight + 6.25 * height - 5 * age
     if gender.startswith("m"):
-        return base + 5
+        return 5
     if gender.startswith("f"):
-        return base - 161
-    return base - 78  # neutral offset for non-binary/unspecified
+        return -161
+    return -78  # neutral offset for non-binary/unspecified
 
 
-def _calorie_target(bmr: float, goal: str, activity_level: str) -> int:
-    activity = _ACTIVITY_MULTIPLIERS.get(activity_level.lower(), _ACTIVITY_MULTIPLIERS["moderate"])
-    maintenance = bmr * activity
+def _activity_multiplier(activity_level: str) -> float:
+    return _ACTIVITY_MULTIPLIERS.get(activity_level.lower(), _ACTIVITY_MULTIPLIERS["moderate"])
+
 
-    goal = (goal or "wellness").lower()
-    if any(keyword in goal for keyword in ("lose", "cut", "deficit", "fat")):
-        maintenance -= 400
-    elif any(keyword in goal for keyword in ("gain", "muscle", "bulk")):
-        maintenance += 250
+def _goal_calorie_adjustment(goal: Optional[str]) -> int:
+    profile = classify_goal(goal)
+    if profile.weight_loss:
+        return -400
+    if profile.muscle_gain:
+        return 250
+    return 0
+
+
+def _protein_factor(goal: Optional[str]) -> float:
+    profile = classify_goal(goal)
+    if profile.muscle_gain:
+        return 1.9
+    if profile.weight_loss:
+        return 1.7
+    return 1.6
+
+
+def _fat_ratio(goal: Optional[str]) -> float:
+    return 0.25 if classify_goal(goal).weight_loss else 0.3
+
+
+def _mifflin_st_jeor_bmr(age: int, gender: str, weight: float, height: float) -> float:
+    """Calculate resting metabolic rate using the Mifflin-St Jeor equation."""
+    base = 10 * weight + 6.25 * height - 5 * age
+    return base + _gender_offset(gender)
+
+
+def _calorie_target(bmr: float, goal: str, activity_level: str) -> int:
+    maintenance = bmr * _activity_multiplier(activity_level)
+    maintenance += _goal_calorie_adjustment(goal)
 
     return max(int(round(maintenance)), 1200)
 
 
 def _macro_breakdown(calories: int, weight: float, goal: str) -> Dict[str, Dict[str, int]]:
-    goal = goal.lower()
-    protein_factor = 1.6
-    if any(k in goal for k in ("gain", "muscle", "strength")):
-        protein_factor = 1.9
-    elif any(k in goal for k in ("lose", "fat", "cut")):
-        protein_factor = 1.7
-
-    protein_grams = int(round(protein_factor * weight))
+    protein_grams = int(round(_protein_factor(goal) * weight))
     protein_cal = protein_grams * 4
 
-    fat_ratio = 0.25 if "lose" in goal else 0.3
-    fat_cal = calories * fat_ratio
+    fat_cal = calories * _fat_ratio(goal)
     fat_grams = int(round(fat_cal / 9))
 
     carb_cal = max(calories - protein_cal - fat_cal, calories * 0.35)
@@ -66,67 +96,77 @@ def _macro_breakdown(calories: int, weight: float, goal: str) -> Dict[str, Dict[
 def _bmi(height_cm: float, weight: float) -> Dict[str, float | str]:
     height_m = height_cm / 100
     bmi = weight / (height_m ** 2)
-    if bmi < 18.5:
-        category = "underweight"
-    elif bmi < 25:
-        category = "normal"
-    elif bmi < 30:
-        category = "overweight"
-    else:
-        category = "obese"
+    category = next((name for limit, name in _BMI_CATEGORIES if bmi < limit), "obese")
     return {"value": round(bmi, 1), "category": category}
 
 
-def _meal_suggestions(goal: str, dietary_preference: Optional[str]) -> List[Dict[str, str]]:
-    preference = (dietary_preference or "balanced").lower()
-    plant_forward = "veg" in preference or "plant" in preference
-
-    meals = [
-        {
-            "meal": "Breakfast",
-            "idea": "Overnight oats with chia, berries, and "+
-            ("soy yogurt" if plant_forward else "Greek yogurt"),
-            "focus": "Slow-release carbs + protein to stabilize morning energy.",
-        },
-        {
-            "meal": "Lunch",
-            "idea": (
-                "Quinoa bowl with roasted vegetables, chickpeas, and tahini"
-                if plant_forward
-                else "Grilled salmon, quinoa, mixed greens, olive oil vinaigrette"
-            ),
-            "focus": "High protein + colorful vegetables for micronutrients.",
-        },
-        {
-            "meal": "Snack",
-            "idea": "Apple slices with almond butter"
-            if plant_forward
-            else "Greek yogurt parfait with nuts and seeds",
-            "focus": "Keeps blood sugar steady between meals.",
-        },
-        {
-            "meal": "Dinner",
-            "idea": (
-                "Lentil curry with brown rice and steamed greens"
-                if plant_forward
-                else "Lean turkey stir-fry with brown rice and mixed veggies"
-            ),
-            "focus": "Fiber-rich carbs for recovery and satiety.",
-        },
-    ]
-
-    if any(k in goal.lower() for k in ("muscle", "gain")):
-        meals.append(
-            {
-                "meal": "Post-workout",
-                "idea": "Protein smoothie with banana, spinach, and flax seeds",
-                "focus": "Protein + carbs within 60 minutes of training.",
-            }
-        )
-
-    return meals
+def _wants_post_workout_meal(goal: Optional[str]) -> bool:
+    return classify_goal(goal).muscle_gain
 
 
+def _meal_suggestions(
+    goal: str,
+    dietary_preference: Optional[str],
+    allergies: Optional[str] = None,
+    calories: int = 2000,
+) -> List[Dict[str, object]]:
+    return suggest_meals(
+        calories=calories,
+        meal_filter=parse_meal_filter(dietary_preference, allergies),
+        high_protein=classify_goal(goal).muscle_gain,
+        post_workout=_wants_post_workout_meal(goal),
+    )
+
+
+def _plan_cache_key(args: Dict[str, Any]) -> Tuple[Tuple, Dict[str, Any]]:
+    """Key plans on what they depend on rather than on the raw free text.
+
+    Weight and height are quantized, but the BMI category of the exact values
+    is part of the key: it decides a tip, so it must never come from a
+    neighbouring user's plan. Plans are built from the caller's real values.
+    """
+    goal = args["goal"]
+    preference = args["dietary_preference"]
+    weight, height = args["weight"], args["height"]
+    # Invalid measurements have no category; the tool itself rejects them.
+    bmi_category = _bmi(height_cm=height, weight=weight)["category"] if min(weight, height) > 0 else None
+    key = (
+        args["age"],
+        args["gender"],
+        quantize(weight, PLAN_CACHE_WEIGHT_STEP),
+        quantize(height, PLAN_CACHE_HEIGHT_STEP),
+        bmi_category,
+        classify_goal(goal),
+        parse_meal_filter(preference, args["allergies"]),
+        bool(preference),
+        _activity_multiplier(args["activity_level"]),
+    )
+    return key, args
+
+
+def _hydration(weight: float) -> str:
+    return "Aim for {:.1f} L/day".format(max(round(weight * 0.035, 1), 2.0))
+
+
+def _restore_plan_text(plan: Dict[str, object], args: Dict[str, Any]) -> None:
+    """Echo the caller's own measurements, goal, preference and allergy text."""
+    plan["profile_summary"].update(
+        weight_kg=args["weight"],
+        height_cm=args["height"],
+        bmi=_bmi(height_cm=args["height"], weight=args["weight"]),
+    )
+    plan["hydration"] = _hydration(args["weight"])
+    plan["goal"] = args["goal"]
+    plan["allergy_notes"] = args["allergies"] or "None reported"
+    if args["dietary_preference"]:
+        plan["notes"] = _preference_note(args["dietary_preference"])
+
+
+def _preference_note(dietary_preference: str) -> str:
+    return f"Plan biased toward {dietary_preference} choices."
+
+
+@memoize_plan(_plan_cache_key, _restore_plan_text)
 def generate_nutrition_plan(
     age: int,
     gender: str,
@@ -158,8 +198,13 @@ def generate_nutrition_plan(
         "goal": goal,
         "calorie_target": calories,
         "macros": macros,
-        "meal_suggestions": _meal_suggestions(goal=goal, dietary_preference=dietary_preference),
-        "hydration": "Aim for {:.1f} L/day".format(max(round(weight * 0.035, 1), 2.0)),
+        "meal_suggestions": _meal_suggestions(
+            goal=goal,
+            dietary_preference=dietary_preference,
+            allergies=allergies,
+            calories=calories,
+        ),
+        "hydration": _hydration(weight),
         "allergy_notes": allergies or "None reported",
         "tips": [
             "Distribute protein evenly across meals to maximize muscle protein synthesis.",
@@ -173,7 +218,15 @@ def generate_nutrition_plan(
             "Work with a registered dietitian if your BMI is outside the moderate range for extended periods."
         )
 
+    unmatched = get_catalog().unmatched_terms(parse_meal_filter(dietary_preference, allergies))
+    if unmatched:
+        plan["tips"].append(
+            "Check ingredient labels for {}: the meal suggestions could not be screened for it.".format(
+                ", ".join(unmatched)
+            )
+        )
+
     if dietary_preference:
-        plan["notes"] = f"Plan biased toward {dietary_preference} choices."
+        plan["notes"] = _preference_note(dietary_preference)
 
     return plan
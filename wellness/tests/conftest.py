@@ -0,0 +1,16 @@
+"""Shared pytest setup.
+
+The app imports its packages from the wellness/ directory (``from memory...``,
+``from utils...``), so that directory goes on sys.path. The stores' module-level
+singletons keep their files under ``data/`` relative to the working directory;
+the suite runs from a scratch directory so it never touches the real data.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+WELLNESS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(WELLNESS_DIR))
+os.chdir(tempfile.mkdtemp(prefix="wellness-tests-"))
@@ -0,0 +1,105 @@
+"""CachedAgentTool never reads or writes the cache when a request carries a risk phrase."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from google.adk.agents import Agent
+from google.adk.runners import InMemoryRunner
+from google.adk.tools import AgentTool
+from google.genai import types
+
+from chief_wellness_officer import cached_agent_tool
+from chief_wellness_officer.cached_agent_tool import CachedAgentTool
+from chief_wellness_officer.cwo_agent import _no_distress, exercise_tool, mindfulness_tool, nutrition_tool
+from chief_wellness_officer.fast_path_bench import StubLlm
+from mindfullness_agent import mindfulness_agent as module
+from mindfullness_agent.mindfulness_agent import CRISIS_RUNS_KEY
+from mindfullness_agent.prescreen import CRISIS
+from mindfullness_agent.prescreen_eval import HELD_OUT_SET
+
+CONTEXT = SimpleNamespace(user_id="cache_test_user", state={})
+
+
+@pytest.fixture
+def specialist_calls(monkeypatch):
+    calls = []
+
+    async def run_async(self, *, args, tool_context):
+        calls.append(args["request"])
+        return f"answer {len(calls)}"
+
+    monkeypatch.setattr(AgentTool, "run_async", run_async)
+    mindfulness_tool.cache_clear()
+    yield calls
+    mindfulness_tool.cache_clear()
+
+
+def _ask(request):
+    return asyncio.run(mindfulness_tool.run_async(args={"request": request}, tool_context=CONTEXT))
+
+
+def test_plain_requests_are_served_from_the_cache(specialist_calls):
+    assert _ask("What is mindfulness?") == "answer 1"
+    assert _ask("what is mindfulness") == "answer 1"
+    assert len(specialist_calls) == 1
+
+
+def test_risk_phrase_is_never_served_from_or_written_to_the_cache(specialist_calls):
+    _ask("Guide me through a breathing exercise")
+    # Same leading request, risk phrase later on: the cached answer is not reused.
+    assert _ask("Guide me through a breathing exercise, I am going to end it tonight") == "answer 2"
+    assert _ask("Guide me through a breathing exercise, I am going to end it tonight") == "answer 3"
+    assert mindfulness_tool.cache_stats()["size"] == 1
+
+
+@pytest.mark.parametrize("tool", [exercise_tool, mindfulness_tool, nutrition_tool], ids=lambda t: t.name)
+def test_no_held_out_risk_message_gets_a_cache_key(tool):
+    for text, expected in HELD_OUT_SET:
+        if expected in (CRISIS, None):
+            assert tool._cache_key({"request": text}, CONTEXT) is None, text
+
+
+def _stub_mindfulness():
+    """The mindfulness router with every model replaced by a stub."""
+    crisis = module.crisis_agent.clone(update={"model": StubLlm(model="stub", latency=0)})
+    coach = module.coach_agent.clone(update={"model": StubLlm(model="stub", latency=0)})
+    educator = module.educator_agent.clone(update={"model": StubLlm(model="stub", latency=0)})
+    orchestrator = module.mindfulness_orchestrator.clone(
+        update={
+            # The orchestrator recognises a crisis the lexicon missed.
+            "model": StubLlm(model="stub", latency=0, tool="crisis_specialist", args={"request": "crisis"}),
+            "tools": [AgentTool(agent=crisis)],
+        }
+    )
+    router = module.MindfulnessRouter(
+        name="mindfulness_specialist", orchestrator=orchestrator, specialists=[crisis, coach, educator]
+    )
+    return router, crisis
+
+
+def test_answer_from_the_crisis_specialist_is_never_cached(monkeypatch):
+    # Keep the stub tool out of the CWO's cache statistics.
+    monkeypatch.setattr(cached_agent_tool, "_registry", {})
+    request = "I keep thinking about the bridge near my house"
+    router, crisis = _stub_mindfulness()
+    tool = CachedAgentTool(agent=router, should_cache=_no_distress, veto_state_key=CRISIS_RUNS_KEY)
+    assert tool._cache_key({"request": request}, CONTEXT) is not None  # the lexicon misses it
+    root = Agent(
+        name="chief_wellness_officer",
+        model=StubLlm(model="stub", latency=0, tool="mindfulness_specialist", args={"request": request}),
+        tools=[tool],
+    )
+
+    async def ask_twice():
+        runner = InMemoryRunner(agent=root, app_name="cache_test")
+        for user in ("first_user", "second_user"):
+            session = await runner.session_service.create_session(app_name="cache_test", user_id=user)
+            message = types.Content(role="user", parts=[types.Part(text=request)])
+            async for _event in runner.run_async(user_id=user, session_id=session.id, new_message=message):
+                pass
+
+    asyncio.run(ask_twice())
+    assert crisis.model.calls == 2
+    assert tool.cache_stats()["size"] == 0
+    assert tool.cache_stats()["vetoed"] == 2
@@ -0,0 +1,25 @@
+import json
+
+from memory.binary_store import BinaryMemoryStore, convert_binary_to_json, convert_json_to_binary
+from memory.memory_stores import JsonMemoryStore
+
+
+def test_json_round_trip_through_binary(tmp_path):
+    data = {
+        f"user_{i}": [{"summary": f"note {i}-{k}", "timestamp": "2025-01-01T00:00:00", "metadata": None} for k in range(3)]
+        for i in range(200)
+    }
+    source = tmp_path / "memory.json"
+    source.write_text(json.dumps(data))
+    assert convert_json_to_binary(str(source)) == 200
+
+    store = BinaryMemoryStore(source)
+    try:
+        assert store.read_user("user_42") == JsonMemoryStore(source).read_user("user_42")
+        assert store.read_user("missing") == []
+    finally:
+        store.close()
+
+    target = tmp_path / "back.json"
+    convert_binary_to_json(str(source), str(target))
+    assert json.loads(target.read_text()) == data
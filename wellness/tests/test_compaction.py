@@ -0,0 +1,29 @@
+from datetime import datetime, timedelta
+
+from memory.compaction import LONG_TERM_PREFIX, WEEKLY_PREFIX, TieredCompactor
+from memory.compaction_bench import run
+
+
+def test_prompt_size_stays_under_the_cap():
+    cap = TieredCompactor().max_bytes
+    results = run(checkpoints=(100, 1000))
+    assert all(row["prompt_bytes"] <= cap for row in results)
+    assert results[-1]["entries"] == results[0]["entries"]
+
+
+def test_weekly_clauses_age_into_the_long_term_tier():
+    start = datetime(2025, 1, 1)
+    clock = {"now": start}
+    compactor = TieredCompactor(clock=lambda: clock["now"])
+    entries = []
+    for day in range(1, 41):
+        clock["now"] = start + timedelta(days=day)
+        entries.append({"summary": f"Day {day} note.", "timestamp": clock["now"].isoformat(), "metadata": None})
+        entries = compactor.compact(entries)
+
+    weekly = next(e for e in entries if e["summary"].startswith(WEEKLY_PREFIX))
+    long_term = next(e for e in entries if e["summary"].startswith(LONG_TERM_PREFIX))
+    assert "Day 30 note" in long_term["summary"]
+    assert "Day 30 note" not in weekly["summary"]
+    # Nothing in the weekly roll-up is older than the weekly window.
+    assert datetime.fromisoformat(weekly["timestamp"]) >= clock["now"] - compactor.weekly_window
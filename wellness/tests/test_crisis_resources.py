@@ -0,0 +1,25 @@
+from mindfullness_agent.crisis_resources import CRISIS_RESOURCES, UNKNOWN_COUNTRY, country_name, crisis_resources
+from utils.country_names import COUNTRY_NAMES
+
+
+def test_every_assigned_code_has_a_name():
+    assert len(COUNTRY_NAMES) == 250
+    assert all(len(code) == 2 and code.isupper() for code in COUNTRY_NAMES)
+    assert set(CRISIS_RESOURCES) <= set(COUNTRY_NAMES)
+
+
+def test_country_name_never_returns_a_raw_code():
+    assert country_name("BR") == "Brazil"
+    assert country_name("br") == "Brazil"
+    assert country_name("GB") == "United Kingdom"
+    assert country_name("ZZ") == UNKNOWN_COUNTRY
+    assert country_name(None) is None
+
+
+def test_unverified_country_gets_its_name_and_generic_advice():
+    result = crisis_resources("BR")
+    assert result["country"] == "Brazil"
+    assert result["country_code"] == "BR"
+    assert result["verified"] is False
+    assert result["emergency_number"] is None
+    assert result["crisis_lines"][-1]["contact"] == "https://findahelpline.com"
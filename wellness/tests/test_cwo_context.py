@@ -0,0 +1,79 @@
+"""CWO turn context: profile and memories are injected into every model call of a turn."""
+
+from types import SimpleNamespace
+
+import pytest
+from google.adk.models import LlmRequest
+from google.genai import types
+
+from chief_wellness_officer import cwo_context, cwo_profile_tools
+from chief_wellness_officer.cwo_profile_tools import update_user_profile
+from chief_wellness_officer.user_profile_store import UserProfileStore
+from memory.user_memory_manager import UserMemoryManager
+
+
+def _callback_context(user_id, text):
+    return SimpleNamespace(
+        user_id=user_id,
+        agent_name="chief_wellness_officer",
+        state={},
+        user_content=types.Content(role="user", parts=[types.Part(text=text)]),
+    )
+
+
+def _instruction(context):
+    request = LlmRequest()
+    assert cwo_context.inject_turn_context(context, request) is None
+    return request.config.system_instruction or ""
+
+
+@pytest.fixture
+def user_id(tmp_path, monkeypatch):
+    # Scratch stores: the singletons' closing snapshot would land in the real data/.
+    memories = UserMemoryManager(str(tmp_path / "memory.json"))
+    profiles = UserProfileStore(str(tmp_path / "profiles.json"))
+    monkeypatch.setattr(cwo_context, "memory_manager", memories)
+    monkeypatch.setattr(cwo_context, "profile_store", profiles)
+    monkeypatch.setattr(cwo_profile_tools, "profile_store", profiles)
+    memories.add_memory("u1", "Left knee hurts after long runs.", {"topic": "injury"})
+    memories.add_memory("u1", "Prefers vegetarian dinners.")
+    return "u1"
+
+
+def test_turn_context_is_injected_into_the_instruction(user_id):
+    context = _callback_context(user_id, "my knee hurts again")
+    assert cwo_context.load_turn_context(context) is None
+    assert context.state[cwo_context.STATE_KEY]["user_id"] == user_id
+
+    instruction = _instruction(context)
+    assert f"- user_id: {user_id}" in instruction
+    assert "- is_complete_for_exercise: false" in instruction
+    assert "Left knee hurts after long runs. {\"topic\": \"injury\"}" in instruction
+    assert "Prefers vegetarian dinners." in instruction
+    assert context.state["token_budget_dropped_memories"] == 0
+
+
+def test_profile_is_reread_after_update_user_profile(user_id):
+    context = _callback_context(user_id, "plan my week")
+    cwo_context.load_turn_context(context)
+    assert '"age": 34' not in _instruction(context)
+
+    # The model updates the profile mid-turn; its next call sees the new values.
+    update_user_profile(age=34, weight=70.0, gender="female", fitness_level="beginner", tool_context=context)
+    instruction = _instruction(context)
+    assert '"age": 34' in instruction
+    assert "- is_complete_for_exercise: true" in instruction
+
+
+def test_injection_can_be_turned_off(user_id, monkeypatch):
+    monkeypatch.setenv("WELLNESS_CONTEXT_INJECTION", "0")
+    context = _callback_context(user_id, "my knee hurts again")
+    cwo_context.load_turn_context(context)
+    assert cwo_context.STATE_KEY not in context.state
+    assert _instruction(context) == ""
+
+    # Context loaded before the switch is not injected either.
+    monkeypatch.setenv("WELLNESS_CONTEXT_INJECTION", "1")
+    cwo_context.load_turn_context(context)
+    monkeypatch.setenv("WELLNESS_CONTEXT_INJECTION", "0")
+    assert _instruction(context) == ""
@@ -0,0 +1,56 @@
+"""NDJSON import/export: one rewrite per file for JSON profiles, streamed exports."""
+
+import json
+
+import pytest
+
+from chief_wellness_officer.sqlite_profile_store import SQLiteUserProfileStore
+from chief_wellness_officer.user_profile_store import UserProfileStore
+from memory.user_memory_manager import UserMemoryManager
+from utils import data_transfer
+
+USERS = 2000
+
+
+@pytest.fixture
+def profiles_file(tmp_path):
+    path = tmp_path / "profiles.ndjson"
+    path.write_text("".join(json.dumps({"user_id": f"u{i}", "age": 20 + i % 50}) + "\n" for i in range(USERS)))
+    return path
+
+
+def test_json_profile_import_rewrites_the_file_once(tmp_path, profiles_file, monkeypatch):
+    store = UserProfileStore(str(tmp_path / "profiles.json"))
+    saves = []
+    save = store._save_to_disk
+    monkeypatch.setattr(store, "_save_to_disk", lambda: saves.append(1) or save())
+
+    assert data_transfer.import_profiles(store, profiles_file, batch_size=100) == USERS
+    assert len(saves) == 1
+    assert not data_transfer.checkpoint_path(profiles_file).exists()
+    assert UserProfileStore(str(tmp_path / "profiles.json")).get_profile("u1999").age == 20 + 1999 % 50
+
+
+def test_sqlite_profile_import_keeps_per_batch_checkpoints(tmp_path, profiles_file, monkeypatch):
+    store = SQLiteUserProfileStore(str(tmp_path / "profiles.db"))
+    checkpoints = []
+    monkeypatch.setattr(data_transfer, "_write_checkpoint", lambda *args: checkpoints.append(args))
+    assert data_transfer.import_profiles(store, profiles_file, batch_size=100) == USERS
+    assert len(checkpoints) == USERS // 100
+    exported = tmp_path / "export.ndjson"
+    assert data_transfer.export_profiles(store, exported) == USERS
+    store.close()
+
+
+@pytest.mark.parametrize("backend", ["journal", "binary"])
+def test_memory_export_streams_one_user_at_a_time(tmp_path, backend):
+    manager = UserMemoryManager(str(tmp_path / "memory.json"), backend=backend)
+    manager.import_users((f"u{i}", [{"summary": f"note {i}", "timestamp": None, "metadata": None}]) for i in range(50))
+
+    users = manager.iter_users()
+    first = next(users)
+    # A write in the middle of an export must not break the iteration.
+    manager.add_memory("late_user", "added during export")
+    rest = list(users)
+    assert len({user_id for user_id, _ in [first, *rest]} - {"late_user"}) == 50
+    manager.close()
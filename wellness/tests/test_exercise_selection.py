@@ -0,0 +1,71 @@
+import itertools
+
+import pytest
+
+from exercise_agent.exercise_library import (
+    ACTIVITY_SLOTS,
+    CARDIO,
+    EXERCISES,
+    HIGH,
+    LOW,
+    MOBILITY,
+    PULLUP_BAR,
+    parse_equipment,
+    parse_injuries,
+    select_exercises,
+)
+from exercise_agent.exercise_tools import build_workout_plan
+from exercise_agent.workout_plan_bench import EQUIPMENT, GOALS, INJURIES, LEVELS
+
+BY_NAME = {exercise.name: exercise for exercise in EXERCISES}
+WALKING = {"Brisk walk", "Walking intervals", "Incline treadmill walk", "Stair walking", "Marching in place"}
+
+
+def _selections():
+    for activity, day, equipment, injuries, max_impact in itertools.product(
+        ACTIVITY_SLOTS, range(7), EQUIPMENT, INJURIES, (LOW, HIGH)
+    ):
+        picks = select_exercises(activity, day, parse_equipment(equipment), parse_injuries(injuries), max_impact)
+        yield activity, [BY_NAME[name] for name, _, _ in picks]
+
+
+@pytest.mark.parametrize("activity", ["Walking", "Brisk Walking"])
+def test_walking_days_only_get_walking_variants(activity):
+    for label, exercises in _selections():
+        if label == activity:
+            assert exercises[0].name in WALKING
+            assert {e.group for e in exercises[1:]} <= {MOBILITY}
+            assert all(e.name in WALKING for e in exercises if e.group == CARDIO)
+
+
+@pytest.mark.parametrize("activity", ["Bodyweight Strength", "Calisthenics"])
+def test_bodyweight_days_ignore_gym_equipment(activity):
+    for label, exercises in _selections():
+        if label == activity:
+            assert exercises
+            assert all(e.equipment & ~PULLUP_BAR == 0 for e in exercises)
+
+
+def test_exercise_focus_matches_the_exercise():
+    plan = build_workout_plan("get fit", 30, 5, "intermediate", 30, 70, "female")
+    for day in plan["schedule"]:
+        for exercise in day.get("exercises", []):
+            assert BY_NAME[exercise["name"]].group == exercise["focus"]
+
+
+def test_beginners_never_get_high_impact_exercises():
+    for goal, days, equipment, injuries in itertools.product(GOALS, range(6), EQUIPMENT, INJURIES):
+        plan = build_workout_plan(goal, 30, days, "Beginner", 25, 60, "male", injuries, equipment)
+        for day in plan["schedule"]:
+            for exercise in day.get("exercises", []):
+                assert BY_NAME[exercise["name"]].impact < HIGH
+
+
+def test_advanced_cardio_can_still_be_high_impact():
+    impacts = {
+        BY_NAME[exercise["name"]].impact
+        for days in range(1, 6)
+        for day in build_workout_plan("lose weight", 45, days, "advanced", 25, 60, "male")["schedule"]
+        for exercise in day.get("exercises", [])
+    }
+    assert HIGH in impacts
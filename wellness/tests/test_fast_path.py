@@ -0,0 +1,7 @@
+from chief_wellness_officer.fast_path_bench import run
+
+
+def test_fast_path_halves_the_model_round_trips():
+    report = run(latency=0.0, requests=2)
+    assert report["specialist_model_calls"] == 4
+    assert report["fast_model_calls"] == 2
@@ -0,0 +1,30 @@
+import pytest
+
+from utils.goal_classifier import GENERAL_WELLNESS, MUSCLE_GAIN, STRESS_REDUCTION, WEIGHT_LOSS, classify_goal
+
+
+@pytest.mark.parametrize(
+    "goal", ["get fit again", "regain my energy", "reduce fatigue", "get a haircut and tone up"]
+)
+def test_keywords_inside_other_words_do_not_count(goal):
+    profile = classify_goal(goal)
+    assert profile.category == GENERAL_WELLNESS
+    assert not (profile.weight_loss or profile.muscle_gain or profile.stress_reduction)
+
+
+@pytest.mark.parametrize(
+    "goal, category",
+    [
+        ("Lose fat and build some muscle", MUSCLE_GAIN),
+        ("lower my body-fat", WEIGHT_LOSS),
+        ("cutting season", WEIGHT_LOSS),
+        ("slimmer waist", WEIGHT_LOSS),
+        ("getting stronger", MUSCLE_GAIN),
+        ("strengthening my core", MUSCLE_GAIN),
+        ("bulking", MUSCLE_GAIN),
+        ("stressed out at work", STRESS_REDUCTION),
+        ("more relaxation", STRESS_REDUCTION),
+    ],
+)
+def test_inflected_keywords_still_count(goal, category):
+    assert classify_goal(goal).category == category
@@ -0,0 +1,217 @@
+"""AsyncHTTPClient and the crisis locality lookup against a local stand-in server."""
+
+import asyncio
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from mindfullness_agent import mindfulness_tools
+from utils import http_client
+from utils.http_client import AsyncHTTPClient, CircuitOpenError, Deadline, DeadlineExceeded
+
+HITS = Counter()
+SLOW_SECONDS = 2.0
+
+
+class _StandIn(BaseHTTPRequestHandler):
+    """/ok, /slow, /fail (500), /missing (404), /ip and /json/ (ip-api)."""
+
+    protocol_version = "HTTP/1.1"
+    behaviour = {}
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        HITS[path] += 1
+        mode = self.behaviour.get(path, "ok")
+        if mode == "slow":
+            time.sleep(SLOW_SECONDS)
+        if mode == "fail":
+            status, body = 500, b"boom"
+        elif path == "/missing":
+            status, body = 404, b"not found"
+        elif path == "/ip":
+            status, body = 200, b"81.2.69.160"
+        elif path.startswith("/json/"):
+            status, body = 200, json.dumps(
+                {"status": "success", "city": "London", "country": "United Kingdom", "countryCode": "GB"}
+            ).encode()
+        else:
+            status, body = 200, b"ok"
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture(scope="module")
+def server():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _StandIn)
+    srv.daemon_threads = True
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{srv.server_port}"
+    srv.shutdown()
+
+
+@pytest.fixture(autouse=True)
+def fresh_state():
+    HITS.clear()
+    _StandIn.behaviour = {}
+    http_client.reset_circuits()
+    yield
+    http_client.reset_circuits()
+
+
+def _run(coro_fn, **client_kwargs):
+    async def main():
+        client = AsyncHTTPClient(**client_kwargs)
+        try:
+            return await coro_fn(client)
+        finally:
+            await client.aclose()
+
+    return asyncio.run(main())
+
+
+def _breaker(base):
+    return http_client.circuit_breaker(base.split("//")[1])
+
+
+def test_ok_and_4xx_responses_keep_the_circuit_closed(server):
+    async def calls(client):
+        ok = await client.get_text(server + "/ok")
+        missing = await client.get(server + "/missing")
+        return ok, missing.status_code
+
+    assert _run(calls) == ("ok", 404)
+    assert HITS["/missing"] == 1  # a 4xx is not retried
+    assert _breaker(server).stats() == {"state": "closed", "failures": 0}
+
+
+def test_slow_host_is_cut_off_by_the_deadline(server):
+    _StandIn.behaviour = {"/slow": "slow"}
+    start = time.perf_counter()
+    with pytest.raises((DeadlineExceeded, httpx.TimeoutException)):
+        _run(lambda client: client.get(server + "/slow", Deadline(0.3)), retries=3)
+    assert time.perf_counter() - start < SLOW_SECONDS / 2
+
+
+def test_failing_host_is_retried_then_the_circuit_opens(server):
+    _StandIn.behaviour = {"/fail": "fail"}
+    with pytest.raises(httpx.HTTPStatusError):
+        _run(lambda client: client.get(server + "/fail"), retries=1)
+    assert HITS["/fail"] == 2
+    assert _breaker(server).state == "closed"
+
+    # The third failure opens the circuit, so its retry is never sent.
+    with pytest.raises(CircuitOpenError):
+        _run(lambda client: client.get(server + "/fail"), retries=1)
+    assert HITS["/fail"] == 3
+    assert _breaker(server).state == "open"
+
+    # While open, nothing reaches the host, not even healthy paths.
+    with pytest.raises(CircuitOpenError):
+        _run(lambda client: client.get(server + "/ok"))
+    assert HITS["/ok"] == 0
+
+
+def test_half_open_trial_closes_or_reopens_the_circuit(server):
+    breaker = _breaker(server)
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    assert breaker.state == "open"
+
+    # After reset_timeout a single trial is let through; its failure
+    # reopens the circuit at once, so the retry is refused.
+    breaker.opened_at -= breaker.reset_timeout
+    _StandIn.behaviour = {"/fail": "fail"}
+    with pytest.raises(CircuitOpenError):
+        _run(lambda client: client.get(server + "/fail"), retries=3)
+    assert HITS["/fail"] == 1
+    assert breaker.state == "open"
+
+    # A successful trial closes it again.
+    breaker.opened_at -= breaker.reset_timeout
+    assert _run(lambda client: client.get_text(server + "/ok")) == "ok"
+    assert breaker.stats() == {"state": "closed", "failures": 0}
+
+
+@pytest.fixture
+def locality_via(server, monkeypatch):
+    for name in ("WELLNESS_COUNTRY", "WELLNESS_PUBLIC_IP", "WELLNESS_GEOIP_NETWORK"):
+        monkeypatch.delenv(name, raising=False)
+    # No local database: the IP can only be placed over the network.
+    monkeypatch.setattr(mindfulness_tools, "lookup_country", lambda ip: None)
+    monkeypatch.setattr(mindfulness_tools, "PUBLIC_IP_URL", server + "/ip")
+    # A different host name gets its own circuit breaker.
+    monkeypatch.setattr(mindfulness_tools, "IP_API_URL", server.replace("127.0.0.1", "localhost") + "/json/")
+    mindfulness_tools._locality_cache.clear()
+    yield
+    mindfulness_tools._locality_cache.clear()
+
+
+def _crisis_resources():
+    async def main():
+        try:
+            return await mindfulness_tools.get_crisis_resources()
+        finally:
+            await http_client.get_http_client().aclose()
+
+    return asyncio.run(main())
+
+
+def test_crisis_lookup_survives_a_failing_ip_service(locality_via):
+    _StandIn.behaviour = {"/ip": "fail"}
+    result = _crisis_resources()
+    assert result["country_code"] == "GB"
+    assert result["location"] == "London, United Kingdom"
+    assert result["location_source"] == "network"
+
+
+def test_crisis_lookup_with_every_host_down_is_fast_and_still_answers(locality_via, monkeypatch):
+    _StandIn.behaviour = {"/ip": "slow", "/json/": "slow"}
+    monkeypatch.setattr(mindfulness_tools, "NETWORK_BUDGET", 0.5)
+    start = time.perf_counter()
+    result = _crisis_resources()
+    assert time.perf_counter() - start < SLOW_SECONDS
+    assert result["location_source"] == "unknown"
+    assert result["emergency_advice"]
+    assert result["crisis_lines"]
+
+
+def test_cancelled_half_open_trial_does_not_wedge_the_circuit(server):
+    breaker = _breaker(server)
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    breaker.opened_at -= breaker.reset_timeout
+    _StandIn.behaviour = {"/slow": "slow"}
+
+    async def cancelled_trial(client):
+        task = asyncio.create_task(client.get(server + "/slow"))
+        await asyncio.sleep(0.2)
+        assert breaker.state == "half_open"
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    _run(cancelled_trial)
+    assert breaker.state == "open"
+    # The next caller gets a fresh trial, and its success closes the circuit.
+    assert _run(lambda client: client.get_text(server + "/ok")) == "ok"
+    assert breaker.stats() == {"state": "closed", "failures": 0}
+
+
+def test_ip_api_is_only_asked_when_the_local_database_cannot_place_the_ip(locality_via, monkeypatch):
+    monkeypatch.setattr(mindfulness_tools, "lookup_country", lambda ip: "GB" if ip == "81.2.69.160" else None)
+    result = _crisis_resources()
+    assert result["location_source"] == "local"
+    assert result["country_code"] == "GB"
+    assert HITS["/ip"] == 1
+    assert not any(path.startswith("/json/") for path in HITS)
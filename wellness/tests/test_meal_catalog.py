@@ -0,0 +1,59 @@
+import pytest
+
+from nutrition_agent.meal_catalog import MealCatalog, get_catalog, parse_meal_filter, suggest_meals
+from nutrition_agent.meal_catalog_bench import ALLERGIES, PREFERENCES, filters, rows_by_name, violations
+
+
+@pytest.fixture(scope="module")
+def rows():
+    return rows_by_name(get_catalog())
+
+
+@pytest.mark.parametrize("post_workout", [False, True])
+def test_no_suggestion_contains_an_excluded_tag(rows, post_workout):
+    catalog = get_catalog()
+    cases = filters()
+    assert len(cases) == len(PREFERENCES) * len(ALLERGIES)
+    for calories in (1400, 2200, 3200):
+        for meal_filter in cases:
+            suggestions = suggest_meals(calories, meal_filter, high_protein=True, post_workout=post_workout)
+            assert violations(catalog, rows, meal_filter, suggestions) == 0
+
+
+def test_suggestions_are_eligible_rows(rows):
+    catalog = get_catalog()
+    meal_filter = parse_meal_filter("keto", "dairy, strawberries")
+    eligible = catalog.eligible(meal_filter)
+    for suggestion in suggest_meals(2000, meal_filter):
+        if "calories" in suggestion:
+            for name in [suggestion["idea"], *suggestion["alternatives"]]:
+                assert any(eligible[i] for i in rows[name])
+
+
+def test_eligible_matches_a_row_by_row_check():
+    catalog = MealCatalog()
+    plain = [f for f in filters() if not f.no_meat_with_dairy and not f.name_terms]
+    assert plain
+    for meal_filter in plain:
+        expected = [
+            not int(catalog.contains[i]) & meal_filter.exclude
+            and (meal_filter.max_carbs is None or catalog.carbs[i] <= meal_filter.max_carbs)
+            for i in range(len(catalog))
+        ]
+        assert catalog.eligible(meal_filter).tolist() == expected
+
+
+def test_suggest_meals_is_deterministic():
+    meal_filter = parse_meal_filter("vegan", "nuts")
+    assert suggest_meals(2000, meal_filter, post_workout=True) == suggest_meals(2000, meal_filter, post_workout=True)
+
+
+@pytest.mark.parametrize("preference", ["non-vegetarian", "Non Veg", "nonveg", "non-vegan", "non-kosher"])
+def test_negated_diet_is_no_restriction(preference):
+    assert parse_meal_filter(preference, None) == parse_meal_filter(None, None)
+
+
+def test_non_prefix_on_an_ingredient_still_excludes_it():
+    assert parse_meal_filter("non-dairy", None).exclude == parse_meal_filter("dairy-free", None).exclude != 0
+    assert parse_meal_filter("non-veg, halal", None) == parse_meal_filter("halal", None)
+    assert parse_meal_filter("veg", None).exclude == parse_meal_filter("vegetarian", None).exclude != 0
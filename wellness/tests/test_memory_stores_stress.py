@@ -0,0 +1,126 @@
+"""Crash and concurrency stress tests for the multi-process stores.
+
+Worker processes are started with the "spawn" method so each one is a fresh
+interpreter with its own store instances, as separate api_server workers are.
+"""
+
+import multiprocessing
+import os
+from pathlib import Path
+
+from chief_wellness_officer.user_profile_store import UserProfileStore
+from memory.compaction import TieredCompactor
+from memory.memory_stores import JournalMemoryStore
+from memory.user_memory_manager import UserMemoryManager
+
+WORKERS = 4
+WRITES = 60
+SHARED_USERS = 3
+
+
+def _manager(path, **kwargs):
+    # Compaction would fold entries away; keep every write verifiable.
+    return UserMemoryManager(
+        str(path),
+        backend="journal",
+        compactor=TieredCompactor(max_recent=10**6, max_bytes=10**9),
+        **kwargs,
+    )
+
+
+def _concurrent_writer(worker: int, directory: str) -> None:
+    memories = _manager(os.path.join(directory, "memory.json"), multiprocess=True)
+    # Checkpoint often so rotations race with the other workers' appends.
+    memories._store.checkpoint_every = 7
+    profiles = UserProfileStore(os.path.join(directory, "profiles.json"), multiprocess=True)
+    for k in range(WRITES):
+        memories.add_memory(f"shared{k % SHARED_USERS}", f"w{worker}-{k}")
+        profiles.update_profile(f"u{worker}-{k}", age=k + 1)
+        profiles.update_profile("shared", injuries=f"{worker}-{k}")
+    memories.close()
+
+
+def _write_then_crash(path: str, count: int) -> None:
+    store = JournalMemoryStore(Path(path), checkpoint_every=10**6)
+    for k in range(count):
+        store.write_user(f"user{k}", [{"summary": f"entry {k}"}])
+    os._exit(0)  # no close(): the journal is never folded
+
+
+def _crash_mid_checkpoint(path: str, count: int) -> None:
+    store = JournalMemoryStore(Path(path), checkpoint_every=10**6)
+    for k in range(count):
+        store.write_user(f"user{k}", [{"summary": f"entry {k}"}])
+
+    def crash(snapshot):
+        # Die after the journal was rotated, before the checkpoint exists.
+        os._exit(0)
+
+    store._write_checkpoint = crash
+    store.checkpoint()
+
+
+def _run(target, *args) -> None:
+    process = multiprocessing.get_context("spawn").Process(target=target, args=args)
+    process.start()
+    process.join(60)
+    assert process.exitcode == 0
+
+
+def test_concurrent_writers_lose_no_writes(tmp_path):
+    ctx = multiprocessing.get_context("spawn")
+    workers = [ctx.Process(target=_concurrent_writer, args=(i, str(tmp_path))) for i in range(WORKERS)]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join(120)
+        assert process.exitcode == 0
+
+    memories = _manager(tmp_path / "memory.json")
+    stored = {
+        entry.summary for user in range(SHARED_USERS) for entry in memories.get_user_memories(f"shared{user}")
+    }
+    memories.close()
+    assert stored == {f"w{i}-{k}" for i in range(WORKERS) for k in range(WRITES)}
+
+    profiles = UserProfileStore(str(tmp_path / "profiles.json"))
+    for i in range(WORKERS):
+        for k in range(WRITES):
+            assert profiles.get_profile(f"u{i}-{k}").age == k + 1
+    assert profiles.get_profile("shared").injuries is not None
+
+
+def test_torn_tail_is_dropped_and_journal_stays_appendable(tmp_path):
+    path = tmp_path / "memory.json"
+    _run(_write_then_crash, str(path), 20)
+    journal = path.with_suffix(".journal")
+    intact_size = journal.stat().st_size
+    with open(journal, "ab") as fh:
+        fh.write(b'1234abcd {"user_id": "torn", "entr')  # writer died mid-record
+
+    store = JournalMemoryStore(path, checkpoint_every=10**6)
+    assert journal.stat().st_size == intact_size
+    assert len(store.read_all()) == 20
+    assert store.read_user("torn") == []
+    store.write_user("after", [{"summary": "after the crash"}])
+    store.close()
+
+    reopened = JournalMemoryStore(path)
+    data = reopened.read_all()
+    reopened.close()
+    assert len(data) == 21
+    assert data["after"] == [{"summary": "after the crash"}]
+
+
+def test_crash_mid_checkpoint_recovers_every_record(tmp_path):
+    path = tmp_path / "memory.json"
+    _run(_crash_mid_checkpoint, str(path), 25)
+    rotated = path.with_suffix(".journal.1")
+    assert rotated.exists()
+
+    store = JournalMemoryStore(path, checkpoint_every=10**6)
+    assert not rotated.exists()
+    data = store.read_all()
+    store.close()
+    assert data == {f"user{k}": [{"summary": f"entry {k}"}] for k in range(25)}
+
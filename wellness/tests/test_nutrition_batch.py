@@ -0,0 +1,38 @@
+import math
+
+import numpy as np
+import pytest
+
+from nutrition_agent import nutrition_tools
+from nutrition_agent.nutrition_batch import compute_nutrition_targets, iter_target_records
+from nutrition_agent.nutrition_batch_bench import batch_records, random_columns, scalar_targets
+
+
+def test_batch_matches_scalar_path():
+    columns = random_columns(20_000, seed=7)
+    scalar = scalar_targets(columns)
+    batch = batch_records(compute_nutrition_targets(**columns))
+    assert len(batch) == len(scalar)
+    for expected, actual in zip(scalar, batch):
+        assert math.isclose(actual.pop("bmr"), expected.pop("bmr"), rel_tol=1e-12)
+        assert actual == expected
+
+
+def test_shared_string_columns_broadcast():
+    ages, weights, heights = [30, 45], [60.0, 82.5], [165, 178]
+    targets = compute_nutrition_targets(ages, "female", weights, heights, "lose weight")
+    for record, age, weight, height in zip(iter_target_records(targets), ages, weights, heights):
+        bmr = nutrition_tools._mifflin_st_jeor_bmr(age, "female", weight, height)
+        assert record["calorie_target"] == nutrition_tools._calorie_target(bmr, "lose weight", "moderate")
+
+
+def test_bmi_rounding_near_ties_matches_round():
+    # Values whose tenths digit sits on a .x5 boundary in binary floating point.
+    weights = np.array([72.25, 61.35, 88.45, 50.05])
+    targets = compute_nutrition_targets([40] * 4, "male", weights, [100] * 4, "maintain")
+    assert targets["bmi"].tolist() == [round(w, 1) for w in weights.tolist()]
+
+
+def test_rejects_non_positive_values():
+    with pytest.raises(ValueError):
+        compute_nutrition_targets([30, 0], "male", [70, 80], [170, 180], "maintain")
@@ -0,0 +1,29 @@
+import pytest
+
+from chief_wellness_officer.parallel_specialists_bench import run
+
+
+def test_fan_out_waits_for_the_slowest_specialist_not_the_sum():
+    report = run(latency=0.1, requests=2, timeout=0.2)
+    assert report["parallel_median_ms"] < 150
+    assert report["sequential_median_ms"] > 230
+
+
+@pytest.fixture(scope="module")
+def degraded():
+    return run(latency=0.02, requests=1, timeout=0.1)
+
+
+def test_hung_specialist_times_out_and_the_rest_still_answer(degraded):
+    assert degraded["hung_exercise_statuses"] == {"exercise": "timeout", "nutrition": "ok", "mindfulness": "ok"}
+    assert degraded["hung_exercise_ms"] < 500
+
+
+def test_crisis_request_outlasts_the_branch_timeout(degraded):
+    assert degraded["crisis_statuses"] == {"nutrition": "ok", "mindfulness": "ok"}
+    assert degraded["crisis_ms"] >= 200
+
+
+def test_hung_crisis_specialist_is_cut_off_at_the_urgent_timeout(degraded):
+    assert degraded["hung_crisis_statuses"] == {"nutrition": "ok", "mindfulness": "timeout"}
+    assert degraded["urgent_timeout_ms"] <= degraded["hung_crisis_ms"] < degraded["urgent_timeout_ms"] + 500
@@ -0,0 +1,59 @@
+import pytest
+
+from exercise_agent.periodization import build_program, build_program_week, generate_program
+
+PROFILE = {
+    "goal": "build muscle",
+    "minutes_per_day": 45,
+    "days_per_week": 3,
+    "fitness_level": "beginner",
+    "age": 30,
+    "weight": 70,
+    "gender": "female",
+}
+PER_WEEK = ("sets_per_exercise", "reps_per_set", "target_rpe")
+
+
+def _workout_days(plan):
+    return [day for day in plan["schedule"] if day["type"] == "Workout"]
+
+
+@pytest.mark.parametrize("level, cap", [("beginner", 20), ("intermediate", 40)])
+def test_overload_survives_the_duration_cap(level, cap):
+    weeks = [build_program_week(week, **{**PROFILE, "fitness_level": level}) for week in range(1, 13)]
+    for week in weeks:
+        assert week["session_minutes"] <= cap
+        assert all(day["duration"] == f"{week['session_minutes']} mins" for day in _workout_days(week["plan"]))
+    for block in range(3):
+        loading = weeks[block * 4 : block * 4 + 3]
+        work = [w["sets_per_exercise"] * w["reps_per_set"] for w in loading]
+        assert work == sorted(work) and len(set(work)) == 3
+        assert [w["volume_pct"] for w in loading] == sorted(w["volume_pct"] for w in loading)
+        deload = weeks[block * 4 + 3]
+        assert deload["deload"] and deload["session_minutes"] < cap
+        assert deload["volume_pct"] < loading[0]["volume_pct"]
+    assert weeks[4]["reps_per_set"] > weeks[0]["reps_per_set"]
+
+
+def test_program_summary_matches_the_weekly_builds():
+    program = build_program(**PROFILE)
+    assert [row["week"] for row in program["progression"]] == list(range(1, 13))
+    for row in program["progression"]:
+        week = build_program_week(row["week"], **PROFILE)
+        assert {k: v for k, v in week.items() if k not in ("plan", "weeks")} == row
+        for day in _workout_days(week["plan"]):
+            assert tuple(day[k] for k in PER_WEEK) == tuple(row[k] for k in PER_WEEK)
+
+    first = build_program_week(1, **PROFILE)["plan"]
+    for day in _workout_days(first):
+        for key in PER_WEEK:
+            del day[key]
+    assert program["weekly_plan"] == first
+
+
+def test_generate_program_returns_the_remaining_weeks_in_one_call():
+    program = generate_program(**PROFILE, weeks=12, start_week=9)
+    assert [row["week"] for row in program["progression"]] == [9, 10, 11, 12]
+    assert program["progression"][-1]["deload"]
+    with pytest.raises(ValueError):
+        generate_program(**PROFILE, weeks=12, start_week=13)
@@ -0,0 +1,51 @@
+import pytest
+
+from exercise_agent.exercise_tools import build_workout_plan, generate_workout_plan
+from nutrition_agent import nutrition_tools
+from nutrition_agent.nutrition_tools import generate_nutrition_plan
+
+
+@pytest.fixture(autouse=True)
+def _empty_caches():
+    generate_workout_plan.cache_clear()
+    generate_nutrition_plan.cache_clear()
+
+
+def _workout_args(weight, age=35):
+    return dict(
+        goal="lose weight", minutes_per_day=30, days_per_week=3, fitness_level="intermediate",
+        age=age, weight=weight, gender="female",
+    )
+
+
+@pytest.mark.parametrize("first, second", [(89.9, 90.2), (90.2, 89.9), (90.2, 90.2)])
+def test_workout_plan_near_the_weight_threshold_matches_a_direct_build(first, second):
+    generate_workout_plan(**_workout_args(first))
+    cached = generate_workout_plan(**_workout_args(second))
+    assert cached == build_workout_plan(**_workout_args(second))
+
+
+def test_off_grid_weight_keeps_its_guidance_and_echo():
+    plan = generate_workout_plan(**_workout_args(90.2))
+    plan = generate_workout_plan(**_workout_args(90.2))  # served from the cache
+    assert "Consider low-impact exercises to protect joints." in plan["guidelines"]
+    assert plan["personalization"].endswith("weight 90.2kg")
+
+
+def test_workout_plans_share_a_cache_entry_across_ages_on_the_same_side():
+    generate_workout_plan(**_workout_args(70, age=30))
+    hits = generate_workout_plan.cache_stats()["hits"]
+    plan = generate_workout_plan(**_workout_args(71.3, age=34))
+    assert generate_workout_plan.cache_stats()["hits"] == hits + 1
+    assert plan == build_workout_plan(**_workout_args(71.3, age=34))
+
+
+def test_nutrition_plan_near_a_bmi_boundary_uses_the_callers_category():
+    # 180 cm: BMI 25 is at 81.0 kg, inside one 0.5 kg quantization step.
+    args = dict(age=30, gender="male", height=180, goal="maintain")
+    below = generate_nutrition_plan(weight=80.95, **args)
+    above = generate_nutrition_plan(weight=81.05, **args)
+    assert below["profile_summary"]["bmi"] == nutrition_tools._bmi(180, 80.95)
+    assert above["profile_summary"]["bmi"] == nutrition_tools._bmi(180, 81.05)
+    assert above["profile_summary"]["weight_kg"] == 81.05
+    assert above["hydration"] == nutrition_tools._hydration(81.05)
@@ -0,0 +1,39 @@
+"""Mindfulness pre-screen: no crisis or risk message is routed to the coach or professor."""
+
+import pytest
+
+from mindfullness_agent.prescreen import CRISIS, EDUCATION, PRACTICE, prescreen
+from mindfullness_agent.prescreen_eval import EVALUATION_SET, HELD_OUT_SET, evaluate
+
+
+@pytest.mark.parametrize("examples", [EVALUATION_SET, HELD_OUT_SET], ids=["evaluation", "held_out"])
+def test_no_leaks_and_full_recall(examples):
+    report = evaluate(examples)
+    assert report["crisis_leaks"] == 0
+    assert report["crisis_recall"] == 1.0
+    assert report["errors"] == []
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Guide me through a breathing exercise, I am going to end it tonight",
+        "walk me through a body scan, I feel like dying",
+        "help me sleep, I have pills saved up and plan to take them all",
+        "guide me through breathing, i dont see a reason to keep living",
+        "help me calm down, I keep thinking about not being here anymore",
+        "what is the point of living? explain",
+    ],
+)
+def test_risk_phrase_anywhere_blocks_local_routing(text):
+    decision = prescreen(text)
+    assert decision.route not in (PRACTICE, EDUCATION)
+    assert decision.distress
+
+
+def test_kms_only_counts_as_a_word_on_its_own():
+    assert prescreen("might just kms").route == CRISIS
+    assert prescreen("kms").route == CRISIS
+    assert prescreen("I walked 5 kms today").route != CRISIS
+    assert prescreen("I walked 5kms today").route != CRISIS
+    assert prescreen("I walked 5 kms today, help me relax").route == PRACTICE
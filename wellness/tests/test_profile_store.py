@@ -0,0 +1,29 @@
+"""Resident-set bounds of the profile stores."""
+
+from chief_wellness_officer import user_profile_store
+from chief_wellness_officer.sqlite_profile_store import SQLiteUserProfileStore
+from chief_wellness_officer.user_profile_store import UserProfileStore
+
+USERS = 500
+
+
+def test_sqlite_store_keeps_at_most_max_resident_profiles(tmp_path):
+    store = SQLiteUserProfileStore(str(tmp_path / "profiles.db"), max_resident=16)
+    store.import_profiles({"user_id": f"u{i}", "age": 30} for i in range(USERS))
+    for i in range(USERS):
+        assert store.get_profile(f"u{i}").age == 30
+    assert len(store._resident) <= 16
+    store.close()
+
+
+def test_json_store_keeps_every_record_and_says_so(tmp_path, monkeypatch, capsys):
+    path = str(tmp_path / "profiles.json")
+    UserProfileStore(path).import_profiles({"user_id": f"u{i}", "age": 30} for i in range(USERS))
+    monkeypatch.setattr(user_profile_store, "LARGE_JSON_STORE_USERS", USERS - 1)
+
+    store = UserProfileStore(path, max_resident=16)
+    store.get_profile("u0")
+    # Only the UserProfile wrappers are bounded; the raw records are not.
+    assert len(store._resident) <= 16
+    assert len(store._records) == USERS
+    assert "WELLNESS_PROFILE_BACKEND=sqlite" in capsys.readouterr().out
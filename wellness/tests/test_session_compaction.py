@@ -0,0 +1,32 @@
+import asyncio
+
+from memory.session_compaction import SUMMARY_AUTHOR, CompactingSessionService, _is_summary, _is_turn_start
+from memory.session_compaction_bench import run, turn_events
+
+
+def test_long_session_stays_bounded_and_keeps_pending_calls():
+    report = run(turns=40)
+    assert report["compactions"] >= 1
+    assert report["compacting_prompt_tokens_last_turn"] < report["in_memory_prompt_tokens_last_turn"] / 3
+    assert report["pending_call_kept"]
+
+
+def test_summary_is_not_authored_by_the_user():
+    async def compacted():
+        service = CompactingSessionService(keep_turns=2)
+        session = await service.create_session(app_name="a", user_id="u")
+        for turn in range(6):
+            for event in turn_events(turn + 10):
+                await service.append_event(session, event)
+        await service.compact_session("a", "u", session.id)
+        await service.wait_for_compactions()
+        return (await service.get_session(app_name="a", user_id="u", session_id=session.id)).events
+
+    events = asyncio.run(compacted())
+    summary = events[0]
+    assert _is_summary(summary)
+    assert summary.author == SUMMARY_AUTHOR != "user"
+    assert summary.content.role == "model"
+    assert not _is_turn_start(summary)
+    assert sum(_is_summary(event) for event in events) == 1
+    assert sum(_is_turn_start(event) for event in events) == 2
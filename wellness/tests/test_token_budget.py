@@ -0,0 +1,130 @@
+"""Prompt budgets: trimming keeps calls paired, recent turns whole, and memories within budget."""
+
+import json
+from datetime import datetime, timedelta
+
+from google.genai import types
+
+from utils import token_budget
+from utils.token_budget import (
+    TokenBudget,
+    content_tokens,
+    estimate_tokens,
+    fit_history,
+    select_memories,
+)
+
+BUDGET = TokenBudget(total=0, tool_output=100, keep_turns=2)
+
+
+def _turn(turn, response_words=400):
+    call_id = f"call-{turn}"
+    return [
+        types.Content(role="user", parts=[types.Part(text=f"Turn {turn}: adjust my plan please.")]),
+        types.Content(
+            role="model",
+            parts=[types.Part(function_call=types.FunctionCall(id=call_id, name="exercise_coach", args={"turn": turn}))],
+        ),
+        types.Content(
+            role="user",
+            parts=[
+                types.Part(
+                    function_response=types.FunctionResponse(
+                        id=call_id, name="exercise_coach", response={"result": "squats " * response_words}
+                    )
+                )
+            ],
+        ),
+        types.Content(role="model", parts=[types.Part(text=f"Answer {turn}.")]),
+    ]
+
+
+def _history(turns=10):
+    return [content for turn in range(turns) for content in _turn(turn)]
+
+
+def _ids(contents, kind):
+    return [getattr(part, kind).id for content in contents for part in content.parts if getattr(part, kind)]
+
+
+def _total(contents):
+    return sum(content_tokens(content) for content in contents)
+
+
+def test_trimming_never_separates_a_call_from_its_response():
+    history = _history()
+    for max_tokens in range(0, _total(history), 150):
+        contents, _ = fit_history(list(history), max_tokens, BUDGET)
+        assert _ids(contents, "function_call") == _ids(contents, "function_response")
+
+
+def test_the_last_keep_turns_turns_are_always_kept():
+    history = _history()
+    contents, report = fit_history(list(history), 1, BUDGET)
+    assert contents[0].parts[0].text.startswith("Turn 8:")
+    assert len(contents) == 2 * 4
+    assert report["dropped_turns"] == 8
+    assert report["dropped_contents"] == 8 * 4
+
+
+def test_earlier_tool_outputs_are_compacted_before_the_current_turn():
+    history = _history(turns=3)
+    current_response = history[-2]
+    # Enough room once the two earlier responses shrink, not before.
+    max_tokens = _total(history) - content_tokens(history[2]) - content_tokens(history[6]) + 300
+    contents, report = fit_history(list(history), max_tokens, BUDGET)
+    assert report == {"compacted_tool_outputs": 2, "dropped_contents": 0, "dropped_turns": 0}
+    assert contents[-2] is current_response
+    assert content_tokens(contents[2]) < content_tokens(history[2])
+
+    # Only when dropping turns is not enough does the current turn shrink.
+    contents, report = fit_history(list(history), 1, BUDGET)
+    assert contents[-2] is not current_response
+    assert report["compacted_tool_outputs"] == 3  # two earlier ones, then the current one
+
+
+def test_cached_counts_match_a_fresh_count():
+    history = _history(turns=2)
+    for content in history + history:
+        part = content.parts[0]
+        if part.text:
+            expected = estimate_tokens(part.text)
+        elif part.function_call:
+            expected = estimate_tokens(part.function_call.name) + estimate_tokens(json.dumps(part.function_call.args))
+        else:
+            expected = estimate_tokens(json.dumps(part.function_response.response))
+        assert content_tokens(content) == expected
+
+
+def test_history_is_counted_once_across_model_calls(monkeypatch):
+    history = _history()
+    fit_history(list(history), 2000, BUDGET)
+    everything = _total(history) + 1
+    counted = []
+    monkeypatch.setattr(token_budget, "estimate_tokens", lambda text: counted.append(text) or 1)
+    # Each request carries copies of the contents that share their payloads.
+    copies = [content.model_copy(update={"parts": [part.model_copy() for part in content.parts]}) for content in history]
+    fit_history(copies, everything, BUDGET)
+    assert counted == ["exercise_coach"] * 10
+
+
+def _memory(summary, days_ago):
+    return {"summary": summary, "timestamp": (datetime.now() - timedelta(days=days_ago)).isoformat()}
+
+
+def _cost(memory):
+    return estimate_tokens(memory["summary"]) + estimate_tokens(json.dumps(memory.get("metadata") or {}))
+
+
+def test_selected_memories_fit_the_budget():
+    memories = [_memory(f"Memory {i}: " + "knee pain after runs " * (i % 7 + 1), days_ago=i) for i in range(40)]
+    for max_tokens in (0, 10, 50, 200, 1000):
+        selected = select_memories(memories, max_tokens)
+        assert sum(_cost(memory) for memory in selected) <= max_tokens
+    assert select_memories(memories, 0) == []
+
+
+def test_recency_reorders_memories_of_similar_relevance():
+    top, stale, recent = _memory("Knee pain after runs.", 2), _memory("Runs on Sundays.", 365), _memory("Runs daily.", 1)
+    room_for_two = _cost(top) + max(_cost(stale), _cost(recent))
+    assert select_memories([top, stale, recent], room_for_two) == [top, recent]
@@ -0,0 +1,35 @@
+"""UserMemoryManager: cached entries are isolated from callers, legacy entries still load."""
+
+import json
+
+import pytest
+
+from memory.user_memory_manager import UserMemoryManager
+
+
+@pytest.mark.parametrize("backend", ["json", "journal"])
+def test_caller_metadata_does_not_leak_into_the_cache(tmp_path, backend):
+    manager = UserMemoryManager(str(tmp_path / "memory.json"), backend=backend)
+    metadata = {"topic": "sleep"}
+    entry = manager.add_memory("u1", "Sleeps badly before exams.", metadata)
+
+    metadata["topic"] = "changed"
+    entry.summary = "changed"
+    assert manager.get_user_memories("u1")[0].metadata == {"topic": "sleep"}
+    assert manager.get_user_memories("u1")[0].summary == "Sleeps badly before exams."
+
+    manager.get_user_memories("u1")[0].metadata["topic"] = "changed"
+    assert manager.search_memories("u1", "exams")[0].metadata == {"topic": "sleep"}
+    manager.close()
+
+
+def test_entries_without_a_timestamp_still_load(tmp_path):
+    path = tmp_path / "memory.json"
+    path.write_text(json.dumps({"u1": [{"summary": "Prefers morning runs.", "metadata": None}]}))
+    manager = UserMemoryManager(str(path), backend="json")
+
+    [entry] = manager.get_user_memories("u1")
+    assert entry.summary == "Prefers morning runs."
+    assert entry.timestamp == ""
+    manager.add_memory("u1", "Knee feels better.")
+    assert [e.summary for e in manager.get_user_memories("u1")] == ["Prefers morning runs.", "Knee feels better."]
@@ -0,0 +1,26 @@
+import pytest
+
+from exercise_agent import exercise_tools
+from exercise_agent.exercise_tools import build_workout_plan
+from exercise_agent.workout_plan_bench import legacy_build_workout_plan, random_profiles, template_fields
+
+
+def test_precompiled_templates_match_the_pre_change_builder():
+    profiles = random_profiles(5_000, seed=11)
+    expected = [legacy_build_workout_plan(**profile) for profile in profiles]
+    actual = [template_fields(build_workout_plan(**profile)) for profile in profiles]
+    assert actual == expected
+    # Key order is part of the payload the model sees.
+    assert [list(plan) for plan in actual] == [list(plan) for plan in expected]
+    assert [[list(day) for day in plan["schedule"]] for plan in actual] == [
+        [list(day) for day in plan["schedule"]] for plan in expected
+    ]
+
+
+def test_template_table_is_read_only():
+    key = next(iter(exercise_tools._TEMPLATES))
+    with pytest.raises(TypeError):
+        exercise_tools._TEMPLATES[key] = None
+    plan = build_workout_plan(**random_profiles(1)[0])
+    plan["schedule"][0]["day"] = "Someday"
+    assert exercise_tools._TEMPLATES[key].days[0]["day"] == "Monday"
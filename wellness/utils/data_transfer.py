@@ -0,0 +1,162 @@
+"""Streaming NDJSON import/export for user profiles and memories.
+
+Each line of a profiles file is one ``UserProfile.to_dict()``; each line of
+a memories file is ``{"user_id": ..., "entries": [...]}`` with the raw
+stored entries. Exports stream from the stores and are written to a
+temporary file that is renamed into place, so a partial export is never
+mistaken for a complete one.
+
+Imports read the file line by line and hand the stores ``batch_size``
+records at a time. After every committed batch the byte offset reached is
+written to ``<path>.checkpoint``; re-running the same import resumes from
+that offset instead of starting over, and the checkpoint is removed once
+the whole file has been applied. Records are idempotent puts, so replaying
+a batch that was committed just before a crash is harmless.
+
+Stores that rewrite a whole file per call (the JSON profile store) offer
+``deferred_writes()``; the import then runs inside it so the file is
+written once, and no per-batch checkpoints are recorded, since nothing is
+durable until the block exits.
+
+The NDJSON side is always streamed, but the resident set is whatever the
+backend keeps. Only the SQLite profile store and the binary memory store
+page users from disk; the JSON profile store and the journal and JSON
+memory stores hold every user in memory. Large tenants should use
+``WELLNESS_PROFILE_BACKEND=sqlite`` and ``WELLNESS_MEMORY_BACKEND=binary``.
+
+The functions are duck-typed over the store objects: profile stores need
+``iter_profiles``/``import_profiles`` and memory managers need
+``iter_users``/``import_users``.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def export_profiles(store, path) -> int:
+    """Write every profile in ``store`` to ``path`` as NDJSON."""
+    return _export(path, store.iter_profiles())
+
+
+def import_profiles(store, path, batch_size: int = DEFAULT_BATCH_SIZE, resume: bool = True) -> int:
+    """Load an NDJSON profile export into ``store``; return records applied."""
+    deferred = getattr(store, "deferred_writes", None)
+    return _import(path, store.import_profiles, _check_profile, batch_size, resume, deferred)
+
+
+def export_memories(manager, path) -> int:
+    """Write every user's stored memory entries to ``path`` as NDJSON."""
+    records = ({"user_id": user_id, "entries": entries} for user_id, entries in manager.iter_users())
+    return _export(path, records)
+
+
+def import_memories(manager, path, batch_size: int = DEFAULT_BATCH_SIZE, resume: bool = True) -> int:
+    """Load an NDJSON memory export into ``manager``; return records applied."""
+
+    def apply(batch: List[Dict[str, Any]]) -> None:
+        manager.import_users((record["user_id"], record["entries"]) for record in batch)
+
+    return _import(path, apply, _check_memory, batch_size, resume)
+
+
+def checkpoint_path(path) -> Path:
+    path = Path(path)
+    return path.with_name(f"{path.name}.checkpoint")
+
+
+# ------------------------------------------------------------------
+# Internal helpers
+# ------------------------------------------------------------------
+def _export(path, records: Iterable[Dict[str, Any]]) -> int:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    count = 0
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            for record in records:
+                fh.write(json.dumps(record, separators=(",", ":"), ensure_ascii=False))
+                fh.write("\n")
+                count += 1
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return count
+
+
+def _import(
+    path,
+    apply: Callable[[List[Dict[str, Any]]], Any],
+    check: Callable[[Dict[str, Any]], None],
+    batch_size: int,
+    resume: bool,
+    deferred: Optional[Callable[[], ContextManager]] = None,
+) -> int:
+    if batch_size <= 0:
+        raise ValueError("batch_size must be positive")
+    path = Path(path)
+    marker = checkpoint_path(path)
+    offset, applied = _read_checkpoint(marker) if resume else (0, 0)
+
+    batch: List[Dict[str, Any]] = []
+    with deferred() if deferred else contextlib.nullcontext(), open(path, "rb") as fh:
+        fh.seek(offset)
+        line_no = 0
+        for line in fh:
+            line_no += 1
+            offset += len(line)
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                check(record)
+            except (ValueError, KeyError, TypeError) as exc:
+                raise ValueError(f"{path}: invalid record at line {line_no} after resume point: {exc}") from exc
+            batch.append(record)
+            if len(batch) >= batch_size:
+                apply(batch)
+                applied += len(batch)
+                batch = []
+                if deferred is None:
+                    _write_checkpoint(marker, offset, applied)
+        if batch:
+            apply(batch)
+            applied += len(batch)
+
+    marker.unlink(missing_ok=True)
+    return applied
+
+
+def _check_profile(record: Dict[str, Any]) -> None:
+    if not isinstance(record.get("user_id"), str):
+        raise KeyError("user_id")
+
+
+def _check_memory(record: Dict[str, Any]) -> None:
+    _check_profile(record)
+    if not isinstance(record.get("entries"), list):
+        raise KeyError("entries")
+
+
+def _read_checkpoint(marker: Path) -> Tuple[int, int]:
+    try:
+        state = json.loads(marker.read_text(encoding="utf-8"))
+        return int(state["offset"]), int(state["records"])
+    except FileNotFoundError:
+        return 0, 0
+    except (ValueError, KeyError, TypeError):
+        print(f"Warning: Ignoring unreadable import checkpoint {marker}")
+        return 0, 0
+
+
+def _write_checkpoint(marker: Path, offset: int, applied: int) -> None:
+    tmp_path = marker.with_name(f"{marker.name}.tmp")
+    tmp_path.write_text(json.dumps({"offset": offset, "records": applied}), encoding="utf-8")
+    os.replace(tmp_path, marker)
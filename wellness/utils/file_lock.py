@@ -0,0 +1,86 @@
+"""Cross-process locking and change detection for file-backed stores."""
+
+from __future__ import annotations
+
+import os
+import threading
+from typing import Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+FileSignature = Tuple[int, int, int]
+
+
+def file_signature(path) -> Optional[FileSignature]:
+    """Return ``(inode, mtime_ns, size)`` for ``path`` or ``None`` if missing.
+
+    Comparing signatures is how stores notice that another process replaced
+    (new inode) or rewrote (new mtime/size) a file since it was last read.
+    """
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+
+def multiprocess_enabled() -> bool:
+    """Whether WELLNESS_MULTIPROCESS asks stores to coordinate across processes."""
+    return os.getenv("WELLNESS_MULTIPROCESS", "").lower() in {"1", "true", "yes"}
+
+
+class InterProcessLock:
+    """Re-entrant lock that is exclusive across threads *and* processes.
+
+    Uses ``flock`` on a sidecar lock file, layered under a ``threading.RLock``
+    because ``flock`` alone does not exclude threads sharing a descriptor. The
+    descriptor is reopened after ``fork`` so children never share the parent's
+    lock. Usable anywhere a ``threading.Lock`` is used as a context manager.
+    """
+
+    def __init__(self, path) -> None:
+        if fcntl is None:
+            raise RuntimeError("Multi-process stores require fcntl (POSIX only).")
+        self.path = os.fspath(path)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._fd: Optional[int] = None
+        self._pid: Optional[int] = None
+
+    def acquire(self) -> None:
+        self._thread_lock.acquire()
+        if self._depth == 0:
+            try:
+                fcntl.flock(self._descriptor(), fcntl.LOCK_EX)
+            except BaseException:
+                self._thread_lock.release()
+                raise
+        self._depth += 1
+
+    def release(self) -> None:
+        self._depth -= 1
+        if self._depth == 0:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._thread_lock.release()
+
+    def __enter__(self) -> "InterProcessLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+    def _descriptor(self) -> int:
+        pid = os.getpid()
+        if self._fd is None or self._pid != pid:
+            # Never reuse a descriptor inherited across fork: flock state is
+            # shared between the parent and child through it.
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            self._pid = pid
+        return self._fd
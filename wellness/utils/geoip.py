@@ -0,0 +1,146 @@
+"""Offline IP-to-country lookup over a local range database.
+
+The database is a CSV of ``start_ip,end_ip,country_code`` rows, the
+layout of the freely redistributable "IP to Country Lite" files published
+by DB-IP (CC BY 4.0) and of similar GeoIP exports. IPv4 and IPv6 rows may
+be mixed, and the file may be gzip-compressed. It is read once into
+sorted per-family tables of range starts, ends and country codes. Each
+lookup is then a binary search (``bisect``) on the starts and needs no
+network access.
+
+The default location is ``data/geoip_ranges.csv`` (or ``.csv.gz``). Set
+WELLNESS_GEOIP_DB to use another file. ``deployment/fetch_geoip_db.py``
+downloads the DB-IP file to the default location.
+"""
+
+from __future__ import annotations
+
+import bisect
+import csv
+import gzip
+import io
+import os
+import socket
+import sys
+import threading
+from array import array
+from typing import Iterable, List, Optional, Tuple
+
+DEFAULT_DB_PATHS = ("data/geoip_ranges.csv", "data/geoip_ranges.csv.gz")
+
+
+class _RangeTable:
+    """Sorted, non-overlapping ranges of one address family."""
+
+    def __init__(self, ranges: List[Tuple[int, int, str]], typecode: Optional[str]) -> None:
+        ranges.sort()
+        if typecode:
+            self.starts = array(typecode, (r[0] for r in ranges))
+            self.ends = array(typecode, (r[1] for r in ranges))
+        else:
+            self.starts = [r[0] for r in ranges]
+            self.ends = [r[1] for r in ranges]
+        self.codes = [r[2] for r in ranges]
+
+    def lookup(self, address: int) -> Optional[str]:
+        i = bisect.bisect_right(self.starts, address) - 1
+        if i >= 0 and address <= self.ends[i]:
+            return self.codes[i]
+        return None
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+
+def _parse_ip(text: str) -> Tuple[int, int]:
+    """``(version, integer value)`` of an address; ValueError if invalid."""
+    text = text.strip()
+    try:
+        # inet_pton is several times faster than the ipaddress module.
+        if ":" in text:
+            return 6, int.from_bytes(socket.inet_pton(socket.AF_INET6, text), "big")
+        return 4, int.from_bytes(socket.inet_pton(socket.AF_INET, text), "big")
+    except OSError:
+        raise ValueError(f"Invalid IP address: {text!r}") from None
+
+
+class IPRangeDatabase:
+    """In-memory IP range -> ISO 3166 country code table."""
+
+    def __init__(self, rows: Iterable[Tuple[str, str, str]]) -> None:
+        v4: List[Tuple[int, int, str]] = []
+        v6: List[Tuple[int, int, str]] = []
+        for row in rows:
+            try:
+                start_version, start = _parse_ip(row[0])
+                end_version, end = _parse_ip(row[1])
+                code = row[2].strip().upper()
+            except (IndexError, ValueError):
+                continue
+            if start_version != end_version or end < start or len(code) != 2:
+                continue
+            # Interning keeps one string per country instead of one per row.
+            target = v4 if start_version == 4 else v6
+            target.append((start, end, sys.intern(code)))
+        # IPv4 fits in unsigned 32-bit arrays ("I" is 4 bytes on every
+        # supported platform); IPv6 needs Python ints.
+        self._v4 = _RangeTable(v4, "I" if array("I").itemsize == 4 else "L")
+        self._v6 = _RangeTable(v6, None)
+
+    @classmethod
+    def from_csv(cls, path: str) -> "IPRangeDatabase":
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rb") as raw:
+            with io.TextIOWrapper(raw, encoding="utf-8", newline="") as handle:
+                return cls(row for row in csv.reader(handle) if row and not row[0].startswith("#"))
+
+    def lookup(self, ip: str) -> Optional[str]:
+        """Country code for ``ip``, or None if it is invalid or not covered."""
+        try:
+            version, address = _parse_ip(ip)
+        except ValueError:
+            return None
+        return (self._v4 if version == 4 else self._v6).lookup(address)
+
+    def __len__(self) -> int:
+        return len(self._v4) + len(self._v6)
+
+
+_db_lock = threading.Lock()
+_db_loaded = False
+_db: Optional[IPRangeDatabase] = None
+
+
+def get_geoip_database() -> Optional[IPRangeDatabase]:
+    """Load the configured database on first use; None if there is none."""
+    global _db, _db_loaded
+    if _db_loaded:
+        return _db
+    with _db_lock:
+        if not _db_loaded:
+            configured = os.getenv("WELLNESS_GEOIP_DB")
+            candidates = (configured,) if configured else DEFAULT_DB_PATHS
+            path = next((p for p in candidates if os.path.exists(p)), None)
+            if path is not None:
+                try:
+                    _db = IPRangeDatabase.from_csv(path)
+                except OSError as e:
+                    print(f"Warning: Could not load GeoIP database {path}: {e}")
+            _db_loaded = True
+    return _db
+
+
+def lookup_country(ip: str) -> Optional[str]:
+    """Country code for ``ip`` from the local database, if available."""
+    db = get_geoip_database()
+    return db.lookup(ip) if db is not None else None
+
+
+def preload_geoip_database() -> None:
+    """Start loading the database in a background thread.
+
+    Parsing a full country database takes a second or two; doing it at
+    startup keeps that off the first crisis request.
+    """
+    if not _db_loaded:
+        threading.Thread(target=get_geoip_database, name="geoip-preload", daemon=True).start()
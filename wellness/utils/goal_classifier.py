@@ -0,0 +1,95 @@
+"""Shared goal classifier for the specialist tools.
+
+Free-text goals ("Lose fat and build some muscle", "reduce STRESS") are
+mapped to a :class:`GoalProfile` once, with a single pass of one compiled
+regular expression, and the result is cached. The exercise and nutrition
+tools read the profile's flags instead of each re-scanning the goal with
+their own keyword lists, so every specialist categorizes a goal the same
+way.
+
+Category names match the ``goal_type`` values the CWO stores in memory
+metadata.
+"""
+
+from __future__ import annotations
+
+import functools
+import re
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+STRESS_REDUCTION = "stress_reduction"
+MUSCLE_GAIN = "muscle_gain"
+WEIGHT_LOSS = "weight_loss"
+GENERAL_WELLNESS = "general_wellness"
+
+# Keyword -> intent. Keywords match whole words, optionally inflected
+# ("stressed", "strengthening", "cutting", "body-fat"), but never inside
+# another word ("again", "haircut", "fatigue").
+_KEYWORD_INTENTS: Dict[str, str] = {
+    "stress": STRESS_REDUCTION,
+    "anxiety": STRESS_REDUCTION,
+    "relax": STRESS_REDUCTION,
+    "muscle": MUSCLE_GAIN,
+    "strength": MUSCLE_GAIN,
+    "strong": MUSCLE_GAIN,
+    "gain": MUSCLE_GAIN,
+    "bulk": MUSCLE_GAIN,
+    "lose": WEIGHT_LOSS,
+    "loss": WEIGHT_LOSS,
+    "cut": WEIGHT_LOSS,
+    "deficit": WEIGHT_LOSS,
+    "fat": WEIGHT_LOSS,
+    "slim": WEIGHT_LOSS,
+}
+
+# Inflections a keyword may carry, including doubled final consonants.
+_SUFFIXES = (
+    "s", "es", "d", "ed", "er", "ers", "est", "y", "ful", "ness", "ing", "en", "ened", "ening",
+    "ation", "ations", "ting", "ming", "mer", "ter", "ty",
+)
+
+# One alternation, longest keywords first, anchored at word boundaries the
+# way the meal catalogue matches its keywords.
+_KEYWORD_RE = re.compile(
+    r"\b(%s)(?:%s)?\b"
+    % (
+        "|".join(sorted(map(re.escape, _KEYWORD_INTENTS), key=len, reverse=True)),
+        "|".join(sorted(_SUFFIXES, key=len, reverse=True)),
+    )
+)
+
+
+@dataclass(frozen=True)
+class GoalProfile:
+    """Structured view of a goal.
+
+    Attributes:
+        category: Primary intent; stress reduction wins over muscle gain,
+            which wins over weight loss, then general wellness.
+        stress_reduction: The goal mentions stress or relaxation.
+        muscle_gain: The goal mentions muscle, strength, gaining or bulking.
+        weight_loss: The goal mentions losing weight/fat or cutting.
+    """
+
+    category: str
+    stress_reduction: bool = False
+    muscle_gain: bool = False
+    weight_loss: bool = False
+
+
+@functools.lru_cache(maxsize=4096)
+def classify_goal(goal: Optional[str]) -> GoalProfile:
+    """Map a free-text goal to its :class:`GoalProfile` (cached)."""
+    intents = {_KEYWORD_INTENTS[m.group(1)] for m in _KEYWORD_RE.finditer((goal or "").lower())}
+    for category in (STRESS_REDUCTION, MUSCLE_GAIN, WEIGHT_LOSS):
+        if category in intents:
+            break
+    else:
+        category = GENERAL_WELLNESS
+    return GoalProfile(
+        category=category,
+        stress_reduction=STRESS_REDUCTION in intents,
+        muscle_gain=MUSCLE_GAIN in intents,
+        weight_loss=WEIGHT_LOSS in intents,
+    )
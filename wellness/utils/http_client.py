@@ -0,0 +1,210 @@
+"""Pooled async HTTP client for outbound tool calls.
+
+Tools that call third-party APIs run on the ADK runner's event loop, so
+they must not block it. ``AsyncHTTPClient`` wraps a shared
+``httpx.AsyncClient`` and keeps connections alive between calls. It adds
+three things on top:
+
+* A per-host :class:`CircuitBreaker`. After ``failure_threshold``
+  consecutive failures (transport errors, timeouts, 5xx) the host is
+  skipped for ``reset_timeout`` seconds. Then a single trial request is
+  let through, and its outcome closes or reopens the circuit.
+* A :class:`Deadline`: an overall time budget shared by every request
+  (and retry) made on behalf of one tool call.
+* Bounded retries with backoff, taken only while the deadline allows.
+
+``get_http_client()`` returns one client per event loop, because httpx
+connection pools cannot be shared across loops. Circuit breakers are
+shared process-wide.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+import weakref
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+DEFAULT_TIMEOUT = 3.0
+DEFAULT_RETRIES = 1
+RETRY_BACKOFF = 0.1
+
+
+class CircuitOpenError(Exception):
+    """The host's circuit breaker is open; the request was not sent."""
+
+
+class DeadlineExceeded(TimeoutError):
+    """The overall time budget ran out before the request could finish."""
+
+
+class Deadline:
+    """Monotonic time budget shared by several requests."""
+
+    def __init__(self, seconds: float) -> None:
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+
+class CircuitBreaker:
+    """Closed -> open after repeated failures -> half-open trial -> closed."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now (claims the half-open trial)."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def release_trial(self) -> None:
+        """Give back a half-open trial that ended without an outcome.
+
+        A cancelled trial says nothing about the host, so the circuit goes
+        back to open with its original timestamp and the next caller may
+        claim a new trial right away.
+        """
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.state = self.OPEN
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"state": self.state, "failures": self.failures}
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def circuit_breaker(host: str) -> CircuitBreaker:
+    """The process-wide breaker for ``host``."""
+    with _breakers_lock:
+        breaker = _breakers.get(host)
+        if breaker is None:
+            breaker = _breakers[host] = CircuitBreaker()
+        return breaker
+
+
+def circuit_stats() -> Dict[str, Dict[str, Any]]:
+    """State of every host's circuit breaker, keyed by host."""
+    with _breakers_lock:
+        return {host: breaker.stats() for host, breaker in _breakers.items()}
+
+
+def reset_circuits() -> None:
+    with _breakers_lock:
+        _breakers.clear()
+
+
+class AsyncHTTPClient:
+    """Connection-pooled GETs with circuit breaking, deadlines and retries."""
+
+    def __init__(
+        self,
+        timeout: float = DEFAULT_TIMEOUT,
+        retries: int = DEFAULT_RETRIES,
+        max_connections: int = 20,
+    ) -> None:
+        self.timeout = timeout
+        self.retries = retries
+        self._client = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            headers={"User-Agent": "wellness-agent"},
+        )
+
+    async def get(self, url: str, deadline: Optional[Deadline] = None) -> httpx.Response:
+        """GET ``url``; raises on open circuits, exhausted deadlines or failure.
+
+        Responses with a 4xx status are returned as is: the host is healthy
+        and retrying would not help.
+        """
+        breaker = circuit_breaker(urlsplit(url).netloc)
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                raise CircuitOpenError(f"Circuit open for {urlsplit(url).netloc}")
+            timeout = self.timeout if deadline is None else min(self.timeout, deadline.remaining())
+            if timeout <= 0:
+                raise DeadlineExceeded(f"No time left to fetch {url}")
+            try:
+                response = await asyncio.wait_for(self._client.get(url, timeout=timeout), timeout)
+                if response.status_code >= 500:
+                    raise httpx.HTTPStatusError(
+                        f"Server error {response.status_code}", request=response.request, response=response
+                    )
+            except (httpx.HTTPError, asyncio.TimeoutError) as e:
+                breaker.record_failure()
+                attempt += 1
+                backoff = RETRY_BACKOFF * attempt
+                if attempt > self.retries or (deadline is not None and deadline.remaining() <= backoff):
+                    if isinstance(e, asyncio.TimeoutError) and deadline is not None and deadline.expired:
+                        raise DeadlineExceeded(f"Deadline exceeded fetching {url}") from e
+                    raise
+                await asyncio.sleep(backoff)
+                continue
+            except BaseException:
+                # Cancelled (e.g. the losing task of a race): without this
+                # the breaker would stay half-open and refuse every request.
+                breaker.release_trial()
+                raise
+            breaker.record_success()
+            return response
+
+    async def get_json(self, url: str, deadline: Optional[Deadline] = None) -> Any:
+        return (await self.get(url, deadline)).json()
+
+    async def get_text(self, url: str, deadline: Optional[Deadline] = None) -> str:
+        return (await self.get(url, deadline)).text
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncHTTPClient]" = weakref.WeakKeyDictionary()
+
+
+def get_http_client() -> AsyncHTTPClient:
+    """The shared client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = _clients[loop] = AsyncHTTPClient()
+    return client
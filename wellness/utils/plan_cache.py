@@ -0,0 +1,102 @@
+"""Memoization for the deterministic plan tools.
+
+Plan tools are pure functions of their arguments, and many users send
+near-identical inputs (the same goal in a different case, a weight that
+differs by a few hundred grams). ``memoize_plan`` wraps such a tool in a
+bounded LRU cache keyed by a *canonical* form of the arguments:
+
+* ``canonicalize`` maps the bound arguments to ``(key, call_kwargs)``. The
+  key should contain only what the plan actually depends on (e.g. a goal
+  category instead of the goal text), and ``call_kwargs`` are the
+  normalized arguments the tool is run with on a miss.
+* ``restore`` patches fields that merely echo the caller's free text (such
+  as the goal) back into the copy handed to the caller.
+
+Every call returns a fresh copy, so callers can mutate the plan without
+corrupting the cached one. Exceptions are never cached.
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import pickle
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from utils.lru_cache import LRUCache
+
+Canonicalizer = Callable[[Dict[str, Any]], Tuple[Hashable, Dict[str, Any]]]
+Restorer = Callable[[Any, Dict[str, Any]], None]
+
+DEFAULT_MAXSIZE = 4096
+
+_registry: Dict[str, LRUCache] = {}
+_REQUIRED = object()
+
+
+def quantize(value: float, step: Optional[float]) -> float:
+    """Round ``value`` to the nearest multiple of ``step`` (``None`` keeps it)."""
+    if not step:
+        return value
+    # The outer round drops float noise such as 70.30000000000001.
+    return round(round(value / step) * step, 6)
+
+
+def memoize_plan(
+    canonicalize: Canonicalizer,
+    restore: Optional[Restorer] = None,
+    maxsize: int = DEFAULT_MAXSIZE,
+):
+    """Decorate a plan tool with a canonicalizing, size-bounded cache.
+
+    The wrapper keeps the tool's name, docstring and signature (agent
+    frameworks build the tool schema from them) and gains ``cache_stats``
+    and ``cache_clear`` attributes, like ``functools.lru_cache``.
+    """
+
+    def decorator(func):
+        signature = inspect.signature(func)
+        defaults = {
+            name: _REQUIRED if param.default is param.empty else param.default
+            for name, param in signature.parameters.items()
+        }
+        cache = LRUCache(maxsize=maxsize)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if args or not kwargs.keys() <= defaults.keys():
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                arguments = dict(bound.arguments)
+            else:
+                # Agent tool calls always pass keywords; skip the slow bind.
+                arguments = {**defaults, **kwargs}
+                missing = [name for name, value in arguments.items() if value is _REQUIRED]
+                if missing:
+                    raise TypeError(f"{func.__name__}() missing required argument(s): {', '.join(missing)}")
+            key, call_kwargs = canonicalize(arguments)
+
+            # Plans are stored pickled: unpickling is both the defensive copy
+            # and several times faster than copy.deepcopy on nested dicts.
+            payload = cache.get(key)
+            if payload is None:
+                result = func(**call_kwargs)
+                cache.put(key, pickle.dumps(result, pickle.HIGHEST_PROTOCOL))
+            else:
+                result = pickle.loads(payload)
+            if restore is not None:
+                restore(result, arguments)
+            return result
+
+        wrapper.cache_stats = cache.stats
+        wrapper.cache_clear = cache.clear
+        _registry[func.__qualname__] = cache
+        return wrapper
+
+    return decorator
+
+
+def plan_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Hit/miss counters for every memoized plan tool, keyed by tool name."""
+    return {name: cache.stats() for name, cache in _registry.items()}
+
@@ -0,0 +1,325 @@
+"""Per-agent prompt token budgets.
+
+Large prompts drive most of our p95 latency and cost. Nothing else bounds
+them: the CWO instruction is long, memories are unbounded, tool outputs
+are verbose dicts, and session history keeps growing. This module decides,
+per model call, what the prompt keeps:
+
+* ``estimate_tokens`` is a local estimator (no tokenizer download). It
+  counts word pieces of up to four characters plus punctuation, which
+  tracks SentencePiece/BPE counts closely enough for budgeting. Counts
+  of message texts and tool payloads are memoized, since every model call
+  of a session resends the same ones.
+* ``select_memories`` ranks memories by relevance (their search rank) and
+  recency, then keeps the best ones that fit the memory budget.
+* ``enforce_token_budget`` is a before_model_callback. It first compacts
+  tool outputs from earlier turns, then drops whole old turns (never
+  splitting a function call from its response, never the current turn),
+  and as a last resort compacts the current turn's tool outputs. What it
+  did is recorded in session state under ``token_budget_report`` and in
+  process-wide counters (``token_budget_stats``).
+
+Budgets are configured per agent name in ``AGENT_BUDGETS``; agents that
+are not listed use ``DEFAULT_BUDGET``. Set WELLNESS_TOKEN_BUDGET=0 to turn
+budgeting off.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import re
+import threading
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Any, Dict, List, Sequence
+
+from google.genai import types
+
+from .lru_cache import LRUCache
+
+_TOKEN_RE = re.compile(r"\w{1,4}|[^\w\s]")
+
+
+@dataclass(frozen=True)
+class TokenBudget:
+    """Prompt budget of one agent, in estimated tokens.
+
+    Attributes:
+        total: Instruction plus history plus tool outputs.
+        memories: Share of the instruction reserved for injected memories.
+        tool_output: Size above which a tool output is compacted.
+        keep_turns: Most recent turns that are never dropped.
+    """
+
+    total: int
+    memories: int = 600
+    tool_output: int = 800
+    keep_turns: int = 2
+
+
+DEFAULT_BUDGET = TokenBudget(total=6000)
+AGENT_BUDGETS: Dict[str, TokenBudget] = {
+    "chief_wellness_officer": TokenBudget(total=12000, memories=800, tool_output=1500, keep_turns=3),
+    "exercise_coach": TokenBudget(total=6000, tool_output=2500),
+    "nutrition_specialist": TokenBudget(total=6000, tool_output=2500),
+    "mindfulness_orchestrator": TokenBudget(total=4000),
+}
+
+# Recency half-life for memory ranking, in days.
+MEMORY_HALF_LIFE_DAYS = 30.0
+STATE_KEY = "token_budget_report"
+# Set by whoever injects memories, so the report can include them.
+DROPPED_MEMORIES_KEY = "token_budget_dropped_memories"
+
+_COMPACT_STRING = 300
+_COMPACT_LIST = 5
+_COMPACT_DEPTH = 4
+
+# Token counts of recently seen part payloads, keyed by object identity.
+# ADK copies contents for each request but shares the texts and the
+# call/response dicts with the session events, so a long history is
+# counted once instead of on every model call.
+PAYLOAD_CACHE_SIZE = 4096
+_payload_tokens_cache = LRUCache(maxsize=PAYLOAD_CACHE_SIZE)
+
+_stats_lock = threading.Lock()
+_stats: Dict[str, Dict[str, int]] = {}
+
+
+def budgeting_enabled() -> bool:
+    return os.getenv("WELLNESS_TOKEN_BUDGET", "1").lower() not in {"0", "false", "no"}
+
+
+def budget_for(agent_name: str) -> TokenBudget:
+    return AGENT_BUDGETS.get(agent_name, DEFAULT_BUDGET)
+
+
+def configure_budget(agent_name: str, **changes: int) -> TokenBudget:
+    """Override fields of one agent's budget (e.g. ``total=8000``)."""
+    AGENT_BUDGETS[agent_name] = replace(budget_for(agent_name), **changes)
+    return AGENT_BUDGETS[agent_name]
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate model token count of ``text``."""
+    return len(_TOKEN_RE.findall(text)) if text else 0
+
+
+# ------------------------------------------------------------------
+# Memories
+# ------------------------------------------------------------------
+def _age_days(timestamp: str, now: datetime) -> float:
+    try:
+        return max((now - datetime.fromisoformat(timestamp)).total_seconds() / 86400, 0.0)
+    except (TypeError, ValueError):
+        return MEMORY_HALF_LIFE_DAYS * 4
+
+
+def select_memories(memories: Sequence[Dict[str, Any]], max_tokens: int) -> List[Dict[str, Any]]:
+    """Best memories that fit ``max_tokens``, most valuable first.
+
+    ``memories`` are in relevance order (as returned by a search). Each is
+    scored by its relevance rank, weighted by an exponential recency decay,
+    then memories are taken greedily by score while they fit.
+    """
+    now = datetime.now()
+    scored = []
+    for rank, memory in enumerate(memories):
+        relevance = 1.0 / (1 + rank)
+        recency = math.pow(0.5, _age_days(memory.get("timestamp", ""), now) / MEMORY_HALF_LIFE_DAYS)
+        scored.append((relevance * (0.5 + 0.5 * recency), rank, memory))
+    scored.sort(key=lambda item: (-item[0], item[1]))
+
+    selected, used = [], 0
+    for _, _, memory in scored:
+        cost = estimate_tokens(memory.get("summary", "")) + estimate_tokens(json.dumps(memory.get("metadata") or {}))
+        if used + cost <= max_tokens:
+            selected.append(memory)
+            used += cost
+    return selected
+
+
+# ------------------------------------------------------------------
+# History and tool outputs
+# ------------------------------------------------------------------
+def compact_value(value: Any, depth: int = 0) -> Any:
+    """Shrink a tool output: long strings and lists are cut, deep nesting elided."""
+    if isinstance(value, str):
+        return value if len(value) <= _COMPACT_STRING else value[:_COMPACT_STRING] + "…"
+    if depth >= _COMPACT_DEPTH and isinstance(value, (dict, list, tuple)):
+        return "…"
+    if isinstance(value, dict):
+        return {key: compact_value(item, depth + 1) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        items = [compact_value(item, depth + 1) for item in value[:_COMPACT_LIST]]
+        if len(value) > _COMPACT_LIST:
+            items.append(f"… (+{len(value) - _COMPACT_LIST} more)")
+        return items
+    return value
+
+
+def _payload_tokens(payload: Any) -> int:
+    """Tokens of a part's text or call/response dict, memoized by identity.
+
+    The cache holds the payload itself, so its id cannot be reused by
+    another object while the entry lives. Payloads are never mutated in
+    place: compaction builds new dicts.
+    """
+    if not payload:
+        # Empty texts and dicts are cheap to count and not worth an entry.
+        return estimate_tokens(payload if isinstance(payload, str) else json.dumps(payload))
+    key = id(payload)
+    cached = _payload_tokens_cache.get(key)
+    if cached is not None and cached[0] is payload:
+        return cached[1]
+    if isinstance(payload, str):
+        tokens = estimate_tokens(payload)
+    else:
+        tokens = estimate_tokens(json.dumps(payload, default=str))
+    _payload_tokens_cache.put(key, (payload, tokens))
+    return tokens
+
+
+def _part_tokens(part: types.Part) -> int:
+    if part.text:
+        return _payload_tokens(part.text)
+    if part.function_call:
+        return estimate_tokens(part.function_call.name or "") + _payload_tokens(part.function_call.args or {})
+    if part.function_response:
+        return _payload_tokens(part.function_response.response or {})
+    return 0
+
+
+def content_tokens(content: types.Content) -> int:
+    return sum(_part_tokens(part) for part in content.parts or ())
+
+
+def _compact_content(content: types.Content, max_tokens: int) -> tuple[types.Content, int]:
+    """Copy of ``content`` with oversized function responses compacted."""
+    parts, compacted = [], 0
+    for part in content.parts or ():
+        if part.function_response and _part_tokens(part) > max_tokens:
+            response = part.function_response
+            part = types.Part(
+                function_response=types.FunctionResponse(
+                    id=response.id, name=response.name, response=compact_value(response.response or {})
+                )
+            )
+            compacted += 1
+        parts.append(part)
+    if not compacted:
+        return content, 0
+    return types.Content(role=content.role, parts=parts), compacted
+
+
+def _turn_starts(contents: Sequence[types.Content]) -> List[int]:
+    """Indices of user messages that start a turn (not function responses)."""
+    return [
+        i
+        for i, content in enumerate(contents)
+        if content.role == "user" and any(part.text for part in content.parts or ())
+    ] or [0]
+
+
+def fit_history(
+    contents: List[types.Content], max_tokens: int, budget: TokenBudget
+) -> tuple[List[types.Content], Dict[str, int]]:
+    """Trim ``contents`` to ``max_tokens``; returns the new list and a report."""
+    report = {"compacted_tool_outputs": 0, "dropped_contents": 0, "dropped_turns": 0}
+    if not contents:
+        return contents, report
+    starts = _turn_starts(contents)
+    current = starts[-1]
+
+    def compact(first: int, last: int) -> None:
+        for i in range(first, last):
+            contents[i], n = _compact_content(contents[i], budget.tool_output)
+            if n:
+                sizes[i] = content_tokens(contents[i])
+                report["compacted_tool_outputs"] += n
+
+    sizes = [content_tokens(content) for content in contents]
+
+    # 1. Compact verbose tool outputs from earlier turns.
+    if sum(sizes) > max_tokens:
+        compact(0, current)
+
+    # 2. Drop whole old turns, oldest first. Cutting only at turn starts
+    # keeps every function call together with its response.
+    keep_from = starts[-min(max(budget.keep_turns, 1), len(starts))]
+    cut, remaining = 0, sum(sizes)
+    for boundary in (start for start in starts if 0 < start <= keep_from):
+        if remaining <= max_tokens:
+            break
+        remaining -= sum(sizes[cut:boundary])
+        report["dropped_contents"] += boundary - cut
+        report["dropped_turns"] += 1
+        cut = boundary
+    contents, sizes = contents[cut:], sizes[cut:]
+
+    # 3. Last resort: compact the tool outputs of the kept turns too.
+    if sum(sizes) > max_tokens:
+        compact(0, len(contents))
+    return contents, report
+
+
+def _instruction_text(llm_request) -> str:
+    instruction = getattr(llm_request.config, "system_instruction", None) if llm_request.config else None
+    if instruction is None:
+        return ""
+    if isinstance(instruction, str):
+        return instruction
+    parts = getattr(instruction, "parts", None) or ()
+    return " ".join(part.text for part in parts if getattr(part, "text", None))
+
+
+def enforce_token_budget(callback_context, llm_request) -> None:
+    """before_model_callback: keep the request within the agent's budget."""
+    if not budgeting_enabled():
+        return None
+    budget = budget_for(callback_context.agent_name)
+    instruction_tokens = estimate_tokens(_instruction_text(llm_request))
+    before = sum(content_tokens(content) for content in llm_request.contents)
+    contents, report = fit_history(list(llm_request.contents), max(budget.total - instruction_tokens, 0), budget)
+    llm_request.contents = contents
+    after = sum(content_tokens(content) for content in contents)
+
+    report.update(
+        {
+            "agent": callback_context.agent_name,
+            "budget": budget.total,
+            "instruction_tokens": instruction_tokens,
+            "history_tokens_before": before,
+            "history_tokens_after": after,
+            "over_budget": instruction_tokens + after > budget.total,
+            "dropped_memories": callback_context.state.get(DROPPED_MEMORIES_KEY, 0),
+        }
+    )
+    callback_context.state[STATE_KEY] = report
+    with _stats_lock:
+        stats = _stats.setdefault(
+            callback_context.agent_name,
+            {
+                "requests": 0,
+                "tokens_saved": 0,
+                "dropped_turns": 0,
+                "compacted_tool_outputs": 0,
+                "dropped_memories": 0,
+                "over_budget": 0,
+            },
+        )
+        stats["requests"] += 1
+        stats["tokens_saved"] += before - after
+        stats["dropped_turns"] += report["dropped_turns"]
+        stats["compacted_tool_outputs"] += report["compacted_tool_outputs"]
+        stats["dropped_memories"] += report["dropped_memories"]
+        stats["over_budget"] += report["over_budget"]
+    return None
+
+
+def token_budget_stats() -> Dict[str, Dict[str, int]]:
+    """Per-agent totals of what the budgeter trimmed."""
+    with _stats_lock:
+        return {name: dict(stats) for name, stats in _stats.items()}